@@ -182,8 +182,10 @@ if __name__ == '__main__':
     if args.install_handlers is not None:
         handlers_list = [s.strip() for s in args.install_handlers.split(",")]
         # import_meta = handler_meta.get('import', {})
-        for handler_name, handler_meta in integration_controller.get_handlers_import_status().items():
-            if handler_name not in handlers_list:
+        for handler_name in handlers_list:
+            handler_meta = integration_controller.get_handler_meta(handler_name)
+            if handler_meta is None:
+                logger.info(f"{'{0: <18}'.format(handler_name)} - unknown handler")
                 continue
             import_meta = handler_meta.get("import", {})
             if import_meta.get("success") is True:
@@ -247,6 +247,7 @@ def initialize_app(config, no_studio):
     @app.teardown_appcontext
     def remove_session(*args, **kwargs):
         db.session.remove()
+        integration_controller.release_handlers()
 
     @app.before_request
     def before_request():
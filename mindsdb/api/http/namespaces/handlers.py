@@ -54,15 +54,13 @@ class HandlerIcon(Resource):
 class InstallDependencies(Resource):
     @ns_conf.param('handler_name', 'Handler name')
     def post(self, handler_name):
-        handler_import_status = ca.integration_controller.get_handlers_import_status()
-        if handler_name not in handler_import_status:
+        handler_meta = ca.integration_controller.get_handler_meta(handler_name)
+        if handler_meta is None:
             return f'Unkown handler: {handler_name}', 400
 
-        if handler_import_status[handler_name].get('import', {}).get('success', False) is True:
+        if handler_meta.get('import', {}).get('success', False) is True:
             return 'Installed', 200
 
-        handler_meta = handler_import_status[handler_name]
-
         dependencies = handler_meta['import']['dependencies']
         if len(dependencies) == 0:
             return 'Installed', 200
@@ -1,5 +1,6 @@
 from .responder_collection import RespondersCollection
 from .responder import Responder
 from .session import Session
+from .cursors import CursorStore
 
-__all__ = ['RespondersCollection', 'Responder', 'Session']
+__all__ = ['RespondersCollection', 'Responder', 'Session', 'CursorStore']
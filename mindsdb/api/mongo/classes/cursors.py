@@ -0,0 +1,137 @@
+import time
+import random
+import threading
+
+from bson.int64 import Int64
+
+from mindsdb.utilities.context import context as ctx
+
+
+# size of first batch if it is not defined in query, the same as in mongodb
+DEFAULT_FIRST_BATCH_SIZE = 101
+DEFAULT_BATCH_SIZE = 1000
+
+
+class Cursor:
+    def __init__(self, cursor_id: int, ns: str, data: list):
+        self.id = cursor_id
+        self.ns = ns
+        self.data = data
+        self.position = 0
+        self.company_id = ctx.company_id
+        self.used_at = time.time()
+
+    def next_batch(self, batch_size: int) -> list:
+        batch = self.data[self.position:self.position + batch_size]
+        self.position += len(batch)
+        self.used_at = time.time()
+        return batch
+
+    def is_exhausted(self) -> bool:
+        return self.position >= len(self.data)
+
+
+class CursorStore:
+    """ Server side cursors
+
+        Result of query is returned by batches: first batch in response to find/aggregate,
+        the rest of the rows are stored in cursor and returned by getMore.
+        Cursors are shared between connections of the server (client can use any connection from its pool),
+        cursor is available only for the same company.
+        Cursors which were not used during 'timeout' seconds are removed
+        (option 'cursor_timeout' of 'api.mongodb' config, 600 by default).
+    """
+
+    def __init__(self, timeout: int = 600):
+        self.timeout = timeout
+        self._cursors = {}
+        self._lock = threading.Lock()
+
+    def _evict_idle(self):
+        min_used_at = time.time() - self.timeout
+        for cursor_id in list(self._cursors.keys()):
+            if self._cursors[cursor_id].used_at < min_used_at:
+                del self._cursors[cursor_id]
+
+    def _get(self, cursor_id: int):
+        cursor = self._cursors.get(cursor_id)
+        if cursor is None or cursor.company_id != ctx.company_id:
+            return None
+        return cursor
+
+    def create(self, ns: str, data: list, batch_size: int = None, single_batch: bool = False) -> dict:
+        """ make cursor document for response of find/aggregate
+
+            Args:
+                ns (str): namespace of cursor
+                data (list): rows of result
+                batch_size (int): size of first batch
+                single_batch (bool): close cursor after first batch
+
+            Returns:
+                dict: cursor document with 'firstBatch'
+        """
+        if batch_size is None:
+            batch_size = len(data) if single_batch else DEFAULT_FIRST_BATCH_SIZE
+
+        if single_batch or len(data) <= batch_size:
+            return {
+                'id': Int64(0),
+                'ns': ns,
+                'firstBatch': data[:batch_size]
+            }
+
+        with self._lock:
+            self._evict_idle()
+            cursor_id = random.randint(1, 2 ** 63 - 1)
+            while cursor_id in self._cursors:
+                cursor_id = random.randint(1, 2 ** 63 - 1)
+            cursor = Cursor(cursor_id, ns, data)
+            self._cursors[cursor_id] = cursor
+
+        return {
+            'id': Int64(cursor_id),
+            'ns': ns,
+            'firstBatch': cursor.next_batch(batch_size)
+        }
+
+    def get_more(self, cursor_id: int, batch_size: int = None) -> dict:
+        """ make cursor document for response of getMore
+
+            Returns:
+                dict: cursor document with 'nextBatch', or None if cursor is not found
+        """
+        if batch_size is None:
+            batch_size = DEFAULT_BATCH_SIZE
+
+        with self._lock:
+            self._evict_idle()
+            cursor = self._get(cursor_id)
+            if cursor is None:
+                return None
+            batch = cursor.next_batch(batch_size)
+            if cursor.is_exhausted():
+                del self._cursors[cursor_id]
+                cursor_id = 0
+
+        return {
+            'id': Int64(cursor_id),
+            'ns': cursor.ns,
+            'nextBatch': batch
+        }
+
+    def kill(self, cursor_ids: list) -> tuple:
+        """ remove cursors
+
+            Returns:
+                tuple: (list of killed cursors, list of not found cursors)
+        """
+        killed, not_found = [], []
+        with self._lock:
+            for cursor_id in cursor_ids:
+                if self._get(cursor_id) is None:
+                    not_found.append(cursor_id)
+                else:
+                    del self._cursors[cursor_id]
+                    killed.append(cursor_id)
+        return killed, not_found
@@ -1,5 +1,3 @@
-from bson.int64 import Int64
-
 from mindsdb_sql.parser.ast import Identifier, Insert, CreateTable
 
 from mindsdb.api.mongo.classes import Responder
@@ -65,11 +63,11 @@ class Responce(Responder):
 
         data = run_sql_command(request_env, ast_query)
 
-        cursor = {
-            'id': Int64(0),
-            'ns': f"{db}.$cmd.{collection}",
-            'firstBatch': data
-        }
+        cursor = mindsdb_env['cursor_store'].create(
+            ns=f"{db}.$cmd.{collection}",
+            data=data,
+            batch_size=query.get('cursor', {}).get('batchSize')
+        )
         return {
             'cursor': cursor,
             'ok': 1
@@ -162,11 +162,12 @@ class Responce(Responder):
 
         db = mindsdb_env['config']['api']['mongodb']['database']
 
-        cursor = {
-            'id': Int64(0),
-            'ns': f"{db}.$cmd.{query['find']}",
-            'firstBatch': data
-        }
+        cursor = mindsdb_env['cursor_store'].create(
+            ns=f"{db}.$cmd.{query['find']}",
+            data=data,
+            batch_size=query.get('batchSize'),
+            single_batch=query.get('singleBatch', False)
+        )
         return {
             'cursor': cursor,
             'ok': 1
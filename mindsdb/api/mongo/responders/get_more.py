@@ -0,0 +1,24 @@
+from mindsdb.api.mongo.classes import Responder
+import mindsdb.api.mongo.functions as helpers
+
+
+class Responce(Responder):
+    when = {'getMore': helpers.is_true}
+
+    def result(self, query, request_env, mindsdb_env, session):
+        cursor_id = query['getMore']
+        cursor = mindsdb_env['cursor_store'].get_more(cursor_id, query.get('batchSize'))
+        if cursor is None:
+            return {
+                'ok': 0,
+                'errmsg': f'cursor id {cursor_id} not found',
+                'code': 43,
+                'codeName': 'CursorNotFound'
+            }
+        return {
+            'cursor': cursor,
+            'ok': 1
+        }
+
+
+responder = Responce()
@@ -13,7 +13,7 @@ import numpy as np
 import datetime as dt
 
 import mindsdb.api.mongo.functions as helpers
-from mindsdb.api.mongo.classes import RespondersCollection, Session
+from mindsdb.api.mongo.classes import RespondersCollection, Session, CursorStore
 from mindsdb.interfaces.storage import db
 from mindsdb.interfaces.model.model_controller import ModelController
 from mindsdb.interfaces.database.integrations import integration_controller
@@ -293,9 +293,13 @@ class MongoRequestHandler(SocketServer.BaseRequestHandler):
             opcode, pos = unpack(INT, header, pos)
             logger.debug(f'GET length={length} id={request_id} opcode={opcode}')
             msg_bytes = self._read_bytes(length - pos)
-            answer = self.get_answer(request_id, opcode, msg_bytes)
-            if answer is not None:
-                self.request.send(answer)
+            try:
+                answer = self.get_answer(request_id, opcode, msg_bytes)
+                if answer is not None:
+                    self.request.send(answer)
+            finally:
+                # return connections to integrations to pool
+                integration_controller.release_handlers()
 
             db.session.close()
 
@@ -348,7 +352,8 @@ class MongoServer(SocketServer.ThreadingMixIn, SocketServer.TCPServer):
             'model_controller': ModelController(),
             'integration_controller': integration_controller,
             'project_controller': ProjectController(),
-            'database_controller': DatabaseController()
+            'database_controller': DatabaseController(),
+            'cursor_store': CursorStore(timeout=mongodb_config.get('cursor_timeout', 600))
         }
 
         respondersCollection = RespondersCollection()
@@ -10,9 +10,9 @@
 """
 import copy
 import re
-import hashlib
 import datetime as dt
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
 import dateinfer
 import pandas as pd
@@ -35,6 +35,8 @@ from mindsdb_sql.parser.ast import (
     BetweenOperation,
     Parameter,
     Tuple,
+    Function,
+    WindowFunction,
 )
 from mindsdb_sql.planner.steps import (
     ApplyTimeseriesPredictorStep,
@@ -44,6 +46,7 @@ from mindsdb_sql.planner.steps import (
     ApplyPredictorStep,
     GetTableColumns,
     LimitOffsetStep,
+    OrderByStep,
     MapReduceStep,
     MultipleSteps,
     ProjectStep,
@@ -60,11 +63,13 @@ from mindsdb_sql.planner.steps import (
 )
 
 from mindsdb_sql.exceptions import PlanningException
+from mindsdb_sql.planner.step_result import Result
 from mindsdb_sql.render.sqlalchemy_render import SqlalchemyRender
 from mindsdb_sql.planner import query_planner
 from mindsdb_sql.planner.utils import query_traversal
 
-from mindsdb.api.mysql.mysql_proxy.utilities.sql import query_df, query_df_with_type_infer_fallback
+from mindsdb.api.mysql.mysql_proxy.utilities.sql import query_df, query_df_with_type_infer_fallback, _adapt_query, encode_json_columns
+from mindsdb.interfaces.database.schema_cache import get_schema_cache
 from mindsdb.interfaces.model.functions import get_model_record
 from mindsdb.api.mysql.mysql_proxy.utilities import (
     ErKeyColumnDoesNotExist,
@@ -74,11 +79,19 @@ from mindsdb.api.mysql.mysql_proxy.utilities import (
     ErSqlWrongArguments
 )
 from mindsdb.interfaces.query_context.context_controller import query_context_controller
-from mindsdb.utilities.cache import get_cache, json_checksum
+from mindsdb.interfaces.storage import db
+from mindsdb.utilities.cache import get_cache, rows_checksum
 import mindsdb.utilities.profiler as profiler
+from mindsdb.utilities import log
+from mindsdb.utilities.context import context as ctx
 from mindsdb.utilities.fs import create_process_mark, delete_process_mark
 
 
+logger = log.getLogger(__name__)
+
+# max count of threads to fetch data for MapReduceStep
+MAP_REDUCE_MAX_WORKERS = 8
+
 superset_subquery = re.compile(r'from[\s\n]*(\(.*\))[\s\n]*as[\s\n]*virtual_table', flags=re.IGNORECASE | re.MULTILINE | re.S)
 
 
@@ -193,6 +206,24 @@ def is_empty_prediction_row(predictor_value):
     return True
 
 
+def get_int_value(value):
+    "Value of limit or offset: it can be int or Constant"
+    if isinstance(value, Constant):
+        value = value.value
+    if isinstance(value, int):
+        return value
+    return None
+
+
+def get_column_types(col_names):
+    "Types of columns from dict returned by ResultSet.to_df_cols"
+    return {
+        name: col.type
+        for name, col in col_names.items()
+        if col.type is not None
+    }
+
+
 class Column:
     def __init__(self, name=None, alias=None,
                  table_name=None, table_alias=None,
@@ -230,33 +261,69 @@ class ResultSet:
         for i in range(length):
             self._records.append([])
 
+        # columnar storage: if it is set, it is the source of data and _records is not used.
+        #   columns of dataframe are matched with self._columns by position
+        self._df = None
+
         self.is_prediction = False
 
     def __repr__(self):
         col_names = ', '.join([col.name for col in self._columns])
-        data = '\n'.join([str(rec) for rec in self._records[:20]])
+        data = '\n'.join([str(rec) for rec in self._get_rows(20)])
 
-        if len(self._records) > 20:
+        if self.length() > 20:
             data += '\n...'
 
         return f'{self.__class__.__name__}({self.length()} rows, cols: {col_names})\n {data}'
 
-    # --- converters ---
+    # --- columnar storage ---
 
-    def from_df(self, df, database, table_name, table_alias=None):
+    @property
+    def is_columnar(self):
+        return self._df is not None
+
+    def _set_df(self, df):
+        # keep dataframe as is (without copying of the data), columns are renamed to positions
+        df = df.copy(deep=False)
+        df.columns = range(len(df.columns))
+        self._df = df
+        self._records = []
+
+    def _get_rows(self, limit=None):
+        if self._df is None:
+            return self._records[:limit]
+        df = self._df if limit is None else self._df.head(limit)
+        return df.to_dict(orient='split')['data']
+
+    def _materialize(self):
+        # switch to row storage, it is required for operations which change rows
+        if self._df is None:
+            return
+        self._records = self._get_rows()
+        self._df = None
+
+    def _get_df(self, columns):
+        if self._df is None:
+            return pd.DataFrame(self._records, columns=columns)
 
-        resp_dict = df.to_dict(orient='split')
+        df = self._df.copy(deep=False)
+        df.columns = columns
+        return df
 
-        self._records = resp_dict['data']
+    # --- converters ---
+
+    def from_df(self, df, database, table_name, table_alias=None):
 
-        for col in resp_dict['columns']:
+        for i, col in enumerate(df.columns):
             self._columns.append(Column(
                 name=col,
                 table_name=table_name,
                 table_alias=table_alias,
                 database=database,
-                type=df.dtypes[col]
+                type=df.dtypes.iloc[i]
             ))
+
+        self._set_df(df)
         return self
 
     def from_df_cols(self, df, col_names, strict=True):
@@ -266,11 +333,7 @@ class ResultSet:
             if col.alias is not None:
                 alias_idx[col.alias] = col
 
-        resp_dict = df.to_dict(orient='split')
-
-        self._records = resp_dict['data']
-
-        for col in resp_dict['columns']:
+        for col in df.columns:
             if col in col_names or strict:
                 column = col_names[col]
             elif col in alias_idx:
@@ -278,11 +341,13 @@ class ResultSet:
             else:
                 column = Column(col)
             self._columns.append(column)
+
+        self._set_df(df)
         return self
 
     def to_df(self):
         columns = self.get_column_names()
-        return pd.DataFrame(self._records, columns=columns)
+        return self._get_df(columns)
 
     def to_df_cols(self, prefix=''):
         # returns dataframe and dict of columns
@@ -295,7 +360,7 @@ class ResultSet:
             columns.append(name)
             col_names[name] = col
 
-        return pd.DataFrame(self._records, columns=columns), col_names
+        return self._get_df(columns), col_names
 
     # --- tables ---
 
@@ -327,6 +392,14 @@ class ResultSet:
 
         if values is None:
             values = []
+
+        if self._df is not None:
+            # fill absent values with None
+            values = list(values[:len(self._df)])
+            values += [None] * (len(self._df) - len(values))
+            self._df[len(self._columns) - 1] = pd.Series(values, index=self._df.index, dtype=object)
+            return
+
         # update records
         if len(self._records) > 0:
             for rec in self._records:
@@ -339,6 +412,12 @@ class ResultSet:
     def del_column(self, col):
         idx = self._locate_column(col)
         self._columns.pop(idx)
+
+        if self._df is not None:
+            df = self._df.drop(columns=idx)
+            self._set_df(df)
+            return
+
         for row in self._records:
             row.pop(idx)
 
@@ -364,11 +443,16 @@ class ResultSet:
 
         return col_list
 
+    def get_column_values(self, col_idx):
+        if self._df is not None:
+            return self._df[col_idx].tolist()
+        return [row[col_idx] for row in self._records]
+
     def copy_column_to(self, col, result_set2):
         # copy with values
         idx = self._locate_column(col)
 
-        values = [row[idx] for row in self._records]
+        values = self.get_column_values(idx)
 
         col2 = copy.deepcopy(col)
 
@@ -378,6 +462,8 @@ class ResultSet:
     # --- records ---
 
     def add_records(self, data):
+        self._materialize()
+
         names = self.get_column_names()
         for rec in data:
             # if len(rec) != len(self._columns):
@@ -390,11 +476,13 @@ class ResultSet:
             self._records.append(record)
 
     def get_records_raw(self):
+        self._materialize()
         return self._records
 
     def add_record_raw(self, rec):
         if len(rec) != len(self._columns):
             raise ErSqlWrongArguments(f'Record length mismatch columns length: {len(rec)} != {len(self.columns)}')
+        self._materialize()
         self._records.append(rec)
 
     @property
@@ -407,20 +495,41 @@ class ResultSet:
         # if resultSet contents duplicate column name: only one of them will be in output
         names = self.get_column_names()
         records = []
-        for row in self._records:
+        for row in self._get_rows():
             records.append(dict(zip(names, row)))
         return records
 
+    def slice(self, offset=None, limit=None):
+        # returns new ResultSet with the same columns and subset of rows
+        result = ResultSet()
+        result._columns = list(self._columns)
+
+        end = None
+        if limit is not None:
+            end = limit if offset is None else offset + limit
+
+        if self._df is not None:
+            result._set_df(self._df.iloc[offset:end])
+        else:
+            result._records = self._records[offset:end]
+        return result
+
     # def clear_records(self):
     #     self._records = []
 
     def length(self):
+        if self._df is not None:
+            return len(self._df)
         return len(self._records)
 
 
 class SQLQuery():
-    def __init__(self, sql, session, execute=True):
+    def __init__(self, sql, session, execute=True, stream=False):
         self.session = session
+        # if consumer is able to read result by chunks: result of single fetch from integration
+        #   is not collected in memory and fetch() returns iterator of rows
+        self.stream = stream
+        self._stream_chunks = None
         self.database = None if session.database == '' else session.database.lower()
         self.datahub = session.datahub
         self.outer_query = None
@@ -537,7 +646,11 @@ class SQLQuery():
         data = self.fetched_data
 
         if view == 'dataframe':
+            if self._stream_chunks is not None:
+                self._collect_stream()
             result = data.to_df()
+        elif self._stream_chunks is not None:
+            result = self._iter_stream_records()
         else:
             result = data.get_records_raw()
 
@@ -546,7 +659,29 @@ class SQLQuery():
             'result': result
         }
 
-    def _fetch_dataframe_step(self, step, steps_data):
+    def _collect_stream(self):
+        # read the rest of the streamed result into fetched data
+        chunks = self._stream_chunks
+        self._stream_chunks = None
+        for df in chunks:
+            for rec in df.to_dict(orient='split')['data']:
+                self.fetched_data.add_record_raw(rec)
+
+    def _iter_stream_records(self):
+        # the first chunk is in fetched data, the rest is read from integration while it is consumed
+        chunks = self._stream_chunks
+        self._stream_chunks = None
+        yield from self.fetched_data.get_records_raw()
+        for df in chunks:
+            yield from df.to_dict(orient='split')['data']
+
+    def _fetch_dataframe_step(self, step, steps_data, stream=False):
+        """ Fetch data from integration
+
+        :param stream: if True and integration supports fetching by chunks:
+            only the first chunk is returned and the rest is kept in self._stream_chunks
+        :return: ResultSet
+        """
         dn = self.datahub.get(step.integration)
         query = step.query
 
@@ -561,6 +696,11 @@ class SQLQuery():
                 native_query=step.raw_query,
                 session=self.session
             )
+            if len(columns_info) == 0:
+                # query without result can change schema of database
+                schema_cache = get_schema_cache()
+                if schema_cache is not None:
+                    schema_cache.invalidate(step.integration)
         else:
             table_alias = get_table_alias(step.query.from_table, self.database)
             # TODO for information_schema we have 'database' = 'mindsdb'
@@ -576,6 +716,29 @@ class SQLQuery():
 
             query, context_callback = query_context_controller.handle_db_context_vars(query, dn, self.session)
 
+            if (
+                context_callback is None
+                and isinstance(query, Select)
+                and hasattr(dn, 'has_query_stream')
+                and dn.has_query_stream()
+            ):
+                chunks = dn.query_stream(query)
+                df = next(chunks)
+                if stream:
+                    self._stream_chunks = chunks
+                else:
+                    # the whole result is collected, but without intermediate list of rows and records
+                    rest = list(chunks)
+                    if len(rest) > 0:
+                        df = pd.concat([df] + rest, ignore_index=True)
+                    del rest
+                return ResultSet().from_df(
+                    df,
+                    database=table_alias[0],
+                    table_name=table_alias[1],
+                    table_alias=table_alias[2]
+                )
+
             data, columns_info = dn.query(
                 query=query,
                 session=self.session
@@ -597,6 +760,33 @@ class SQLQuery():
 
         return result
 
+    def _fetch_dataframe_steps(self, steps, steps_data):
+        """ Execute FetchDataframeStep-s concurrently on bounded thread pool
+
+        :return: list of ResultSet in the same order as steps
+        """
+        max_workers = min(len(steps), MAP_REDUCE_MAX_WORKERS)
+        max_size = self.session.integration_controller.handlers_cache.max_size
+        if max_size is not None:
+            # current thread can hold a handler from the pool: workers must not wait for it
+            max_workers = min(max_workers, max_size - 1)
+        if max_workers < 2:
+            return [self._fetch_dataframe_step(step, steps_data) for step in steps]
+
+        ctx_dump = ctx.dump()
+
+        def fetch(step):
+            ctx.load(ctx_dump)
+            try:
+                return self._fetch_dataframe_step(step, steps_data)
+            finally:
+                # handlers leased by worker are returned to pool
+                self.session.integration_controller.release_handlers()
+                db.session.remove()
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(fetch, steps))
+
     def _multiple_steps(self, steps, steps_data):
         data = ResultSet()
         for substep in steps:
@@ -619,12 +809,15 @@ class SQLQuery():
             markQueryVar(substep.query.where)
             steps.append(substep)
 
+        all_steps = []
         for var_group in vars:
             steps2 = copy.deepcopy(steps)
             for name, value in var_group.items():
                 for substep in steps2:
                     replaceQueryVar(substep.query.where, value, name)
-            sub_data = self._multiple_steps(steps2, steps_data)
+            all_steps.extend(steps2)
+
+        for sub_data in self._fetch_dataframe_steps(all_steps, steps_data):
             data = join_query_data(data, sub_data)
 
         return data
@@ -678,11 +871,47 @@ class SQLQuery():
             predict_steps = (ApplyPredictorRowStep, ApplyPredictorStep, ApplyTimeseriesPredictorStep)
             if any(s in predict_steps for s in steps_classes):
                 process_mark = create_process_mark('predict')
+
+            references = defaultdict(int)
             for step in steps:
+                for ref in step.references:
+                    references[ref.step_num] += 1
+
+            i = 0
+            while i < len(steps):
+                step = steps[i]
+                if type(step) == JoinStep:
+                    chain = self._get_fused_steps(steps, i, references)
+                    data = None
+                    if len(chain) > 1:
+                        try:
+                            with profiler.Context(f'step: fused {step.__class__.__name__} x {len(chain)}'):
+                                data = self._execute_fused_steps(chain, steps_data)
+                        except Exception as e:
+                            # execute steps one by one
+                            logger.debug(f'Unable to execute fused steps: {e}')
+                    if data is not None:
+                        # results of intermediate steps are not used
+                        steps_data.extend([None] * (len(chain) - 1))
+                        chain[-1].set_result(data)
+                        steps_data.append(data)
+                        i += len(chain)
+                        continue
+
                 with profiler.Context(f'step: {step.__class__.__name__}'):
-                    data = self.execute_step(step, steps_data)
+                    if (
+                        self.stream
+                        and len(steps) == 1
+                        and self.outer_query is None
+                        and type(step) == FetchDataframeStep
+                    ):
+                        # result of query is result of fetch: it can be sent to consumer by chunks
+                        data = self._fetch_dataframe_step(step, steps_data, stream=True)
+                    else:
+                        data = self.execute_step(step, steps_data)
                 step.set_result(data)
                 steps_data.append(data)
+                i += 1
         except PlanningException as e:
             raise ErLogicError(e)
         except Exception as e:
@@ -728,12 +957,242 @@ class SQLQuery():
             if self.columns_list is None:
                 self.columns_list = self.fetched_data.columns
 
-            for col in self.fetched_data.find_columns('__mindsdb_row_id'):
+            row_id_columns = self.fetched_data.find_columns('__mindsdb_row_id')
+            if len(row_id_columns) > 0 and self._stream_chunks is not None:
+                # columns are removed only from collected data
+                self._collect_stream()
+            for col in row_id_columns:
                 self.fetched_data.del_column(col)
 
         except Exception as e:
             raise SqlApiUnknownError("error in column list step") from e
 
+    def _prepare_join(self, step, steps_data):
+        """ Prepare query for join of results of two previous steps
+
+        :return: query string, dataframes used in query, columns of join result
+        """
+        left_data = steps_data[step.left.step_num]
+        right_data = steps_data[step.right.step_num]
+        table_a, names_a = left_data.to_df_cols(prefix='A')
+        table_b, names_b = right_data.to_df_cols(prefix='B')
+
+        if right_data.is_prediction or left_data.is_prediction:
+            # ignore join condition, use row_id
+            a_row_id = left_data.find_columns('__mindsdb_row_id')[0].get_hash_name(prefix='A')
+            b_row_id = right_data.find_columns('__mindsdb_row_id')[0].get_hash_name(prefix='B')
+
+            join_condition = f'table_a.{a_row_id} = table_b.{b_row_id}'
+
+            join_type = step.query.join_type.lower()
+            if join_type == 'join':
+                # join type is not specified. using join to prediction data
+                if left_data.is_prediction:
+                    join_type = 'left join'
+                elif right_data.is_prediction:
+                    join_type = 'right join'
+        else:
+            def adapt_condition(node, **kwargs):
+                if not isinstance(node, Identifier) or len(node.parts) != 2:
+                    return
+
+                table_alias, alias = node.parts
+                cols = left_data.find_columns(alias, table_alias)
+                if len(cols) == 1:
+                    col_name = cols[0].get_hash_name(prefix='A')
+                    return Identifier(parts=['table_a', col_name])
+
+                cols = right_data.find_columns(alias, table_alias)
+                if len(cols) == 1:
+                    col_name = cols[0].get_hash_name(prefix='B')
+                    return Identifier(parts=['table_b', col_name])
+
+            if step.query.condition is None:
+                raise ErNotSupportedYet('Unable to join table without condition')
+
+            condition = copy.deepcopy(step.query.condition)
+            query_traversal(condition, adapt_condition)
+
+            join_condition = SqlalchemyRender('postgres').get_string(condition)
+            join_type = step.query.join_type
+
+        query = f"""
+            SELECT * FROM table_a {join_type} table_b
+            ON {join_condition}
+        """
+        names_a.update(names_b)
+        return query, {'table_a': table_a, 'table_b': table_b}, names_a
+
+    def _adapt_filter(self, where_query, col_names):
+        # change names of columns in condition to names of columns in dataframe
+        col_idx = {}
+        for name, col in col_names.items():
+            col_idx[col.alias] = name
+            col_idx[(col.table_alias, col.alias)] = name
+
+        def check_fields(node, is_table=None, **kwargs):
+            if is_table:
+                raise ErNotSupportedYet('Subqueries is not supported in WHERE')
+            if isinstance(node, Identifier):
+                # only column name
+                col_name = node.parts[-1]
+
+                if len(node.parts) == 1:
+                    key = col_name
+                else:
+                    table_name = node.parts[-2]
+                    key = (table_name, col_name)
+
+                if key not in col_idx:
+                    raise ErKeyColumnDoesNotExist(f'Table not found for column: {key}')
+
+                new_name = col_idx[key]
+                return Identifier(parts=[new_name])
+
+        where_query = copy.deepcopy(where_query)
+        return query_traversal(where_query, check_fields) or where_query
+
+    def _adapt_order_by(self, order_by, col_names):
+        # order by uses the same columns as filter
+        return [
+            self._adapt_filter(item, col_names)
+            for item in order_by
+        ]
+
+    def _adapt_project(self, columns, col_names):
+        # change names of columns in targets to names of columns in dataframe
+        col_idx = {}
+        tbl_idx = defaultdict(list)
+        for name, col in col_names.items():
+            col_idx[col.alias] = name
+            col_idx[(col.table_alias, col.alias)] = name
+            # add to tables
+            tbl_idx[col.table_name].append(name)
+            if col.table_name != col.table_alias:
+                tbl_idx[col.table_alias].append(name)
+
+        def check_fields(node, is_table=None, **kwargs):
+            if is_table:
+                raise ErNotSupportedYet('Subqueries is not supported in WHERE')
+            if isinstance(node, Identifier):
+                # only column name
+                col_name = node.parts[-1]
+                if isinstance(col_name, Star):
+                    if len(node.parts) == 1:
+                        # left as is
+                        return
+                    else:
+                        # replace with all columns from table
+                        table_name = node.parts[-2]
+                        return [
+                            Identifier(parts=[col])
+                            for col in tbl_idx.get(table_name, [])
+                        ]
+
+                if len(node.parts) == 1:
+                    key = col_name
+                else:
+                    table_name = node.parts[-2]
+                    key = (table_name, col_name)
+
+                if key not in col_idx:
+                    raise ErKeyColumnDoesNotExist(f'Table not found for column: {key}')
+
+                new_name = col_idx[key]
+                return Identifier(parts=[new_name], alias=node.alias)
+
+        targets0 = query_traversal(copy.deepcopy(columns), check_fields)
+        targets = []
+        for target in targets0:
+            if isinstance(target, list):
+                targets.extend(target)
+            else:
+                targets.append(target)
+        return targets
+
+    def _get_fused_steps(self, steps, idx, references):
+        """ Find chain of in-memory steps after join step which can be executed
+              as one query together with join.
+            Chain is: JoinStep, [FilterStep], [OrderByStep], [LimitOffsetStep], [ProjectStep]
+            Every step of chain uses only result of previous one,
+              and results of fused steps are not used by other steps
+
+        :return: list of steps in chain, starting from join step
+        """
+        chain_order = [FilterStep, OrderByStep, LimitOffsetStep, ProjectStep]
+
+        chain = [steps[idx]]
+        position = 0
+        for step in steps[idx + 1:]:
+            prev_step = chain[-1]
+            if type(step) not in chain_order[position:]:
+                break
+            if not isinstance(step.dataframe, Result) or step.dataframe.step_num != prev_step.step_num:
+                break
+            if references[prev_step.step_num] != 1:
+                break
+            if type(step) == ProjectStep and LimitOffsetStep in [type(s) for s in chain] \
+                    and self._has_functions(step.columns):
+                # aggregation is applied after limit in separate steps,
+                # but it would be applied before limit in one query
+                break
+            position = chain_order.index(type(step)) + 1
+            chain.append(step)
+        return chain
+
+    @staticmethod
+    def _has_functions(columns):
+        found = []
+
+        def find_functions(node, **kwargs):
+            if isinstance(node, (Function, WindowFunction)):
+                found.append(node)
+
+        query_traversal(copy.deepcopy(columns), find_functions)
+        return len(found) > 0
+
+    def _execute_fused_steps(self, chain, steps_data):
+        """ Execute chain of steps found by _get_fused_steps as one duckdb query.
+            Projection, filter and limit are applied by duckdb before the result of join
+              is materialized
+
+        :return: ResultSet of the last step of chain
+        """
+        join_query, dataframes, col_names = self._prepare_join(chain[0], steps_data)
+
+        query = Select(targets=[Star()], from_table=Identifier('df'))
+        strict = True
+        for step in chain[1:]:
+            if type(step) == FilterStep:
+                query.where = self._adapt_filter(step.query, col_names)
+            elif type(step) == OrderByStep:
+                query.order_by = self._adapt_order_by(step.order_by, col_names)
+            elif type(step) == LimitOffsetStep:
+                limit, offset = get_int_value(step.limit), get_int_value(step.offset)
+                if limit is not None:
+                    query.limit = Constant(limit)
+                if offset is not None:
+                    query.offset = Constant(offset)
+            elif type(step) == ProjectStep:
+                query.targets = self._adapt_project(step.columns, col_names)
+                strict = False
+
+        # the same adaptation as for in-memory steps executed one by one
+        query, _table_name, json_columns = _adapt_query(query)
+        for name, df in dataframes.items():
+            dataframes[name] = encode_json_columns(df, [col for col in json_columns if col in df.columns])
+
+        query_str = SqlalchemyRender('postgres').get_string(query, with_failback=False)
+        query_str = f'WITH df AS ({join_query}) {query_str}'
+
+        resp_df, description = query_df_with_type_infer_fallback(
+            query_str, dataframes, get_column_types(col_names)
+        )
+        resp_df = resp_df.replace({np.nan: None})
+        resp_df.columns = [x[0] for x in description]
+
+        return ResultSet().from_df_cols(resp_df, col_names=col_names, strict=strict)
+
     def execute_step(self, step, steps_data):
         if type(step) == GetPredictorColumns:
             predictor_name = step.predictor.parts[-1]
@@ -750,10 +1209,16 @@ class SQLQuery():
 
         elif type(step) == GetTableColumns:
             table = step.table
-            dn = self.datahub.get(step.namespace)
-            ds_query = Select(from_table=Identifier(table), targets=[Star()], limit=Constant(0))
+            if (
+                get_schema_cache() is not None
+                and step.namespace.lower() in self.datahub.get_integrations_names()
+            ):
+                columns_info = self.datahub.get_integration_columns(step.namespace, table)
+            else:
+                dn = self.datahub.get(step.namespace)
+                ds_query = Select(from_table=Identifier(table), targets=[Star()], limit=Constant(0))
 
-            data, columns_info = dn.query(ds_query, session=self.session)
+                data, columns_info = dn.query(ds_query, session=self.session)
 
             data = ResultSet()
             for column in columns_info:
@@ -788,13 +1253,13 @@ class SQLQuery():
             for col in left_result.columns:
                 result.add_column(col)
 
-            records_hashes = []
+            records_hashes = set()
             for row in left_result.get_records_raw() + right_result.get_records_raw():
                 if step.unique:
-                    checksum = hashlib.sha256(str(row).encode()).hexdigest()
+                    checksum = str(row)
                     if checksum in records_hashes:
                         continue
-                    records_hashes.append(checksum)
+                    records_hashes.add(checksum)
                 result.add_record_raw(row)
 
             data = result
@@ -817,18 +1282,16 @@ class SQLQuery():
 
                 substep = step.step
                 if type(substep) == FetchDataframeStep:
-                    query = substep.query
+                    substeps = []
                     for var_group in vars:
-                        markQueryVar(query.where)
+                        substep2 = copy.deepcopy(substep)
+                        markQueryVar(substep2.query.where)
                         for name, value in var_group.items():
-                            replaceQueryVar(query.where, value, name)
-                        sub_data = self._fetch_dataframe_step(substep, steps_data)
-                        if len(data.columns) == 0:
-                            data = sub_data
-                        else:
-                            data.add_records(sub_data.get_records())
+                            replaceQueryVar(substep2.query.where, value, name)
+                        substeps.append(substep2)
 
-                        unmarkQueryVar(query.where)
+                    for sub_data in self._fetch_dataframe_steps(substeps, steps_data):
+                        data = join_query_data(data, sub_data)
                 elif type(substep) == MultipleSteps:
                     data = self._multiple_steps_reduce(substep, vars, steps_data)
                 else:
@@ -973,15 +1436,18 @@ class SQLQuery():
                         ))
                 else:
                     predictor_id = predictor_metadata['id']
-                    key = f'{predictor_name}_{predictor_id}_{json_checksum(where_data)}'
+                    key = f'{predictor_name}_{predictor_id}_{rows_checksum(where_data)}'
 
                     if self.session.predictor_cache is False:
-                        data = None
+                        predictions = None
                     else:
                         predictor_cache = get_cache('predict')
-                        data = predictor_cache.get(key)
+                        # predictions are cached as DataFrame to be serialized with dataframe codec
+                        predictions = predictor_cache.get_df(key)
+                        if not isinstance(predictions, pd.DataFrame):
+                            predictions = None
 
-                    if data is None:
+                    if predictions is None:
                         version = None
                         if len(step.predictor.parts) > 1 and step.predictor.parts[-1].isdigit():
                             version = int(step.predictor.parts[-1])
@@ -991,13 +1457,12 @@ class SQLQuery():
                             version=version,
                             params=params
                         )
-                        data = predictions.to_dict(orient='records')
-                        columns_dtypes = dict(predictions.dtypes)
 
-                        if data is not None and isinstance(data, list) and self.session.predictor_cache is not False:
-                            predictor_cache.set(key, data)
-                    else:
-                        columns_dtypes = {}
+                        if isinstance(predictions, pd.DataFrame) and self.session.predictor_cache is not False:
+                            predictor_cache.set_df(key, predictions)
+
+                    data = predictions.to_dict(orient='records')
+                    columns_dtypes = dict(predictions.dtypes)
                     if len(data) > 0:
                         cols = list(data[0].keys())
                         for col in cols:
@@ -1019,63 +1484,15 @@ class SQLQuery():
                 raise SqlApiUnknownError(f'error in apply predictor step: {e}') from e
         elif type(step) == JoinStep:
             try:
-                left_data = steps_data[step.left.step_num]
-                right_data = steps_data[step.right.step_num]
-                table_a, names_a = left_data.to_df_cols(prefix='A')
-                table_b, names_b = right_data.to_df_cols(prefix='B')
-
-                if right_data.is_prediction or left_data.is_prediction:
-                    # ignore join condition, use row_id
-                    a_row_id = left_data.find_columns('__mindsdb_row_id')[0].get_hash_name(prefix='A')
-                    b_row_id = right_data.find_columns('__mindsdb_row_id')[0].get_hash_name(prefix='B')
-
-                    join_condition = f'table_a.{a_row_id} = table_b.{b_row_id}'
-
-                    join_type = step.query.join_type.lower()
-                    if join_type == 'join':
-                        # join type is not specified. using join to prediction data
-                        if left_data.is_prediction:
-                            join_type = 'left join'
-                        elif right_data.is_prediction:
-                            join_type = 'right join'
-                else:
-                    def adapt_condition(node, **kwargs):
-                        if not isinstance(node, Identifier) or len(node.parts) != 2:
-                            return
-
-                        table_alias, alias = node.parts
-                        cols = left_data.find_columns(alias, table_alias)
-                        if len(cols) == 1:
-                            col_name = cols[0].get_hash_name(prefix='A')
-                            return Identifier(parts=['table_a', col_name])
-
-                        cols = right_data.find_columns(alias, table_alias)
-                        if len(cols) == 1:
-                            col_name = cols[0].get_hash_name(prefix='B')
-                            return Identifier(parts=['table_b', col_name])
-
-                    if step.query.condition is None:
-                        raise ErNotSupportedYet('Unable to join table without condition')
-
-                    condition = copy.deepcopy(step.query.condition)
-                    query_traversal(condition, adapt_condition)
-
-                    join_condition = SqlalchemyRender('postgres').get_string(condition)
-                    join_type = step.query.join_type
-
-                query = f"""
-                    SELECT * FROM table_a {join_type} table_b
-                    ON {join_condition}
-                """
-                resp_df, _description = query_df_with_type_infer_fallback(query, {
-                    'table_a': table_a,
-                    'table_b': table_b
-                })
+                query, dataframes, col_names = self._prepare_join(step, steps_data)
+
+                resp_df, _description = query_df_with_type_infer_fallback(
+                    query, dataframes, get_column_types(col_names)
+                )
 
                 resp_df = resp_df.replace({np.nan: None})
 
-                names_a.update(names_b)
-                data = ResultSet().from_df_cols(resp_df, col_names=names_a)
+                data = ResultSet().from_df_cols(resp_df, col_names=col_names)
 
             except Exception as e:
                 raise SqlApiUnknownError(f'error in join step: {e}') from e
@@ -1085,61 +1502,37 @@ class SQLQuery():
             result_set = steps_data[step.dataframe.step_num]
 
             df, col_names = result_set.to_df_cols()
-            col_idx = {}
-            for name, col in col_names.items():
-                col_idx[col.alias] = name
-                col_idx[(col.table_alias, col.alias)] = name
-
-            # analyze condition and change name of columns
-            def check_fields(node, is_table=None, **kwargs):
-                if is_table:
-                    raise ErNotSupportedYet('Subqueries is not supported in WHERE')
-                if isinstance(node, Identifier):
-                    # only column name
-                    col_name = node.parts[-1]
-
-                    if len(node.parts) == 1:
-                        key = col_name
-                    else:
-                        table_name = node.parts[-2]
-                        key = (table_name, col_name)
-
-                    if key not in col_idx:
-                        raise ErKeyColumnDoesNotExist(f'Table not found for column: {key}')
 
-                    new_name = col_idx[key]
-                    return Identifier(parts=[new_name])
-
-            where_query = step.query
-            query_traversal(where_query, check_fields)
+            where_query = self._adapt_filter(step.query, col_names)
 
             query = Select(targets=[Star()], from_table=Identifier('df'), where=where_query)
 
-            res = query_df(df, query)
+            res = query_df(df, query, column_types=get_column_types(col_names))
 
             result_set2 = ResultSet().from_df_cols(res, col_names)
 
             data = result_set2
 
-        elif type(step) == LimitOffsetStep:
-            try:
-                step_data = steps_data[step.dataframe.step_num]
+        elif type(step) == OrderByStep:
+            result_set = steps_data[step.dataframe.step_num]
 
-                step_data2 = ResultSet()
-                for col in step_data.columns:
-                    step_data2.add_column(col)
+            df, col_names = result_set.to_df_cols()
 
-                records = step_data.get_records_raw()
+            query = Select(
+                targets=[Star()],
+                from_table=Identifier('df'),
+                order_by=self._adapt_order_by(step.order_by, col_names)
+            )
 
-                if isinstance(step.offset, Constant) and isinstance(step.offset.value, int):
-                    records = records[step.offset.value:]
-                if isinstance(step.limit, Constant) and isinstance(step.limit.value, int):
-                    records = records[:step.limit.value]
+            res = query_df(df, query, column_types=get_column_types(col_names))
 
-                for record in records:
-                    step_data2.add_record_raw(record)
+            data = ResultSet().from_df_cols(res, col_names)
 
-                data = step_data2
+        elif type(step) == LimitOffsetStep:
+            try:
+                step_data = steps_data[step.dataframe.step_num]
+
+                data = step_data.slice(get_int_value(step.offset), get_int_value(step.limit))
 
             except Exception as e:
                 raise SqlApiUnknownError(f'error in limit offset step: {e}') from e
@@ -1147,62 +1540,13 @@ class SQLQuery():
             result_set = steps_data[step.dataframe.step_num]
 
             df, col_names = result_set.to_df_cols()
-            col_idx = {}
-            tbl_idx = defaultdict(list)
-            for name, col in col_names.items():
-                col_idx[col.alias] = name
-                col_idx[(col.table_alias, col.alias)] = name
-                # add to tables
-                tbl_idx[col.table_name].append(name)
-                if col.table_name != col.table_alias:
-                    tbl_idx[col.table_alias].append(name)
-
-            # analyze condition and change name of columns
-            def check_fields(node, is_table=None, **kwargs):
-                if is_table:
-                    raise ErNotSupportedYet('Subqueries is not supported in WHERE')
-                if isinstance(node, Identifier):
-                    # only column name
-                    col_name = node.parts[-1]
-                    if isinstance(col_name, Star):
-                        if len(node.parts) == 1:
-                            # left as is
-                            return
-                        else:
-                            # replace with all columns from table
-                            table_name = node.parts[-2]
-                            return [
-                                Identifier(parts=[col])
-                                for col in tbl_idx.get(table_name, [])
-                            ]
-
-                    if len(node.parts) == 1:
-                        key = col_name
-                    else:
-                        table_name = node.parts[-2]
-                        key = (table_name, col_name)
-
-                    if key not in col_idx:
-                        raise ErKeyColumnDoesNotExist(f'Table not found for column: {key}')
-
-                    new_name = col_idx[key]
-                    return Identifier(parts=[new_name], alias=node.alias)
 
             query = Select(
-                targets=step.columns,
+                targets=self._adapt_project(step.columns, col_names),
                 from_table=Identifier('df_table')
             )
 
-            targets0 = query_traversal(query.targets, check_fields)
-            targets = []
-            for target in targets0:
-                if isinstance(target, list):
-                    targets.extend(target)
-                else:
-                    targets.append(target)
-            query.targets = targets
-
-            res = query_df(df, query)
+            res = query_df(df, query, column_types=get_column_types(col_names))
 
             result_set2 = ResultSet().from_df_cols(res, col_names, strict=False)
 
@@ -1330,6 +1674,10 @@ class SQLQuery():
                 is_replace=is_replace,
                 is_create=is_create
             )
+            if is_create:
+                schema_cache = get_schema_cache()
+                if schema_cache is not None:
+                    schema_cache.invalidate(integration_name)
             data = ResultSet()
         elif type(step) == UpdateToTable:
             data = ResultSet()
@@ -13,6 +13,7 @@ import struct
 
 from mindsdb.api.mysql.mysql_proxy.libs.constants.mysql import (
     DEFAULT_CAPABILITIES,
+    EIGHT_BYTE_ENC,
     NULL_VALUE,
     ONE_BYTE_ENC,
     THREE_BYTE_ENC,
@@ -23,13 +24,38 @@ from mindsdb.utilities import log
 logger = log.getLogger(__name__)
 
 
+def lenenc_int(value: int) -> bytes:
+    """Length encoded integer
+    https://dev.mysql.com/doc/dev/mysql-server/latest/page_protocol_basic_dt_integers.html
+    """
+    if value < NULL_VALUE[0]:
+        return bytes((value,))
+    if value < 1 << 16:
+        return TWO_BYTE_ENC + struct.pack("<H", value)
+    if value < 1 << 24:
+        return THREE_BYTE_ENC + struct.pack("<I", value)[:3]
+    return EIGHT_BYTE_ENC + struct.pack("<Q", value)
+
+
+def lenenc_str(value: bytes) -> bytes:
+    """Length encoded string"""
+    return lenenc_int(len(value)) + value
+
+
+# parsed types of datum: {'string<lenenc>': ('string', 'lenenc')}
+_types_cache = {}
+
+
 class Datum:
     def __init__(self, type, value=None):
         # TODO other types: float, timestamp
         self.type = type
         self.value = b""
-        self.var_type = self.type.split("<")[0]
-        self.var_len = self.type.split("<")[1].replace(">", "")
+        var_type = _types_cache.get(type)
+        if var_type is None:
+            var_type = type.split("<")[0], type.split("<")[1].replace(">", "")
+            _types_cache[type] = var_type
+        self.var_type, self.var_len = var_type
 
         if value is not None:
             self.set(value)
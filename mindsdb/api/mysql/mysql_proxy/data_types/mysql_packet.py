@@ -131,6 +131,33 @@ class Packet:
     def body(self):
         return self._body
 
+    @staticmethod
+    def pack_bodies(bodies, seq):
+        """
+        Makes packets from bodies and joins them into one bytes string.
+        Body of MAX_PACKET_SIZE or more is split into several packets, the last of them
+        is shorter than MAX_PACKET_SIZE (it can be empty)
+
+        :param bodies: list of bodies (bytes) of packets
+        :param seq: sequence number of first packet
+        :return: bytes of all packets and sequence number for the next packet
+        """
+        out = []
+        for body in bodies:
+            if len(body) < MAX_PACKET_SIZE:
+                # 3 bytes of length and 1 byte of sequence number
+                out.append(struct.pack("<I", len(body) | (seq << 24)))
+                out.append(body)
+                seq = (seq + 1) % 256
+                continue
+            view = memoryview(body)
+            for start in range(0, len(body) + 1, MAX_PACKET_SIZE):
+                part = view[start: start + MAX_PACKET_SIZE]
+                out.append(struct.pack("<I", len(part) | (seq << 24)))
+                out.append(part)
+                seq = (seq + 1) % 256
+        return b"".join(out), seq
+
     @staticmethod
     def bodyStringToPackets(body_string):
         """
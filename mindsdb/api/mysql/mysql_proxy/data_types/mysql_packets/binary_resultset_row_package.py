@@ -13,11 +13,34 @@ import struct
 
 import pandas as pd
 
-from mindsdb.api.mysql.mysql_proxy.data_types.mysql_datum import Datum
+from mindsdb.api.mysql.mysql_proxy.data_types.mysql_datum import lenenc_str
 from mindsdb.api.mysql.mysql_proxy.data_types.mysql_packet import Packet
 from mindsdb.api.mysql.mysql_proxy.libs.constants.mysql import TYPES
 
 
+def _struct_encoder(fmt, cast):
+    pack = struct.Struct(fmt).pack
+
+    def encode(val):
+        return pack(cast(val))
+    return encode
+
+
+def _int(val):
+    return int(float(val))
+
+
+def _string(val):
+    return lenenc_str(str(val).encode('utf-8'))
+
+
+def _unsupported_encoder(col_type):
+    # NULL values are not encoded, error only if column has a value
+    def encode(val):
+        raise Exception(f'Column with type {col_type} cant be encripted')
+    return encode
+
+
 class BinaryResultsetRowPacket(Packet):
     '''
     Implementation based on:
@@ -29,66 +52,66 @@ class BinaryResultsetRowPacket(Packet):
         data = self._kwargs.get('data', {})
         columns = self._kwargs.get('columns', {})
 
-        self.value = [b'\x00']
-        nulls = [0]
-        for i, el in enumerate(data):
-            if i > 0 and (i + 2) % 8 == 0:
-                nulls.append(0)
-            if el is None:
-                if i < 6:
-                    nulls[-1] = nulls[-1] + (1 << ((i + 2) % 8))
-                else:
-                    nulls[-1] = nulls[-1] + (1 << ((i - 6) % 8))
-        self.value.append(bytes(nulls))
-
-        for i, col in enumerate(columns):
-            # NOTE at this moment all types sends as strings, and it works
-            val = data[i]
-            if val is None:
-                continue
+        encoders = self.get_encoders(columns)
+        self.value = [self.encode_row(data, encoders)]
 
-            enc = None
-            env_val = None
+    @staticmethod
+    def get_encoders(columns):
+        """Get function to encode value for every column, depending on type of the column"""
+        # NOTE at this moment all types sends as strings, and it works
+        encoders = []
+        for col in columns:
             col_type = col['type']
             if col_type == TYPES.MYSQL_TYPE_DOUBLE:
-                enc = '<d'
-                val = float(val)
+                encoder = _struct_encoder('<d', float)
             elif col_type == TYPES.MYSQL_TYPE_LONGLONG:
-                enc = '<q'
-                val = int(float(val))
+                encoder = _struct_encoder('<q', _int)
             elif col_type == TYPES.MYSQL_TYPE_LONG:
-                enc = '<l'
-                val = int(float(val))
+                encoder = _struct_encoder('<l', _int)
             elif col_type == TYPES.MYSQL_TYPE_FLOAT:
-                enc = '<f'
-                val = float(val)
+                encoder = _struct_encoder('<f', float)
             elif col_type == TYPES.MYSQL_TYPE_YEAR:
-                enc = '<h'
-                val = int(float(val))
-            elif col_type == TYPES.MYSQL_TYPE_DATE:
-                env_val = self.encode_date(val)
-            elif col_type == TYPES.MYSQL_TYPE_TIMESTAMP:
-                env_val = self.encode_date(val)
-            elif col_type == TYPES.MYSQL_TYPE_DATETIME:
-                env_val = self.encode_date(val)
-            elif col_type == TYPES.MYSQL_TYPE_TIME:
-                enc = ''
-            elif col_type == TYPES.MYSQL_TYPE_NEWDECIMAL:
-                enc = ''
+                encoder = _struct_encoder('<h', _int)
+            elif col_type in (TYPES.MYSQL_TYPE_DATE, TYPES.MYSQL_TYPE_TIMESTAMP, TYPES.MYSQL_TYPE_DATETIME):
+                encoder = BinaryResultsetRowPacket.encode_date
+            elif col_type in (TYPES.MYSQL_TYPE_TIME, TYPES.MYSQL_TYPE_NEWDECIMAL):
+                encoder = _unsupported_encoder(col_type)
             else:
-                enc = 'string'
-
-            if enc == '':
-                raise Exception(f'Column with type {col_type} cant be encripted')
+                encoder = _string
+            encoders.append(encoder)
+        return encoders
 
-            if enc == 'string':
-                self.value.append(Datum('string<lenenc>', str(val)).toStringPacket())
+    @staticmethod
+    def encode_row(data, encoders):
+        # null bitmap has offset of 2 bits
+        nulls = bytearray((len(data) + 7 + 2) // 8)
+        values = []
+        for i, val in enumerate(data):
+            if val is None:
+                nulls[(i + 2) // 8] |= 1 << ((i + 2) % 8)
             else:
-                if env_val is None:
-                    env_val = struct.pack(enc, val)
-                self.value.append(env_val)
+                values.append(encoders[i](val))
+        return b''.join([b'\x00', nulls, *values])
 
-    def encode_date(self, val):
+    @staticmethod
+    def encode_rows(rows, seq, columns):
+        """
+        Encode batch of rows to packets at once
+
+        :param rows: list of rows
+        :param seq: sequence number of first packet
+        :param columns: columns definitions
+        :return: bytes of packets and sequence number for the next packet
+        """
+        encoders = BinaryResultsetRowPacket.get_encoders(columns)
+        bodies = [
+            BinaryResultsetRowPacket.encode_row(row, encoders)
+            for row in rows
+        ]
+        return Packet.pack_bodies(bodies, seq)
+
+    @staticmethod
+    def encode_date(val):
         # date_type = None
         # date_value = None
 
@@ -103,9 +126,12 @@ class BinaryResultsetRowPacket(Packet):
                 except ValueError:
                     date_value = dt.datetime.strptime(val, '%Y-%m-%dT%H:%M:%S.%f')
                     date_type = 'datetime'
-        elif isinstance(val, pd.Timestamp):
+        elif isinstance(val, (pd.Timestamp, dt.datetime)):
             date_value = val
             date_type = 'datetime'
+        elif isinstance(val, dt.date):
+            date_value = val
+            date_type = 'date'
 
         out = struct.pack('<H', date_value.year)
         out += struct.pack('<B', date_value.month)
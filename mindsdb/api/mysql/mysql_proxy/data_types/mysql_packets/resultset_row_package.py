@@ -9,11 +9,24 @@
  *******************************************************
 """
 
-from mindsdb.api.mysql.mysql_proxy.data_types.mysql_datum import Datum
+from mindsdb.api.mysql.mysql_proxy.data_types.mysql_datum import lenenc_str
 from mindsdb.api.mysql.mysql_proxy.data_types.mysql_packet import Packet
 from mindsdb.api.mysql.mysql_proxy.libs.constants.mysql import NULL_VALUE
 
 
+def encode_text_column(values):
+    """Encode values of one column to length encoded strings"""
+    encoded = []
+    for val in values:
+        if val is None:
+            encoded.append(NULL_VALUE)
+        else:
+            if not isinstance(val, str):
+                val = str(val)
+            encoded.append(lenenc_str(val.encode('utf-8')))
+    return encoded
+
+
 class ResultsetRowPacket(Packet):
     '''
     Implementation based on:
@@ -23,25 +36,34 @@ class ResultsetRowPacket(Packet):
 
     def setup(self):
         data = self._kwargs.get('data', {})
-        self.value = []
-        for val in data:
-            if val is None:
-                self.value.append(NULL_VALUE)
-            else:
-                self.value.append(Datum('string<lenenc>', str(val)))
+        self.value = encode_text_column(data)
 
     @property
     def body(self):
-        string = b''
-        for x in self.value:
-            if x is NULL_VALUE:
-                string += x
-            else:
-                string += x.toStringPacket()
+        string = b''.join(self.value)
 
         self.setBody(string)
         return self._body
 
+    @staticmethod
+    def encode_rows(rows, seq):
+        """
+        Encode batch of rows to packets at once. Values are converted column by column
+
+        :param rows: list of rows
+        :param seq: sequence number of first packet
+        :return: bytes of packets and sequence number for the next packet
+        """
+        if len(rows) == 0:
+            return b'', seq
+        columns = [encode_text_column(values) for values in zip(*rows)]
+        if len(columns) == 0:
+            # rows without columns
+            bodies = [b''] * len(rows)
+        else:
+            bodies = [b''.join(cells) for cells in zip(*columns)]
+        return Packet.pack_bodies(bodies, seq)
+
     @staticmethod
     def test():
         import pprint
@@ -1,7 +1,7 @@
 from functools import partial
 
 import pandas as pd
-from mindsdb_sql.parser.ast import BinaryOperation, Constant, Identifier, Select
+from mindsdb_sql.parser.ast import BinaryOperation, Constant, Identifier, Select, Star
 from mindsdb_sql.parser.ast.base import ASTNode
 
 from mindsdb.api.mysql.mysql_proxy.classes.sql_query import get_all_tables
@@ -19,6 +19,7 @@ from mindsdb.api.mysql.mysql_proxy.datahub.datanodes.project_datanode import (
 from mindsdb.api.mysql.mysql_proxy.utilities import exceptions as exc
 from mindsdb.api.mysql.mysql_proxy.utilities.sql import query_df
 from mindsdb.interfaces.agents.agents_controller import AgentsController
+from mindsdb.interfaces.database.schema_cache import get_schema_cache
 from mindsdb.interfaces.database.projects import ProjectController
 from mindsdb.interfaces.jobs.jobs_controller import JobsController
 from mindsdb.interfaces.skills.skills_controller import SkillsController
@@ -423,6 +424,60 @@ class InformationSchemaDataNode(DataNode):
             f"Table information_schema.{tableName} does not exists"
         )
 
+    def get_integration_tables(self, integration_name: str) -> list:
+        """ list of TablesRow of integration, it is read through schema cache if cache is enabled
+        """
+        schema_cache = get_schema_cache()
+        if schema_cache is None:
+            return self._fetch_integration_tables(integration_name)
+        return schema_cache.get_tables(
+            integration_name,
+            partial(self._fetch_integration_tables, integration_name)
+        )
+
+    def get_integration_columns(self, integration_name: str, table_name: str) -> list:
+        """ list of columns of the table of integration: [{'name': ..., 'type': ...}],
+            it is read through schema cache if cache is enabled
+        """
+        schema_cache = get_schema_cache()
+        if schema_cache is None:
+            return self._fetch_integration_columns(integration_name, table_name)
+        return schema_cache.get_columns(
+            integration_name,
+            table_name,
+            partial(self._fetch_integration_columns, integration_name, table_name)
+        )
+
+    def _fetch_integration_tables(self, integration_name: str) -> list:
+        return self.get(integration_name).get_tables()
+
+    def _fetch_integration_columns(self, integration_name: str, table_name: str) -> list:
+        dn = self.get(integration_name)
+        query = Select(from_table=Identifier(table_name), targets=[Star()], limit=Constant(0))
+        _, columns_info = dn.query(query, session=self.session)
+        return columns_info
+
+    @staticmethod
+    def _get_filter_value(query: ASTNode, column_name: str):
+        """ value of the condition 'column_name = constant' in WHERE of the query
+        """
+        if type(query) != Select or type(query.where) != BinaryOperation:
+            return None
+        if query.where.op == "and":
+            conditions = query.where.args
+        else:
+            conditions = [query.where]
+        for arg in conditions:
+            if (
+                type(arg) == BinaryOperation
+                and arg.op == "="
+                and type(arg.args[0]) == Identifier
+                and arg.args[0].parts[-1].upper() == column_name
+                and type(arg.args[1]) == Constant
+            ):
+                return arg.args[1].value
+        return None
+
     def get_integrations_names(self):
         integration_names = self.integration_controller.get_all().keys()
         # remove files from list to prevent doubling in 'select from INFORMATION_SCHEMA.TABLES'
@@ -478,22 +533,7 @@ class InformationSchemaDataNode(DataNode):
     def _get_tables(self, query: ASTNode = None):
         columns = self.information_schema["TABLES"]
 
-        target_table = None
-        if (
-            type(query) == Select
-            and type(query.where) == BinaryOperation
-            and query.where.op == "and"
-        ):
-            for arg in query.where.args:
-                if (
-                    type(arg) == BinaryOperation
-                    and arg.op == "="
-                    and type(arg.args[0]) == Identifier
-                    and arg.args[0].parts[-1].upper() == "TABLE_SCHEMA"
-                    and type(arg.args[1]) == Constant
-                ):
-                    target_table = arg.args[1].value
-                    break
+        target_table = self._get_filter_value(query, "TABLE_SCHEMA")
 
         data = []
         for name in self.information_schema.keys():
@@ -532,8 +572,7 @@ class InformationSchemaDataNode(DataNode):
             if target_table is not None and target_table != ds_name:
                 continue
             try:
-                ds = self.get(ds_name)
-                ds_tables = ds.get_tables()
+                ds_tables = self.get_integration_tables(ds_name)
                 for row in ds_tables:
                     row.TABLE_SCHEMA = ds_name
                     data.append(row.to_list())
@@ -939,9 +978,56 @@ class InformationSchemaDataNode(DataNode):
                 result_row[4] = i
                 result.append(result_row)
 
+        # columns of integration are listed only if it is specified in the query:
+        # getting of them requires a request to the database for every table,
+        # so all tables of integration are scanned only if schema cache is enabled
+        target_schema = self._get_filter_value(query, "TABLE_SCHEMA")
+        target_table = self._get_filter_value(query, "TABLE_NAME")
+        if (
+            target_schema is not None
+            and target_schema.lower() in self.get_integrations_names()
+            and (target_table is not None or get_schema_cache() is not None)
+        ):
+            if target_table is not None:
+                tables_names = [target_table]
+            else:
+                try:
+                    tables_names = [row.TABLE_NAME for row in self.get_integration_tables(target_schema)]
+                except Exception:
+                    logger.error(f"Can't get tables from '{target_schema}'")
+                    tables_names = []
+            for table_name in tables_names:
+                try:
+                    columns_info = self.get_integration_columns(target_schema, table_name)
+                except Exception:
+                    logger.error(f"Can't get columns of '{target_schema}.{table_name}'")
+                    continue
+                for i, column in enumerate(columns_info):
+                    result_row = row_templates[self._get_column_template(column.get("type"))].copy()
+                    result_row[1] = target_schema
+                    result_row[2] = table_name
+                    result_row[3] = column["name"]
+                    result_row[4] = i
+                    result.append(result_row)
+
         df = pd.DataFrame(result, columns=columns)
         return df
 
+    @staticmethod
+    def _get_column_template(column_type) -> str:
+        """ name of row template in information_schema.COLUMNS for pandas type
+        """
+        try:
+            if pd.api.types.is_integer_dtype(column_type):
+                return "bigint"
+            if pd.api.types.is_float_dtype(column_type):
+                return "float"
+            if pd.api.types.is_datetime64_any_dtype(column_type):
+                return "timestamp"
+        except TypeError:
+            pass
+        return "text"
+
     def _get_schemata(self, query: ASTNode = None):
         columns = self.information_schema["SCHEMATA"]
 
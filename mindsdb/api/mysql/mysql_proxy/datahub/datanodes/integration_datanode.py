@@ -1,3 +1,5 @@
+from typing import Iterator
+
 import numpy as np
 from numpy import dtype as np_dtype
 import pandas as pd
@@ -23,6 +25,10 @@ class DBHandlerException(Exception):
 
 class IntegrationDataNode(DataNode):
     type = 'integration'
+    # count of rows in chunk for query_stream
+    fetch_size = 10000
+    # count of rows inserted by one query in create_table, if handler doesn't support bulk_insert
+    insert_batch_size = 10000
 
     def __init__(self, integration_name, ds_type, integration_controller):
         self.integration_name = integration_name
@@ -106,45 +112,71 @@ class IntegrationDataNode(DataNode):
                 raise Exception(result.error_message)
 
         insert_columns = [Identifier(parts=[x.alias]) for x in result_set.columns]
-        formatted_data = []
-
-        for rec in result_set.get_records():
-            new_row = []
-            for col in result_set.columns:
-                value = rec[col.alias]
-                column_type = table_columns_meta[col.alias]
-
-                python_type = str
-                if column_type == Integer:
-                    python_type = int
-                elif column_type == Float:
-                    python_type = float
-
-                try:
-                    value = python_type(value) if value is not None else value
-                except Exception:
-                    pass
-                new_row.append(value)
-            formatted_data.append(new_row)
-
-        if len(formatted_data) == 0:
+        formatted_data = {}
+
+        for i, col in enumerate(result_set.columns):
+            column_type = table_columns_meta[col.alias]
+
+            python_type = str
+            if column_type == Integer:
+                python_type = int
+            elif column_type == Float:
+                python_type = float
+
+            formatted_data[col.alias] = [
+                self._convert_value(value, python_type)
+                for value in result_set.get_column_values(i)
+            ]
+
+        # object dtype keeps python types and None values
+        df = pd.DataFrame(formatted_data, columns=[x.alias for x in result_set.columns], dtype=object)
+
+        if len(df) == 0:
             # not need to insert
             return
 
-        insert_ast = Insert(
-            table=table_name,
-            columns=insert_columns,
-            values=formatted_data
-        )
+        if hasattr(type(self.integration_handler), 'bulk_insert'):
+            # handler inserts the whole dataframe in one transaction
+            try:
+                result = self.integration_handler.bulk_insert(table_name, df)
+            except Exception as e:
+                msg = f'[{self.ds_type}/{self.integration_name}]: {str(e)}'
+                raise DBHandlerException(msg) from e
 
-        try:
-            result = self.integration_handler.query(insert_ast)
-        except Exception as e:
-            msg = f'[{self.ds_type}/{self.integration_name}]: {str(e)}'
-            raise DBHandlerException(msg) from e
+            if result.type == RESPONSE_TYPE.ERROR:
+                raise Exception(result.error_message)
+            return
 
-        if result.type == RESPONSE_TYPE.ERROR:
-            raise Exception(result.error_message)
+        # every insert query is committed by handler:
+        #   if one of batches fails, rows of previous batches remain in the table
+        inserted = 0
+        for start in range(0, len(df), self.insert_batch_size):
+            batch_df = df.iloc[start: start + self.insert_batch_size]
+            inserted_msg = f'inserted rows: {inserted} of {len(df)}'
+
+            try:
+                insert_ast = Insert(
+                    table=table_name,
+                    columns=insert_columns,
+                    values=batch_df.values.tolist()
+                )
+                result = self.integration_handler.query(insert_ast)
+            except Exception as e:
+                msg = f'[{self.ds_type}/{self.integration_name}]: {str(e)} ({inserted_msg})'
+                raise DBHandlerException(msg) from e
+
+            if result.type == RESPONSE_TYPE.ERROR:
+                raise Exception(f'{result.error_message} ({inserted_msg})')
+            inserted += len(batch_df)
+
+    @staticmethod
+    def _convert_value(value, python_type):
+        if value is None:
+            return value
+        try:
+            return python_type(value)
+        except Exception:
+            return value
 
     @profiler.profile()
     def query(self, query=None, native_query=None, session=None):
@@ -166,7 +198,46 @@ class IntegrationDataNode(DataNode):
         if result.type == RESPONSE_TYPE.OK:
             return [], []
 
-        df = result.data_frame
+        df = self._clear_df(result.data_frame)
+
+        columns_info = [
+            {
+                'name': k,
+                'type': v
+            }
+            for k, v in df.dtypes.items()
+        ]
+        data = df.to_dict(orient='records')
+        return data, columns_info
+
+    def has_query_stream(self) -> bool:
+        # it is capability of handler class, instance can be a proxy to handler
+        return hasattr(type(self.integration_handler), 'query_stream')
+
+    def query_stream(self, query, fetch_size: int = None) -> Iterator[pd.DataFrame]:
+        """ Fetch result of SELECT query by chunks
+
+            Args:
+                query (ASTNode): SELECT query
+                fetch_size (int): count of rows in chunk
+
+            Returns:
+                Iterator[pd.DataFrame]: the first dataframe is returned even if result is empty
+        """
+        if fetch_size is None:
+            fetch_size = self.fetch_size
+        try:
+            for df in self.integration_handler.query_stream(query, fetch_size=fetch_size):
+                yield self._clear_df(df)
+        except Exception as e:
+            msg = str(e).strip()
+            if msg == '':
+                msg = e.__class__.__name__
+            msg = f'[{self.ds_type}/{self.integration_name}]: {msg}'
+            raise DBHandlerException(msg) from e
+
+    @staticmethod
+    def _clear_df(df) -> pd.DataFrame:
         # region clearing df from NaN values
         # recursion error appears in pandas 1.5.3 https://github.com/pandas-dev/pandas/pull/45749
         if isinstance(df, pd.Series):
@@ -182,13 +253,4 @@ class IntegrationDataNode(DataNode):
         except Exception as e:
             logger.error(f"Issue with clearing DF from NaN values: {e}")
         # endregion
-
-        columns_info = [
-            {
-                'name': k,
-                'type': v
-            }
-            for k, v in df.dtypes.items()
-        ]
-        data = df.to_dict(orient='records')
-        return data, columns_info
+        return df
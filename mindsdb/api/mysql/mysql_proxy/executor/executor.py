@@ -44,6 +44,10 @@ class Executor:
         self.error_message = None
         self.error_code = None
 
+        # if True: result of select can be returned in self.data as iterator of rows,
+        #   consumer has to read it before the next query
+        self.stream_data = False
+
         # self.predictor_metadata = {}
 
         self.sql = ""
@@ -94,6 +94,7 @@ from mindsdb.integrations.libs.const import (
 from mindsdb.integrations.libs.response import HandlerStatusResponse
 from mindsdb.interfaces.chatbot.chatbot_controller import ChatBotController
 from mindsdb.interfaces.database.projects import ProjectController
+from mindsdb.interfaces.database.schema_cache import get_schema_cache
 from mindsdb.interfaces.jobs.jobs_controller import JobsController
 from mindsdb.interfaces.model.functions import (
     get_model_record,
@@ -616,7 +617,7 @@ class ExecuteCommands:
         elif type(statement) == Select:
             if statement.from_table is None:
                 return self.answer_single_row_select(statement)
-            query = SQLQuery(statement, session=self.session)
+            query = SQLQuery(statement, session=self.session, stream=getattr(self.executor, 'stream_data', False))
             return self.answer_select(query)
         elif type(statement) == Union:
             query = SQLQuery(statement, session=self.session)
@@ -1009,10 +1010,9 @@ class ExecuteCommands:
 
         storage = None
         try:
-            handlers_meta = (
-                self.session.integration_controller.get_handlers_import_status()
-            )
-            handler_meta = handlers_meta[engine]
+            handler_meta = self.session.integration_controller.get_handler_meta(engine)
+            if handler_meta is None:
+                raise SqlApiException(f"There is no engine '{engine}'")
             if handler_meta.get("import", {}).get("success") is not True:
                 raise SqlApiException(f"Handler '{engine}' can not be used")
 
@@ -1081,10 +1081,8 @@ class ExecuteCommands:
             else:
                 return ExecuteAnswer(ANSWER_TYPE.OK)
 
-        handler_module_meta = (
-            self.session.integration_controller.get_handlers_import_status().get(
-                statement.handler
-            )
+        handler_module_meta = self.session.integration_controller.get_handler_meta(
+            statement.handler
         )
         if handler_module_meta is None:
             raise SqlApiException(f"There is no engine '{statement.handler}'")
@@ -1168,6 +1166,7 @@ class ExecuteCommands:
                 if statement.if_not_exists is False:
                     raise
         else:
+            self._invalidate_schema_cache(database_name)
             try:
                 self._create_integration(database_name, engine, connection_args)
             except EntityExistsError:
@@ -1185,8 +1184,16 @@ class ExecuteCommands:
         except EntityNotExistsError:
             if statement.if_exists is not True:
                 raise
+        self._invalidate_schema_cache(db_name)
         return ExecuteAnswer(ANSWER_TYPE.OK)
 
+    def _invalidate_schema_cache(self, db_name: str):
+        """ remove cached tables and columns of the database
+        """
+        schema_cache = get_schema_cache()
+        if schema_cache is not None:
+            schema_cache.invalidate(db_name)
+
     def answer_drop_tables(self, statement):
         """answer on 'drop table [if exists] {name}'
         Args:
@@ -1203,6 +1210,7 @@ class ExecuteCommands:
             dn = self.session.datahub[db_name]
             if db_name is not None:
                 dn.drop_table(table, if_exists=statement.if_exists)
+                self._invalidate_schema_cache(db_name)
 
             elif db_name in self.session.database_controller.get_dict(filter_type="project"):
                 # TODO do we need feature: delete object from project via drop table?
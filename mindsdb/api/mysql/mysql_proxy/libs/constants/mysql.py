@@ -138,6 +138,24 @@ class TYPES(object):
 TYPES = TYPES()
 
 
+# max length of value of the type in text representation, it is sent in column definition
+TYPES_MAX_LENGTH = {
+    TYPES.MYSQL_TYPE_TINY: 4,
+    TYPES.MYSQL_TYPE_SHORT: 6,
+    TYPES.MYSQL_TYPE_INT24: 9,
+    TYPES.MYSQL_TYPE_LONG: 11,
+    TYPES.MYSQL_TYPE_LONGLONG: 20,
+    TYPES.MYSQL_TYPE_FLOAT: 12,
+    TYPES.MYSQL_TYPE_DOUBLE: 22,
+    TYPES.MYSQL_TYPE_YEAR: 4,
+    TYPES.MYSQL_TYPE_DATE: 10,
+    TYPES.MYSQL_TYPE_TIME: 17,
+    TYPES.MYSQL_TYPE_DATETIME: 26,
+    TYPES.MYSQL_TYPE_TIMESTAMP: 26,
+}
+DEFAULT_MAX_LENGTH = 0xFFFF
+
+
 class FIELD_FLAG(object):
     __slots__ = ()
     NOT_NULL = 1                # field cannot be null
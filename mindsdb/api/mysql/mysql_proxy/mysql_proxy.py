@@ -21,6 +21,7 @@ import sys
 import tempfile
 import traceback
 from functools import partial
+from itertools import islice
 from typing import Dict, List
 
 from numpy import dtype as np_dtype
@@ -63,9 +64,11 @@ from mindsdb.api.mysql.mysql_proxy.libs.constants.mysql import (
     CHARSET_NUMBERS,
     COMMANDS,
     DEFAULT_AUTH_METHOD,
+    DEFAULT_MAX_LENGTH,
     ERR,
     SERVER_STATUS,
     TYPES,
+    TYPES_MAX_LENGTH,
     getConstName,
 )
 from mindsdb.api.mysql.mysql_proxy.libs.constants.response_type import RESPONSE_TYPE
@@ -75,6 +78,7 @@ from mindsdb.api.mysql.mysql_proxy.utilities import (
     SqlApiUnknownError,
 )
 from mindsdb.api.mysql.mysql_proxy.utilities.lightwood_dtype import dtype
+from mindsdb.interfaces.database.integrations import integration_controller
 from mindsdb.utilities import log
 from mindsdb.utilities.config import Config
 from mindsdb.utilities.context import context as ctx
@@ -147,6 +151,9 @@ class MysqlProxy(SocketServer.BaseRequestHandler):
     The Main Server controller class
     """
 
+    # count of rows which are encoded and sent to the client at once
+    rows_batch_size = 1000
+
     @staticmethod
     def server_close(srv):
         srv.server_close()
@@ -338,18 +345,50 @@ class MysqlProxy(SocketServer.BaseRequestHandler):
         string = b"".join([x.accum() for x in packages])
         self.socket.sendall(string)
 
+    def send_rows(self, packet_class, rows, **kwargs):
+        """Send rows to the client in batches. Only one batch of encoded rows is kept in memory,
+        rows can be any iterable (a list or a generator of rows)
+
+        :param packet_class: class of row packet, it is used to encode batch of rows
+        :param rows: iterable of rows
+        :return: count of sent rows
+        """
+        rows = iter(rows)
+        count = 0
+        while True:
+            batch = list(islice(rows, self.rows_batch_size))
+            if len(batch) == 0:
+                break
+            string, seq = packet_class.encode_rows(
+                batch, self.session.packet_sequence_number, **kwargs
+            )
+            self.session.packet_sequence_number = seq
+            self.socket.sendall(string)
+            count += len(batch)
+        return count
+
     def answer_stmt_close(self, stmt_id):
         self.session.unregister_stmt(stmt_id)
 
     def send_query_answer(self, answer: SQLAnswer):
         if answer.type == RESPONSE_TYPE.TABLE:
-            packages = []
-            packages += self.get_tabel_packets(columns=answer.columns, data=answer.data)
+            self.send_package_group(self.get_table_header_packets(columns=answer.columns))
+            try:
+                self.send_rows(ResultsetRowPacket, answer.data)
+            except Exception as e:
+                # rows can be fetched while they are sent: result is finished by error packet
+                logger.error(f"ERROR while sending rows\n{traceback.format_exc()}")
+                answer.resp_type = RESPONSE_TYPE.ERROR
+                answer.error_code = getattr(e, 'err_code', ERR.ER_UNKNOWN_ERROR)
+                answer.error_message = str(e)
+                self.packet(
+                    ErrPacket, err_code=answer.error_code, msg=answer.error_message
+                ).send()
+                return
             if answer.status is not None:
-                packages.append(self.last_packet(status=answer.status))
+                self.send_package_group([self.last_packet(status=answer.status)])
             else:
-                packages.append(self.last_packet())
-            self.send_package_group(packages)
+                self.send_package_group([self.last_packet()])
         elif answer.type == RESPONSE_TYPE.OK:
             self.packet(OkPacket, state_track=answer.state_track).send()
         elif answer.type == RESPONSE_TYPE.ERROR:
@@ -357,11 +396,9 @@ class MysqlProxy(SocketServer.BaseRequestHandler):
                 ErrPacket, err_code=answer.error_code, msg=answer.error_message
             ).send()
 
-    def _get_column_defenition_packets(self, columns, data=None):
-        if data is None:
-            data = []
+    def _get_column_defenition_packets(self, columns):
         packets = []
-        for i, column in enumerate(columns):
+        for column in columns:
             logger.info(
                 "%s._get_column_defenition_packets: handling column - %s of %s type",
                 self.__class__.__name__,
@@ -372,15 +409,8 @@ class MysqlProxy(SocketServer.BaseRequestHandler):
             column_name = column.get("name", "column_name")
             column_alias = column.get("alias", column_name)
             flags = column.get("flags", 0)
-            if len(data) == 0:
-                length = 0xFFFF
-            else:
-                length = 1
-                for row in data:
-                    if isinstance(row, dict):
-                        length = max(len(str(row[column_alias])), length)
-                    else:
-                        length = max(len(str(row[i])), length)
+            # length is defined by type, data is not scanned for it
+            length = TYPES_MAX_LENGTH.get(column["type"], DEFAULT_MAX_LENGTH)
 
             packets.append(
                 self.packet(
@@ -398,15 +428,13 @@ class MysqlProxy(SocketServer.BaseRequestHandler):
             )
         return packets
 
-    def get_tabel_packets(self, columns, data, status=0):
+    def get_table_header_packets(self, columns, status=0):
         # TODO remove columns order
         packets = [self.packet(ColumnCountPacket, count=len(columns))]
-        packets.extend(self._get_column_defenition_packets(columns, data))
+        packets.extend(self._get_column_defenition_packets(columns))
 
         if self.client_capabilities.DEPRECATE_EOF is False:
             packets.append(self.packet(EofPacket, status=status))
-
-        packets += [self.packet(ResultsetRowPacket, data=x) for x in data]
         return packets
 
     def decode_utf(self, text):
@@ -521,6 +549,8 @@ class MysqlProxy(SocketServer.BaseRequestHandler):
     @profiler.profile()
     def process_query(self, sql):
         executor = Executor(session=self.session, sqlserver=self)
+        # rows are sent by send_rows, it reads them by batches
+        executor.stream_data = True
 
         executor.query_execute(sql)
 
@@ -591,18 +621,16 @@ class MysqlProxy(SocketServer.BaseRequestHandler):
 
         if self.client_capabilities.DEPRECATE_EOF is False:
             packages.append(self.packet(EofPacket, status=0x0062))
-        else:
-            # send all
-            for row in executor.data:
-                packages.append(
-                    self.packet(BinaryResultsetRowPacket, data=row, columns=columns_def)
-                )
+            return self.send_package_group(packages)
 
-            server_status = executor.server_status or 0x0002
-            packages.append(self.last_packet(status=server_status))
-            prepared_stmt["fetched"] += len(executor.data)
+        # send all
+        self.send_package_group(packages)
+        prepared_stmt["fetched"] += self.send_rows(
+            BinaryResultsetRowPacket, executor.data, columns=columns_def
+        )
 
-        return self.send_package_group(packages)
+        server_status = executor.server_status or 0x0002
+        self.send_package_group([self.last_packet(status=server_status)])
 
     def answer_stmt_fetch(self, stmt_id, limit):
         prepared_stmt = self.session.prepared_stmts[stmt_id]
@@ -615,14 +643,10 @@ class MysqlProxy(SocketServer.BaseRequestHandler):
             )
             return self.send_query_answer(resp)
 
-        packages = []
         columns = self.to_mysql_columns(executor.columns)
-        for row in executor.data[fetched:limit]:
-            packages.append(
-                self.packet(BinaryResultsetRowPacket, data=row, columns=columns)
-            )
-
-        prepared_stmt["fetched"] += len(executor.data[fetched:limit])
+        prepared_stmt["fetched"] += self.send_rows(
+            BinaryResultsetRowPacket, executor.data[fetched:limit], columns=columns
+        )
 
         if len(executor.data) <= limit + fetched:
             status = sum(
@@ -639,8 +663,7 @@ class MysqlProxy(SocketServer.BaseRequestHandler):
                 ]
             )
 
-        packages.append(self.last_packet(status=status))
-        self.send_package_group(packages)
+        self.send_package_group([self.last_packet(status=status)])
 
     def handle(self):
         """
@@ -800,6 +823,16 @@ class MysqlProxy(SocketServer.BaseRequestHandler):
                 traceback=error_traceback,
             )
 
+            # return connections to integrations to pool
+            self.session.integration_controller.release_handlers()
+
+    def finish(self):
+        """
+        Called after handle() in any case: return connections to integrations to pool
+        if the command was interrupted by error or by the client
+        """
+        integration_controller.release_handlers()
+
     def packet(self, packetClass=Packet, **kwargs):
         """
         Factory method for packets
@@ -1,8 +1,10 @@
 import copy
+import threading
 
 import duckdb
 from duckdb import InvalidInputException
 import numpy as np
+from pandas.api import types as pd_types
 
 from mindsdb_sql import parse_sql
 from mindsdb_sql.render.sqlalchemy_render import SqlalchemyRender
@@ -18,51 +20,116 @@ from mindsdb.utilities.json_encoder import CustomJSONEncoder
 logger = log.getLogger(__name__)
 
 
-def query_df_with_type_infer_fallback(query_str: str, dataframes: dict):
+_duckdb_local = threading.local()
+
+
+def get_duckdb_connection():
+    """ Returns in-memory duckdb connection of the current thread.
+        Connection is created on first call and reused by all next queries of the thread
+
+        Returns:
+            duckdb.DuckDBPyConnection
+    """
+    con = getattr(_duckdb_local, 'connection', None)
+    if con is None:
+        con = duckdb.connect(database=':memory:')
+        _duckdb_local.connection = con
+    return con
+
+
+def _declare_column_types(df, column_types):
+    """ Cast 'object' columns of dataframe to the type declared for the column.
+        In this case duckdb doesn't need to infer the type of column by values
+
+        Args:
+            df (pandas.DataFrame): data
+            column_types (dict): {column name: dtype}
+
+        Returns:
+            pandas.DataFrame
+    """
+    casted = False
+    for name, col_type in column_types.items():
+        if not isinstance(col_type, np.dtype) or name not in df.columns:
+            continue
+        if df[name].dtype != object:
+            continue
+
+        if pd_types.is_bool_dtype(col_type):
+            new_type = 'boolean'
+        elif pd_types.is_integer_dtype(col_type):
+            new_type = 'Int64'
+        elif pd_types.is_float_dtype(col_type):
+            new_type = 'float64'
+        elif pd_types.is_datetime64_any_dtype(col_type):
+            new_type = col_type
+        else:
+            continue
+
+        try:
+            values = df[name].astype(new_type)
+        except (ValueError, TypeError):
+            # values don't match declared type, let duckdb infer it
+            continue
+
+        if not casted:
+            # don't change original dataframe
+            df = df.copy(deep=False)
+            casted = True
+        df[name] = values
+    return df
+
+
+def query_df_with_type_infer_fallback(query_str: str, dataframes: dict, column_types: dict = None):
     ''' Duckdb need to infer column types if column.dtype == object. By default it take 1000 rows,
-        but that may be not sufficient for some cases. This func try to run query multiple times
-        increasing butch size for type infer
+        but that may be not sufficient for some cases. Columns with known types are casted before
+        the query, if type infer on sample fails anyway the query is repeated once with sample
+        equals to the size of data
 
         Args:
             query_str (str): query to execute
             dataframes (dict): dataframes
+            column_types (dict): optional, {column name: dtype} of columns of the dataframes
 
         Returns:
             pandas.DataFrame
             pandas.columns
     '''
 
-    for name, value in dataframes.items():
-        locals()[name] = value
+    con = get_duckdb_connection()
+
+    max_size = 0
+    for name, df in dataframes.items():
+        if column_types:
+            df = _declare_column_types(df, column_types)
+        con.register(name, df)
+        max_size = max(max_size, len(df))
 
-    con = duckdb.connect(database=':memory:')
-    for sample_size in [1000, 10000, 1000000]:
+    try:
         try:
-            con.execute(f'set global pandas_analyze_sample={sample_size};')
+            con.execute('set global pandas_analyze_sample=1000;')
             result_df = con.execute(query_str).fetchdf()
         except InvalidInputException:
-            pass
-        else:
-            break
-    else:
-        raise InvalidInputException
-    description = con.description
-    con.close()
+            if max_size <= 1000:
+                raise
+            con.execute(f'set global pandas_analyze_sample={max_size};')
+            result_df = con.execute(query_str).fetchdf()
+        description = con.description
+    finally:
+        for name in dataframes.keys():
+            con.unregister(name)
 
     return result_df, description
 
 
-def query_df(df, query, session=None):
-    """ Perform simple query ('select' from one table, without subqueries and joins) on DataFrame.
-
-        Args:
-            df (pandas.DataFrame): data
-            query (mindsdb_sql.parser.ast.Select | str): select query
+def _adapt_query(query, session=None):
+    """ Convert query to duckdb dialect, the table of the query is replaced to 'df'
 
         Returns:
-            pandas.DataFrame
+            Select: adapted query
+            str: name of the table in the query
+            set: names of columns used in json functions
     """
-
     if isinstance(query, str):
         query_ast = parse_sql(query, dialect='mysql')
     else:
@@ -103,8 +170,19 @@ def query_df(df, query, session=None):
                 json_columns.add(node.args[0].parts[-1])
 
     query_traversal(query_ast, adapt_query)
+    return query_ast, table_name, json_columns
 
-    # convert json columns
+
+def encode_json_columns(df, json_columns):
+    """ Convert dicts and lists in columns to json strings, to use them in json functions of duckdb
+
+        Args:
+            df (pandas.DataFrame): data
+            json_columns (Iterable[str]): names of columns
+
+        Returns:
+            pandas.DataFrame
+    """
     encoder = CustomJSONEncoder()
 
     def _convert(v):
@@ -116,7 +194,10 @@ def query_df(df, query, session=None):
         return v
     for column in json_columns:
         df[column] = df[column].apply(_convert)
+    return df
 
+
+def _render_query(query_ast, query) -> str:
     render = SqlalchemyRender('postgres')
     try:
         query_str = render.get_string(query_ast, with_failback=False)
@@ -125,17 +206,10 @@ def query_df(df, query, session=None):
             f"Exception during query casting to 'postgres' dialect. Query: {str(query)}. Error: {e}"
         )
         query_str = render.get_string(query_ast, with_failback=True)
+    return query_str
 
-    # workaround to prevent duckdb.TypeMismatchException
-    if len(df) > 0:
-        if table_name.lower() in ('models', 'predictors', 'models_versions'):
-            if 'TRAINING_OPTIONS' in df.columns:
-                df = df.astype({'TRAINING_OPTIONS': 'string'})
-        if table_name.lower() == 'ml_engines':
-            if 'CONNECTION_DATA' in df.columns:
-                df = df.astype({'CONNECTION_DATA': 'string'})
 
-    result_df, description = query_df_with_type_infer_fallback(query_str, {'df': df})
+def _prepare_result(result_df, description):
     result_df = result_df.replace({np.nan: None})
 
     new_column_names = {}
@@ -147,3 +221,61 @@ def query_df(df, query, session=None):
         axis='columns'
     )
     return result_df
+
+
+def query_df(df, query, session=None, column_types=None):
+    """ Perform simple query ('select' from one table, without subqueries and joins) on DataFrame.
+
+        Args:
+            df (pandas.DataFrame): data
+            query (mindsdb_sql.parser.ast.Select | str): select query
+            column_types (dict): optional, {column name: dtype} of columns of the dataframe
+
+        Returns:
+            pandas.DataFrame
+    """
+
+    query_ast, table_name, json_columns = _adapt_query(query, session)
+
+    df = encode_json_columns(df, json_columns)
+
+    query_str = _render_query(query_ast, query)
+
+    # workaround to prevent duckdb.TypeMismatchException
+    if len(df) > 0:
+        if table_name.lower() in ('models', 'predictors', 'models_versions'):
+            if 'TRAINING_OPTIONS' in df.columns:
+                df = df.astype({'TRAINING_OPTIONS': 'string'})
+        if table_name.lower() == 'ml_engines':
+            if 'CONNECTION_DATA' in df.columns:
+                df = df.astype({'CONNECTION_DATA': 'string'})
+
+    result_df, description = query_df_with_type_infer_fallback(query_str, {'df': df}, column_types)
+    return _prepare_result(result_df, description)
+
+
+def query_parquet(file_path, query, session=None):
+    """ Perform simple query ('select' from one table, without subqueries and joins) on parquet file.
+        Projection and filters are pushed down to the file scan: only required columns and
+        row groups are read from the file.
+
+        Args:
+            file_path (str): path to parquet file
+            query (mindsdb_sql.parser.ast.Select | str): select query
+
+        Returns:
+            pandas.DataFrame
+    """
+    query_ast, _table_name, _json_columns = _adapt_query(query, session)
+    query_str = _render_query(query_ast, query)
+
+    con = get_duckdb_connection()
+    file_path = str(file_path).replace("'", "''")
+    con.execute(f"create or replace temp view df as select * from read_parquet('{file_path}')")
+    try:
+        result_df = con.execute(query_str).fetchdf()
+        description = con.description
+    finally:
+        con.execute('drop view if exists df')
+
+    return _prepare_result(result_df, description)
@@ -453,7 +453,11 @@ class PostgresProxyHandler(socketserver.StreamRequestHandler):
                 break
             tof = type(message)
             if tof in self.message_map:
-                res = self.message_map[tof](message)
+                try:
+                    res = self.message_map[tof](message)
+                finally:
+                    # return connections to integrations to pool
+                    self.session.integration_controller.release_handlers()
                 if not res:
                     break
             else:
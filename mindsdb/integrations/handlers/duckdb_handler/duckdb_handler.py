@@ -5,6 +5,7 @@ import pandas as pd
 from duckdb import DuckDBPyConnection
 from mindsdb_sql import parse_sql
 from mindsdb_sql.parser.ast.base import ASTNode
+from mindsdb_sql.parser.ast import Identifier
 from mindsdb_sql.render.sqlalchemy_render import SqlalchemyRender
 
 from mindsdb.integrations.libs.base import DatabaseHandler
@@ -135,6 +136,46 @@ class DuckDBHandler(DatabaseHandler):
 
         return response
 
+    def bulk_insert(self, table_name: Identifier, df: pd.DataFrame) -> Response:
+        """Insert dataframe into table.
+
+        Args:
+            table_name (Identifier): The table to insert.
+            df (pd.DataFrame): The data, columns are names of table columns.
+
+        Returns:
+            Response: OK or ERROR response.
+        """
+        need_to_close = self.is_connected is False
+
+        def quote(name):
+            name = str(name).replace('"', '""')
+            return f'"{name}"'
+
+        table = '.'.join(quote(part) for part in table_name.parts)
+        columns = ', '.join(quote(column) for column in df.columns)
+
+        connection = self.connect()
+        cursor = connection.cursor()
+
+        try:
+            cursor.register('mindsdb_bulk_insert', df)
+            cursor.execute(f'INSERT INTO {table} ({columns}) SELECT * FROM mindsdb_bulk_insert')
+            cursor.unregister('mindsdb_bulk_insert')
+            connection.commit()
+            response = Response(RESPONSE_TYPE.OK)
+        except Exception as e:
+            logger.error(
+                f'Error inserting into {table} on {self.connection_data["database"]}!'
+            )
+            response = Response(RESPONSE_TYPE.ERROR, error_message=str(e))
+
+        cursor.close()
+        if need_to_close is True:
+            self.disconnect()
+
+        return response
+
     def query(self, query: ASTNode) -> Response:
         """Render and execute a SQL query.
 
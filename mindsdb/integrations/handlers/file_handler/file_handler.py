@@ -6,6 +6,7 @@ import tempfile
 import traceback
 from io import BytesIO, StringIO
 from pathlib import Path
+from typing import Iterator, Optional
 from urllib.parse import urlparse
 
 import magic
@@ -18,7 +19,7 @@ from mindsdb_sql.parser.ast.base import ASTNode
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain.document_loaders import TextLoader, PyPDFLoader
 
-from mindsdb.api.mysql.mysql_proxy.utilities.sql import query_df
+from mindsdb.api.mysql.mysql_proxy.utilities.sql import query_df, query_parquet
 from mindsdb.integrations.libs.base import DatabaseHandler
 from mindsdb.integrations.libs.response import RESPONSE_TYPE
 from mindsdb.integrations.libs.response import HandlerResponse as Response
@@ -27,9 +28,25 @@ from mindsdb.utilities import log
 
 logger = log.getLogger(__name__)
 
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:
+    pa = None
+
 DEFAULT_CHUNK_SIZE = 200
 DEFAULT_CHUNK_OVERLAP = 50
 
+# size of the beginning of the file which is used to detect format of the file
+SNIFF_SIZE = 1024 * 1024
+# size of the block of csv file which is parsed at once, types of columns are inferred from the first block
+CSV_BLOCK_SIZE = 16 * 1024 * 1024
+# values which are parsed as null: defaults of pandas.read_csv and values of clean_cell
+CSV_NULL_VALUES = [
+    "", " ", "  ", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan",
+    "1.#IND", "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null"
+]
+
 
 def clean_cell(val):
     if str(val) in ["", " ", "  ", "NaN", "nan", "NA"]:
@@ -92,6 +109,18 @@ class FileHandler(DatabaseHandler):
             return Response(RESPONSE_TYPE.OK)
         elif type(query) == Select:
             table_name = query.from_table.parts[-1]
+
+            # parquet contains the file parsed with default options
+            if (
+                self.custom_parser is None
+                and self.chunk_size == DEFAULT_CHUNK_SIZE
+                and self.chunk_overlap == DEFAULT_CHUNK_OVERLAP
+            ):
+                parquet_path = self.file_controller.get_file_parquet_path(table_name)
+                if parquet_path is not None:
+                    result_df = query_parquet(parquet_path, query)
+                    return Response(RESPONSE_TYPE.TABLE, data_frame=result_df)
+
             file_path = self.file_controller.get_file_path(table_name)
             df, _columns = self._handle_source(
                 file_path,
@@ -343,6 +372,106 @@ class FileHandler(DatabaseHandler):
         # No file type identified
         return data, None, dialect
 
+    @staticmethod
+    def _sniff_csv(file_path) -> Optional[tuple]:
+        """
+        Detect if the file is csv using only the beginning of the file
+        :param file_path: path to the file
+        :return: (dialect, encoding) or None if it is not csv or it can't be detected by the beginning of the file
+        """
+        suffix = Path(file_path).suffix.strip(".").lower()
+        if suffix in ("json", "xlsx", "xls", "parquet", "txt", "pdf"):
+            return None
+
+        with open(file_path, "rb") as fp:
+            prefix = fp.read(SNIFF_SIZE)
+
+        if prefix.startswith(b"PAR1"):
+            return None
+        if suffix != "csv" and FileHandler.is_it_xlsx(file_path):
+            return None
+
+        if prefix.startswith(codecs.BOM_UTF8):
+            encoding = "utf-8"
+            prefix = prefix[len(codecs.BOM_UTF8):]
+        else:
+            best_meta = from_bytes(
+                prefix[: 32 * 1024],
+                steps=32,
+                chunk_size=1024,
+                explain=False,
+            ).best()
+            encoding = "utf-8" if best_meta is None else best_meta.encoding
+
+        # the end of the prefix can be in the middle of a multibyte char
+        text = prefix.decode(encoding, errors="ignore")
+        if text.lstrip().startswith(("{", "[")):
+            # may be json
+            return None
+
+        data_str = StringIO(text)
+        if suffix != "csv":
+            try:
+                csv.Sniffer().sniff(data_str.readline())
+            except Exception:
+                return None
+            data_str.seek(0)
+
+        try:
+            dialect = FileHandler._get_csv_dialect(data_str)
+        except Exception:
+            return None
+        if dialect is None:
+            return None
+        return dialect, encoding
+
+    @staticmethod
+    def _read_csv_batches(file_path, dialect: csv.Dialect, encoding: str) -> Iterator:
+        """
+        Parse csv file by blocks, the whole file is not loaded to memory
+        :param file_path: path to the file
+        :param dialect: dialect of csv
+        :param encoding: encoding of the file
+        :return: iterator of pyarrow.RecordBatch
+        """
+        read_options = pa_csv.ReadOptions(encoding=encoding, block_size=CSV_BLOCK_SIZE)
+        parse_options = pa_csv.ParseOptions(
+            delimiter=dialect.delimiter,
+            quote_char=dialect.quotechar or '"',
+            double_quote=True,
+        )
+        convert_options = pa_csv.ConvertOptions(
+            null_values=CSV_NULL_VALUES,
+            strings_can_be_null=True,
+        )
+        reader = pa_csv.open_csv(
+            file_path, read_options=read_options, parse_options=parse_options, convert_options=convert_options
+        )
+
+        # dates are not parsed from csv by _handle_source: keep them as strings
+        date_columns = {
+            field.name: pa.string()
+            for field in reader.schema
+            if pa.types.is_temporal(field.type)
+        }
+        if len(date_columns) > 0:
+            reader.close()
+            convert_options.column_types = date_columns
+            reader = pa_csv.open_csv(
+                file_path, read_options=read_options, parse_options=parse_options, convert_options=convert_options
+            )
+
+        names = [name.strip() for name in reader.schema.names]
+        if "" in names or len(set(names)) != len(names):
+            reader.close()
+            raise ValueError("Columns of csv file have empty or duplicated names")
+
+        try:
+            for batch in reader:
+                yield pa.RecordBatch.from_arrays(batch.columns, names=names)
+        finally:
+            reader.close()
+
     @staticmethod
     def _get_file_path(path) -> str:
         try:
@@ -316,6 +316,44 @@ def test_get_data_io(
         assert file_dialect.delimiter == expected_delimiter
 
 
+@pytest.mark.parametrize(
+    "file_path,expected_delimiter",
+    [
+        (lazy_fixture("csv_file"), ","),
+        (lazy_fixture("xlsx_file"), None),
+        (lazy_fixture("json_file"), None),
+        (lazy_fixture("parquet_file"), None),
+        (lazy_fixture("pdf_file"), None),
+        (lazy_fixture("txt_file"), None),
+    ],
+)
+def test_sniff_csv(file_path, expected_delimiter):
+    result = FileHandler._sniff_csv(file_path)
+    if expected_delimiter is None:
+        assert result is None
+    else:
+        dialect, _encoding = result
+        assert dialect.delimiter == expected_delimiter
+
+
+def test_read_csv_batches(csv_file):
+    dialect, encoding = FileHandler._sniff_csv(csv_file)
+    batches = list(FileHandler._read_csv_batches(csv_file, dialect, encoding))
+    rows = [list(row.values()) for batch in batches for row in batch.to_pylist()]
+
+    assert batches[0].schema.names == test_file_content[0]
+    assert rows == test_file_content[1:]
+
+
+def test_stream_to_parquet(csv_file):
+    parquet_path = os.path.join(tempfile.mkdtemp(), "data.parquet")
+    ds_meta = FileController._stream_to_parquet(csv_file, parquet_path)
+
+    assert ds_meta == {"row_count": 3, "column_names": test_file_content[0]}
+    df, _columns = FileHandler._handle_source(csv_file)
+    assert pandas.read_parquet(parquet_path).equals(df)
+
+
 @pytest.mark.parametrize(
     "csv_string,delimiter",
     [
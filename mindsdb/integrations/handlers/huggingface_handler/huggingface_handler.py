@@ -1,3 +1,6 @@
+import os
+import hashlib
+from functools import lru_cache
 from typing import Dict, Optional
 
 import pandas as pd
@@ -10,9 +13,14 @@ from mindsdb.utilities import log
 
 logger = log.getLogger(__name__)
 
+DEFAULT_BATCH_SIZE = 8
+# items are sent to pipeline by chunks to isolate items which fail prediction
+PREDICT_CHUNK_SIZE = 1000
+
 
 class HuggingFaceHandler(BaseMLEngine):
     name = "huggingface"
+    row_wise_predict = True
 
     @staticmethod
     def create_validation(target, args=None, **kwargs):
@@ -85,7 +93,7 @@ class HuggingFaceHandler(BaseMLEngine):
                 input_keys.remove(key)
 
         # optional keys
-        for key in ["labels", "max_length", "truncation_policy"]:
+        for key in ["labels", "max_length", "truncation_policy", "batch_size"]:
             if key in input_keys:
                 input_keys.remove(key)
 
@@ -159,83 +167,187 @@ class HuggingFaceHandler(BaseMLEngine):
         ###### persist changes to handler folder
         self.engine_storage.folder_sync(model_name)
 
+    @staticmethod
+    @lru_cache(maxsize=3)
+    def get_pipeline(task, model_path, version):
+        # loaded pipeline is kept in the process between predictions
+        # version is changed when the files of the model are changed
+        return transformers.pipeline(task=task, model=model_path, tokenizer=model_path)
+
+    @staticmethod
+    def get_folder_version(path):
+        # fingerprint of the files in the folder: path, size and modification time
+        items = []
+        for root, _, files in os.walk(path):
+            for name in files:
+                stat = os.stat(os.path.join(root, name))
+                items.append((os.path.relpath(os.path.join(root, name), path), stat.st_size, stat.st_mtime_ns))
+        return hashlib.md5(str(sorted(items)).encode()).hexdigest()
+
+    def load_pipeline(self, args):
+        try:
+            # load from model storage (finetuned models will use this)
+            hf_model_storage_path = self.model_storage.folder_get(
+                args["model_name"]
+            )
+            return self.get_pipeline(
+                args["task_proper"],
+                hf_model_storage_path,
+                self.get_folder_version(hf_model_storage_path)
+            )
+        except OSError:
+            # load from engine storage (i.e. 'common' models)
+            hf_model_storage_path = self.engine_storage.folder_get(
+                args["model_name"]
+            )
+            return self.get_pipeline(
+                args["task_proper"],
+                hf_model_storage_path,
+                self.get_folder_version(hf_model_storage_path)
+            )
+
     # todo move infer tasks to a seperate file
-    def predict_text_classification(self, pipeline, item, args):
+    def predict_text_classification(self, pipeline, items, args):
         top_k = args.get("top_k", 1000)
 
-        result = pipeline(
-            [item], top_k=top_k, truncation=True, max_length=args["max_length"]
-        )[0]
-
-        final = {}
-        explain = {}
-        if type(result) == dict:
-            result = [result]
-        final[args["target"]] = args["labels_map"][result[0]["label"]]
-        for elem in result:
-            if args["labels_map"]:
-                explain[args["labels_map"][elem["label"]]] = elem["score"]
-            else:
-                explain[elem["label"]] = elem["score"]
-        final[f"{args['target']}_explain"] = explain
-        return final
-
-    def predict_zero_shot(self, pipeline, item, args):
+        results = pipeline(
+            items, top_k=top_k, truncation=True, max_length=args["max_length"],
+            batch_size=args["batch_size"]
+        )
+
+        finals = []
+        for result in results:
+            final = {}
+            explain = {}
+            if type(result) == dict:
+                result = [result]
+            final[args["target"]] = args["labels_map"][result[0]["label"]]
+            for elem in result:
+                if args["labels_map"]:
+                    explain[args["labels_map"][elem["label"]]] = elem["score"]
+                else:
+                    explain[elem["label"]] = elem["score"]
+            final[f"{args['target']}_explain"] = explain
+            finals.append(final)
+        return finals
+
+    def predict_zero_shot(self, pipeline, items, args):
         top_k = args.get("top_k", 1000)
 
-        result = pipeline(
-            [item],
+        results = pipeline(
+            items,
             candidate_labels=args["candidate_labels"],
             truncation=True,
             top_k=top_k,
             max_length=args["max_length"],
-        )[0]
-
-        final = {}
-        final[args["target"]] = result["labels"][0]
+            batch_size=args["batch_size"]
+        )
 
-        explain = dict(zip(result["labels"], result["scores"]))
-        final[f"{args['target']}_explain"] = explain
+        finals = []
+        for result in results:
+            final = {}
+            final[args["target"]] = result["labels"][0]
 
-        return final
+            explain = dict(zip(result["labels"], result["scores"]))
+            final[f"{args['target']}_explain"] = explain
+            finals.append(final)
 
-    def predict_translation(self, pipeline, item, args):
-        result = pipeline([item], max_length=args["max_length"])[0]
+        return finals
 
-        final = {}
-        final[args["target"]] = result["translation_text"]
+    def predict_translation(self, pipeline, items, args):
+        results = pipeline(items, max_length=args["max_length"], batch_size=args["batch_size"])
 
-        return final
+        return [
+            {args["target"]: result["translation_text"]}
+            for result in results
+        ]
 
-    def predict_summarization(self, pipeline, item, args):
-        result = pipeline(
-            [item],
+    def predict_summarization(self, pipeline, items, args):
+        results = pipeline(
+            items,
             min_length=args["min_output_length"],
             max_length=args["max_output_length"],
-        )[0]
+            batch_size=args["batch_size"]
+        )
 
-        final = {}
-        final[args["target"]] = result["summary_text"]
+        return [
+            {args["target"]: result["summary_text"]}
+            for result in results
+        ]
 
-        return final
+    def predict_text2text(self, pipeline, items, args):
+        results = pipeline(items, max_length=args["max_length"], batch_size=args["batch_size"])
 
-    def predict_text2text(self, pipeline, item, args):
-        result = pipeline([item], max_length=args["max_length"])[0]
+        return [
+            {args["target"]: result["generated_text"]}
+            for result in results
+        ]
 
-        final = {}
-        final[args["target"]] = result["generated_text"]
+    def predict_fill_mask(self, pipeline, items, args):
+        results = pipeline(items, batch_size=args["batch_size"])
+        if len(items) == 1:
+            # pipeline returns results of the only item without wrapping list
+            results = [results]
 
-        return final
+        finals = []
+        for result in results:
+            final = {}
+            final[args["target"]] = result[0]["sequence"]
+            explain = {elem["sequence"]: elem["score"] for elem in result}
+            final[f"{args['target']}_explain"] = explain
+            finals.append(final)
 
-    def predict_fill_mask(self, pipeline, item, args):
-        result = pipeline([item])[0]
+        return finals
 
-        final = {}
-        final[args["target"]] = result[0]["sequence"]
-        explain = {elem["sequence"]: elem["score"] for elem in result}
-        final[f"{args['target']}_explain"] = explain
+    @staticmethod
+    def error_result(e):
+        msg = str(e).strip()
+        if msg == "":
+            msg = e.__class__.__name__
+        return {"error": msg}
+
+    def truncate(self, pipeline, items, args):
+        """ check length of items in tokens and truncate them according to truncation_policy
+
+            Args:
+                items (list): item (str) or error (dict) for every input item
+
+            Returns:
+                list: item or error (dict) for every input item
+        """
+        max_tokens = pipeline.tokenizer.model_max_length
+        if max_tokens is None:
+            return items
+
+        truncation_policy = args.get("truncation_policy", "strict")
+
+        # tokenize whole column at once
+        idx = [i for i, item in enumerate(items) if isinstance(item, str)]
+        tokens_list = pipeline.tokenizer([items[i] for i in idx])["input_ids"]
+
+        results = list(items)
+        to_decode = {}
+        for i, tokens in zip(idx, tokens_list):
+            if len(tokens) <= max_tokens:
+                continue
+            if truncation_policy == "strict":
+                results[i] = {
+                    "error": f"Tokens count exceed model limit: {len(tokens)} > {max_tokens}"
+                }
+            elif truncation_policy == "left":
+                to_decode[i] = tokens[
+                    -max_tokens + 1 : -1
+                ]  # cut 2 empty tokens from left and right
+            else:
+                to_decode[i] = tokens[
+                    1 : max_tokens - 1
+                ]  # cut 2 empty tokens from left and right
 
-        return final
+        if len(to_decode) > 0:
+            decoded = pipeline.tokenizer.batch_decode(list(to_decode.values()))
+            for i, item in zip(to_decode.keys(), decoded):
+                results[i] = item
+        return results
 
     def predict(self, df, args=None):
 
@@ -247,8 +359,11 @@ class HuggingFaceHandler(BaseMLEngine):
             "fill-mask": self.predict_fill_mask,
         }
 
+        pred_args = {} if args is None else args.get("predict_params", {})
+
         ###### get stuff from model folder
         args = self.model_storage.json_get("args")
+        args["batch_size"] = pred_args.get("batch_size", args.get("batch_size", DEFAULT_BATCH_SIZE))
 
         task = args["task"]
 
@@ -257,67 +372,36 @@ class HuggingFaceHandler(BaseMLEngine):
 
         fnc = fnc_list[task]
 
-        try:
-            # load from model storage (finetuned models will use this)
-            hf_model_storage_path = self.model_storage.folder_get(
-                args["model_name"]
-            )
-            pipeline = transformers.pipeline(
-                task=args["task_proper"],
-                model=hf_model_storage_path,
-                tokenizer=hf_model_storage_path,
-            )
-        except OSError:
-            # load from engine storage (i.e. 'common' models)
-            hf_model_storage_path = self.engine_storage.folder_get(
-                args["model_name"]
-            )
-            pipeline = transformers.pipeline(
-                task=args["task_proper"],
-                model=hf_model_storage_path,
-                tokenizer=hf_model_storage_path,
-            )
+        pipeline = self.load_pipeline(args)
 
         input_column = args["input_column"]
         if input_column not in df.columns:
             raise RuntimeError(f'Column "{input_column}" not found in input data')
-        input_list = df[input_column]
+        # empty values are not predicted
+        input_list = [
+            {"error": "Input value is empty"} if pd.api.types.is_scalar(item) and pd.isna(item) else str(item)
+            for item in df[input_column]
+        ]
 
-        max_tokens = pipeline.tokenizer.model_max_length
+        results = self.truncate(pipeline, input_list, args)
 
-        results = []
-        for item in input_list:
-            if max_tokens is not None:
-                tokens = pipeline.tokenizer.encode(item)
-                if len(tokens) > max_tokens:
-                    truncation_policy = args.get("truncation_policy", "strict")
-                    if truncation_policy == "strict":
-                        results.append(
-                            {
-                                "error": f"Tokens count exceed model limit: {len(tokens)} > {max_tokens}"
-                            }
-                        )
-                        continue
-                    elif truncation_policy == "left":
-                        tokens = tokens[
-                            -max_tokens + 1 : -1
-                        ]  # cut 2 empty tokens from left and right
-                    else:
-                        tokens = tokens[
-                            1 : max_tokens - 1
-                        ]  # cut 2 empty tokens from left and right
-
-                    item = pipeline.tokenizer.decode(tokens)
-
-            item = str(item)
+        # predict items without errors by batches
+        idx = [i for i, item in enumerate(results) if isinstance(item, str)]
+        for start in range(0, len(idx), PREDICT_CHUNK_SIZE):
+            chunk_idx = idx[start:start + PREDICT_CHUNK_SIZE]
+            items = [results[i] for i in chunk_idx]
             try:
-                result = fnc(pipeline, item, args)
-            except Exception as e:
-                msg = str(e).strip()
-                if msg == "":
-                    msg = e.__class__.__name__
-                result = {"error": msg}
-            results.append(result)
+                predictions = fnc(pipeline, items, args)
+            except Exception:
+                # find items which fail prediction
+                predictions = []
+                for item in items:
+                    try:
+                        predictions.append(fnc(pipeline, [item], args)[0])
+                    except Exception as e:
+                        predictions.append(self.error_result(e))
+            for i, prediction in zip(chunk_idx, predictions):
+                results[i] = prediction
 
         pred_df = pd.DataFrame(results)
 
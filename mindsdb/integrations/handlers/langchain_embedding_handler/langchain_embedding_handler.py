@@ -1,5 +1,7 @@
 import copy
+import json
 import importlib
+from functools import lru_cache
 from typing import Dict, Union
 
 import pandas as pd
@@ -7,6 +9,7 @@ from langchain.embeddings.base import Embeddings
 from pandas import DataFrame
 
 from mindsdb.integrations.libs.base import BaseMLEngine
+from mindsdb.utilities.embedding_cache import get_embeddings, content_hash, model_namespace
 from mindsdb.utilities import log
 
 logger = log.getLogger(__name__)
@@ -81,6 +84,14 @@ def construct_model_from_args(args: Dict) -> Embeddings:
     return model
 
 
+@lru_cache(maxsize=10)
+def get_model(args_json: str) -> Embeddings:
+    """
+    Returns the model constructed from args, the model is reused between calls
+    """
+    return construct_model_from_args(json.loads(args_json))
+
+
 class LangchainEmbeddingHandler(BaseMLEngine):
     """
     Bridge class to connect langchain.embeddings module to mindsDB
@@ -88,6 +99,8 @@ class LangchainEmbeddingHandler(BaseMLEngine):
 
     DEFAULT_EMBEDDING_CLASS = "OpenAIEmbeddings"
 
+    row_wise_predict = True
+
     def __init__(self, model_storage, engine_storage, **kwargs) -> None:
         super().__init__(model_storage, engine_storage, **kwargs)
         self.generative = True
@@ -136,7 +149,7 @@ class LangchainEmbeddingHandler(BaseMLEngine):
     def predict(self, df: DataFrame, args) -> DataFrame:
         # reconstruct the model from the model storage
         user_args = self.model_storage.json_get("args")
-        model = construct_model_from_args(user_args)
+        model = get_model(json.dumps(user_args, sort_keys=True))
 
         # get the target from the model storage
         target = user_args["target"]
@@ -157,8 +170,13 @@ class LangchainEmbeddingHandler(BaseMLEngine):
             )
 
         # convert each row into a document
-        df_texts = df[input_columns].apply(self.row_to_document, axis=1)
-        embeddings = model.embed_documents(df_texts.tolist())
+        texts = df[input_columns].apply(self.row_to_document, axis=1).tolist()
+        # only texts which are not in the cache are embedded
+        embeddings = get_embeddings(
+            model_namespace(self.model_storage.predictor_id, user_args),
+            [content_hash(text) for text in texts],
+            lambda idx: model.embed_documents([texts[i] for i in idx])
+        )
 
         # create a new dataframe with the embeddings
         df_embeddings = df.copy().assign(**{target: embeddings})
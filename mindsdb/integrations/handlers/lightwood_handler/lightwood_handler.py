@@ -45,6 +45,8 @@ class NumpyJSONEncoder(json.JSONEncoder):
 
 class LightwoodHandler(BaseMLEngine):
     name = 'lightwood'
+    # time series models are not batched, see is_batchable
+    row_wise_predict = True
 
     @staticmethod
     def create_validation(target, args=None, **kwargs):
@@ -1,4 +1,6 @@
 from collections import OrderedDict
+from itertools import islice
+from typing import Iterator
 
 import pandas as pd
 import mysql.connector
@@ -8,6 +10,7 @@ from sqlalchemy import create_engine
 from mindsdb_sql import parse_sql
 from mindsdb_sql.render.sqlalchemy_render import SqlalchemyRender
 from mindsdb_sql.parser.ast.base import ASTNode
+from mindsdb_sql.parser.ast import Identifier
 
 from mindsdb.utilities import log
 from mindsdb.integrations.libs.base import DatabaseHandler
@@ -26,6 +29,8 @@ class MySQLHandler(DatabaseHandler):
     """
 
     name = 'mysql'
+    # count of rows sent by one query in bulk_insert
+    insert_batch_size = 10000
 
     def __init__(self, name, **kwargs):
         super().__init__(name)
@@ -219,6 +224,81 @@ class MySQLHandler(DatabaseHandler):
         query_str = renderer.get_string(query, with_failback=True)
         return self.native_query(query_str)
 
+    def query_stream(self, query: ASTNode, fetch_size: int = 10000) -> Iterator[pd.DataFrame]:
+        """
+        Retrieve the data from the SELECT statement by chunks using unbuffered cursor
+        :param query: SELECT query
+        :param fetch_size: count of rows in chunk
+        :return: iterator of dataframes, the first one is returned even if result is empty
+        """
+        renderer = SqlalchemyRender('mysql')
+        query_str = renderer.get_string(query, with_failback=True)
+        need_to_close = self.is_connected is False
+
+        connection = self.connect()
+        try:
+            with connection.cursor(buffered=False) as cur:
+                cur.execute(query_str)
+                columns = [x[0] for x in cur.description]
+                while True:
+                    result = cur.fetchmany(fetch_size)
+                    yield pd.DataFrame(result, columns=columns)
+                    if len(result) < fetch_size:
+                        break
+            connection.commit()
+        except BaseException:
+            # includes closing of not exhausted generator.
+            # unread rows are dropped with connection, it is faster than reading them
+            logger.debug(f'Error or interruption of running query: {query_str} on {self.database}')
+            self.disconnect()
+            raise
+        finally:
+            if need_to_close is True:
+                self.disconnect()
+
+    def bulk_insert(self, table_name: Identifier, df: pd.DataFrame) -> Response:
+        """
+        Insert dataframe into table in one transaction. Connector sends rows of executemany by multi-row INSERT,
+        rows are sent by batches to keep size of query small
+        :param table_name: table to insert
+        :param df: data to insert, columns are names of table columns
+        :return: OK or ERROR response
+        """
+        need_to_close = self.is_connected is False
+
+        def quote(name):
+            name = str(name).replace('`', '``')
+            return f'`{name}`'
+
+        table = '.'.join(quote(part) for part in table_name.parts)
+        columns = ', '.join(quote(column) for column in df.columns)
+        placeholders = ', '.join(['%s'] * len(df.columns))
+        query = f'INSERT INTO {table} ({columns}) VALUES ({placeholders})'
+
+        connection = self.connect()
+        with connection.cursor() as cur:
+            try:
+                rows = df.itertuples(index=False, name=None)
+                while True:
+                    batch = list(islice(rows, self.insert_batch_size))
+                    if len(batch) == 0:
+                        break
+                    cur.executemany(query, batch)
+                connection.commit()
+                response = Response(RESPONSE_TYPE.OK)
+            except Exception as e:
+                logger.error(f'Error inserting into {table} on {self.connection_data["database"]}!')
+                response = Response(
+                    RESPONSE_TYPE.ERROR,
+                    error_message=str(e)
+                )
+                connection.rollback()
+
+        if need_to_close is True:
+            self.disconnect()
+
+        return response
+
     def get_tables(self) -> Response:
         """
         Get a list with all of the tabels in MySQL selected database
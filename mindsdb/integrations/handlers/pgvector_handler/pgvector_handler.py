@@ -3,6 +3,7 @@ from typing import List, Union
 
 import pandas as pd
 import psycopg
+from psycopg.types.json import Jsonb
 from mindsdb_sql import ASTNode, Parameter, Identifier, Update, BinaryOperation
 from pgvector.psycopg import register_vector
 
@@ -28,6 +29,9 @@ class PgVectorHandler(VectorStoreHandler, PostgresHandler):
 
     name = "pgvector"
 
+    # embeddings are sent in binary format by pgvector adapter
+    vectors_as_arrays = True
+
     def __init__(self, name: str, **kwargs):
 
         super().__init__(name=name, **kwargs)
@@ -214,6 +218,31 @@ class PgVectorHandler(VectorStoreHandler, PostgresHandler):
             cur.executemany(insert_statement, transposed_data)
             self.connection.commit()
 
+    def upsert(self, table_name: str, data: pd.DataFrame):
+        """
+        Insert data into the pgvector table database, existing rows are updated by id.
+        """
+        columns = list(data.columns)
+        if "metadata" in columns:
+            data = data.copy()
+            data["metadata"] = [
+                Jsonb(value) if isinstance(value, dict) else value
+                for value in data["metadata"]
+            ]
+
+        values = ", ".join(["%s"] * len(columns))
+        update_columns = ", ".join(
+            f"{col} = EXCLUDED.{col}" for col in columns if col != "id"
+        )
+        upsert_statement = (
+            f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({values}) "
+            f"ON CONFLICT (id) DO UPDATE SET {update_columns}"
+        )
+
+        with self.connection.cursor() as cur:
+            cur.executemany(upsert_statement, list(data.itertuples(index=False, name=None)))
+            self.connection.commit()
+
     def update(
         self, table_name: str, data: pd.DataFrame, key_columns: List[str] = None
     ):
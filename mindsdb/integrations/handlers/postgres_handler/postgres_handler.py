@@ -1,6 +1,9 @@
 from collections import OrderedDict
+from typing import Iterator
+from uuid import uuid4
 
 import psycopg
+from psycopg import sql
 from psycopg.postgres import types
 from psycopg.pq import ExecStatus
 from pandas import DataFrame
@@ -8,6 +11,7 @@ from pandas import DataFrame
 from mindsdb_sql import parse_sql
 from mindsdb_sql.render.sqlalchemy_render import SqlalchemyRender
 from mindsdb_sql.parser.ast.base import ASTNode
+from mindsdb_sql.parser.ast import Identifier
 
 from mindsdb.integrations.libs.base import DatabaseHandler
 from mindsdb.integrations.libs.const import HANDLER_CONNECTION_ARG_TYPE as ARG_TYPE
@@ -101,7 +105,32 @@ class PostgresHandler(DatabaseHandler):
 
         return response
 
-    def _cast_dtypes(self, df: DataFrame, description: list) -> None:
+    @staticmethod
+    def _get_dtypes(description: list) -> dict:
+        """ Get pandas dtypes of columns basing on postgres types
+
+            Args:
+                description (list): psycopg cursor description
+
+            Returns:
+                dict: index of column -> dtype
+        """
+        types_map = {
+            'int2': 'int16',
+            'int4': 'int32',
+            'int8': 'int64',
+            'numeric': 'float64',
+            'float4': 'float32',
+            'float8': 'float64'
+        }
+        dtypes = {}
+        for column_index, column in enumerate(description):
+            pg_type = types.get(column.type_code)
+            if pg_type is not None and pg_type.name in types_map:
+                dtypes[column_index] = types_map[pg_type.name]
+        return dtypes
+
+    def _cast_dtypes(self, df: DataFrame, description: list, dtypes: dict = None) -> None:
         """ Cast df dtypes basing on postgres types
 
             Note:
@@ -113,23 +142,23 @@ class PostgresHandler(DatabaseHandler):
                  - timestamp -> datetime64[ns]
                  - timestamptz -> datetime64[ns, {tz}]
 
+                Integer column with NULLs is casted to float64, as pandas does it for column
+                which has numbers and NULLs
+
             Args:
                 df (DataFrame)
                 description (list): psycopg cursor description
+                dtypes (dict): result of _get_dtypes, if it is already known
         """
-        types_map = {
-            'int2': 'int16',
-            'int4': 'int32',
-            'int8': 'int64',
-            'numeric': 'float64',
-            'float4': 'float32',
-            'float8': 'float64'
-        }
+        if dtypes is None:
+            dtypes = self._get_dtypes(description)
         for column_index, column_name in enumerate(df.columns):
-            if str(df[column_name].dtype) == 'object':
-                pg_type = types.get(description[column_index].type_code)
-                if pg_type is not None and pg_type.name in types_map:
-                    df[column_name] = df[column_name].astype(types_map[pg_type.name])
+            dtype = dtypes.get(column_index)
+            if dtype is None or str(df[column_name].dtype) != 'object':
+                continue
+            if dtype.startswith('int') and df[column_name].isnull().any():
+                dtype = 'float64'
+            df[column_name] = df[column_name].astype(dtype)
 
     @profiler.profile()
     def native_query(self, query: str) -> Response:
@@ -180,6 +209,75 @@ class PostgresHandler(DatabaseHandler):
         query_str = self.renderer.get_string(query, with_failback=True)
         return self.native_query(query_str)
 
+    def query_stream(self, query: ASTNode, fetch_size: int = 10000) -> Iterator[DataFrame]:
+        """
+        Retrieve the data from the SELECT statement by chunks using server-side cursor
+        :param query: SELECT query
+        :param fetch_size: count of rows in chunk
+        :return: iterator of dataframes, the first one is returned even if result is empty
+        """
+        query_str = self.renderer.get_string(query, with_failback=True)
+        need_to_close = self.is_connected is False
+
+        connection = self.connect()
+        try:
+            with connection.cursor(name=f'mindsdb_{uuid4().hex}') as cur:
+                cur.execute(query_str)
+                columns = [x.name for x in cur.description]
+                dtypes = self._get_dtypes(cur.description)
+                while True:
+                    result = cur.fetchmany(fetch_size)
+                    df = DataFrame(result, columns=columns)
+                    # the same rules as for the whole result: dtypes of chunks are joined by concat
+                    self._cast_dtypes(df, cur.description, dtypes)
+                    yield df
+                    if len(result) < fetch_size:
+                        break
+            connection.commit()
+        except BaseException:
+            # includes closing of not exhausted generator
+            logger.debug(f'Error or interruption of running query: {query_str} on {self.database}')
+            connection.rollback()
+            raise
+        finally:
+            if need_to_close is True:
+                self.disconnect()
+
+    def bulk_insert(self, table_name: Identifier, df: DataFrame) -> Response:
+        """
+        Insert dataframe into table using COPY
+        :param table_name: table to insert
+        :param df: data to insert, columns are names of table columns
+        :return: OK or ERROR response
+        """
+        need_to_close = self.is_connected is False
+
+        connection = self.connect()
+        copy_query = sql.SQL('COPY {} ({}) FROM STDIN').format(
+            sql.Identifier(*table_name.parts),
+            sql.SQL(', ').join(sql.Identifier(str(column)) for column in df.columns)
+        )
+        with connection.cursor() as cur:
+            try:
+                with cur.copy(copy_query) as copy:
+                    for row in df.itertuples(index=False, name=None):
+                        copy.write_row(row)
+                connection.commit()
+                response = Response(RESPONSE_TYPE.OK)
+            except Exception as e:
+                logger.error(f'Error inserting into {table_name} on {self.database}!')
+                response = Response(
+                    RESPONSE_TYPE.ERROR,
+                    error_code=0,
+                    error_message=str(e)
+                )
+                connection.rollback()
+
+        if need_to_close is True:
+            self.disconnect()
+
+        return response
+
     def get_tables(self) -> Response:
         """
         List all tables in PostgreSQL without the system tables information_schema and pg_catalog
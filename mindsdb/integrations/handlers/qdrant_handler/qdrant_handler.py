@@ -171,6 +171,10 @@ class QdrantHandler(VectorStoreHandler):
 
         return Response(resp_type=RESPONSE_TYPE.OK)
 
+    def upsert(self, table_name: str, data: pd.DataFrame):
+        # points of qdrant are upserted by id
+        return self.insert(table_name, data)
+
     def create_table(self, table_name: str, if_not_exists=True) -> HandlerResponse:
         """Create a collection with the given name in the Qdrant database.
 
@@ -9,6 +9,7 @@ from mindsdb_sql.render.sqlalchemy_render import SqlalchemyRender
 from mindsdb.integrations.libs.base import DatabaseHandler
 
 from mindsdb_sql.parser.ast.base import ASTNode
+from mindsdb_sql.parser.ast import Identifier
 
 from mindsdb.utilities import log
 from mindsdb.integrations.libs.response import (
@@ -140,6 +141,49 @@ class SQLiteHandler(DatabaseHandler):
 
         return response
 
+    def bulk_insert(self, table_name: Identifier, df: pd.DataFrame) -> StatusResponse:
+        """
+        Insert dataframe into table using executemany
+        Args:
+            table_name (Identifier): table to insert
+            df (pd.DataFrame): data to insert, columns are names of table columns
+        Returns:
+            HandlerResponse
+        """
+
+        need_to_close = self.is_connected is False
+
+        def quote(name):
+            name = str(name).replace('"', '""')
+            return f'"{name}"'
+
+        table = '.'.join(quote(part) for part in table_name.parts)
+        columns = ', '.join(quote(column) for column in df.columns)
+        placeholders = ', '.join(['?'] * len(df.columns))
+
+        connection = self.connect()
+        cursor = connection.cursor()
+
+        try:
+            cursor.executemany(
+                f'INSERT INTO {table} ({columns}) VALUES ({placeholders})',
+                df.itertuples(index=False, name=None)
+            )
+            connection.commit()
+            response = Response(RESPONSE_TYPE.OK)
+        except Exception as e:
+            logger.error(f'Error inserting into {table} on {self.connection_data["db_file"]}!')
+            response = Response(
+                RESPONSE_TYPE.ERROR,
+                error_message=str(e)
+            )
+
+        cursor.close()
+        if need_to_close is True:
+            self.disconnect()
+
+        return response
+
     def query(self, query: ASTNode) -> StatusResponse:
         """
         Receive query as AST (abstract syntax tree) and act upon it somehow.
@@ -0,0 +1,9 @@
+__title__ = "MindsDB Vector Index handler"
+__package_name__ = "mindsdb_vector_index_handler"
+__version__ = "0.0.1"
+__description__ = "Vector store built in MindsDB"
+__author__ = "MindsDB Inc"
+__github__ = "https://github.com/mindsdb/mindsdb"
+__pypi__ = "https://pypi.org/project/mindsdb/"
+__license__ = "MIT"
+__copyright__ = "Copyright 2023 - mindsdb"
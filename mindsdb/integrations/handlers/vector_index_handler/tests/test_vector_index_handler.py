@@ -0,0 +1,219 @@
+import os
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+from mindsdb.integrations.handlers.vector_index_handler import vector_index
+from mindsdb.integrations.handlers.vector_index_handler.vector_index import VectorIndex
+from mindsdb.integrations.handlers.vector_index_handler.vector_index_handler import VectorIndexHandler
+from mindsdb.integrations.libs import vectordatabase_handler
+from mindsdb.integrations.libs.vectordatabase_handler import FilterCondition, FilterOperator, TableField
+
+
+class LocalStorage:
+    # storage of integration without sync with permanent storage
+    def __init__(self, root):
+        self.root = Path(root)
+        self.synced = 0
+        self.on_sync = None
+
+    def folder_get(self, name):
+        path = self.root / name
+        path.mkdir(parents=True, exist_ok=True)
+        return str(path)
+
+    def folder_sync(self, name):
+        self.synced += 1
+        if self.on_sync is not None:
+            self.on_sync()
+
+
+def exact_search(vectors, query, limit):
+    similarity = vectors @ query / np.linalg.norm(vectors, axis=1) / np.linalg.norm(query)
+    return list(np.argsort(-similarity)[:limit])
+
+
+class TestVectorIndex:
+
+    def setup_method(self):
+        self.path = Path(tempfile.mkdtemp(prefix='vector_index_'))
+
+    def teardown_method(self):
+        shutil.rmtree(self.path, ignore_errors=True)
+
+    def test_upsert_search_delete(self):
+        index = VectorIndex(self.path)
+        index.upsert(['a', 'b', 'c'], [[1, 0], [0, 1], [1, 1]], ['A', 'B', 'C'], [{'n': 1}, {'n': 2}, None])
+
+        found = index.search(np.array([[1, 0.1], [0, 1]]), 2)
+        assert [row['id'] for row in found[0]] == ['a', 'c']
+        assert [row['id'] for row in found[1]] == ['b', 'c']
+        assert found[1][0]['distance'] < 1e-6
+
+        # update vector, content is kept
+        index.upsert(['b'], [[1, 0.2]], metadatas=[{'n': 5}])
+        found = index.search(np.array([[1, 0.05]]), 3)[0]
+        assert [row['id'] for row in found] == ['a', 'b', 'c']
+        assert found[1]['content'] == 'B' and found[1]['metadata'] == {'n': 5}
+
+        # filter by metadata
+        conditions = [FilterCondition('metadata.n', FilterOperator.GREATER_THAN, 1)]
+        assert [row['id'] for row in index.search(np.array([[1, 0]]), 3, conditions)[0]] == ['b']
+
+        index.delete([FilterCondition('id', FilterOperator.IN, ['a', 'c'])])
+        assert [row['id'] for row in index.select()] == ['b']
+
+        # state is read by other instance
+        other = VectorIndex(self.path)
+        rows = other.select()
+        assert rows[0]['embeddings'] == [1, np.float32(0.2)]
+
+    def test_ivf_and_compaction(self):
+        rng = np.random.default_rng(1)
+        vectors = rng.normal(size=(3000, 16)).astype(np.float32)
+        ids = [str(i) for i in range(len(vectors))]
+
+        with patch.object(vector_index, 'BRUTE_FORCE_LIMIT', 500):
+            index = VectorIndex(self.path)
+            for start in range(0, len(vectors), 1000):
+                index.upsert(ids[start: start + 1000], vectors[start: start + 1000])
+            assert index._centroids is not None
+
+            # every vector finds itself
+            found = index.search(vectors[:20], 1, nprobe=4)
+            assert [rows[0]['id'] for rows in found] == ids[:20]
+
+            # recall of top-10 with probe of all clusters is exact
+            query = rng.normal(size=16).astype(np.float32)
+            found = index.search(query[None], 10, nprobe=len(index._centroids))[0]
+            assert [int(row['id']) for row in found] == exact_search(vectors, query, 10)
+
+            # batch of queries gets the same results as queries one by one
+            queries = rng.normal(size=(5, 16)).astype(np.float32)
+            found = index.search(queries, 10, nprobe=2)
+            for query, rows in zip(queries, found):
+                expected = index.search(query[None], 10, nprobe=2)[0]
+                assert [row['id'] for row in rows] == [row['id'] for row in expected]
+                assert np.allclose([row['distance'] for row in rows], [row['distance'] for row in expected], atol=1e-5)
+
+            # updates make unused positions, then the matrix is compacted
+            for _ in range(2):
+                index.upsert(ids[:2000], vectors[:2000])
+            assert index._count < 3 * len(vectors)
+            assert len(index.select()) == len(vectors)
+            found = index.search(vectors[:20], 1, nprobe=4)
+            assert [rows[0]['id'] for rows in found] == ids[:20]
+
+            # only files of the last generation are kept
+            assert len(list(self.path.glob('vectors.*.f32'))) == 1
+
+
+class TestVectorIndexHandler:
+
+    def setup_method(self):
+        self.root = tempfile.mkdtemp(prefix='vector_index_handler_')
+        self.storage = LocalStorage(self.root)
+        self.handler = VectorIndexHandler('test', handler_storage=self.storage, connection_data={})
+
+    def teardown_method(self):
+        self.handler.drop_table('items')
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_handler(self):
+        handler = self.handler
+        handler.create_table('items')
+        assert list(handler.get_tables().data_frame['table_name']) == ['items']
+
+        df = pd.DataFrame({
+            TableField.ID.value: ['1', '2', '3'],
+            TableField.CONTENT.value: ['x', 'y', 'z'],
+            TableField.EMBEDDINGS.value: ['[1, 0]', '[0, 1]', '[1, 1]'],
+            TableField.METADATA.value: [{'k': 'a'}, {'k': 'b'}, {'k': 'a'}],
+        })
+        synced = self.storage.synced
+        with patch.object(vectordatabase_handler, 'DEFAULT_UPSERT_BATCH_SIZE', 1):
+            handler.do_upsert('items', df)
+        # storage is synced once for all batches
+        assert self.storage.synced == synced + 1
+
+        df = handler.select(
+            'items',
+            columns=[TableField.ID.value, TableField.CONTENT.value],
+            conditions=[
+                FilterCondition('search_vector', FilterOperator.EQUAL, [0.1, 1]),
+                FilterCondition('metadata.k', FilterOperator.EQUAL, 'a'),
+            ],
+            limit=1
+        )
+        assert list(df.columns) == ['id', 'content', 'distance']
+        assert list(df['id']) == ['3']
+
+        found = handler.search('items', np.array([[1, 0], [0, 1]]), 1)
+        assert [df['id'][0] for df in found] == ['1', '2']
+
+        handler.delete('items', [FilterCondition('id', FilterOperator.EQUAL, '1')])
+        assert list(handler.select('items')['id']) == ['2', '3']
+
+        handler.delete('items')
+        assert handler.select('items').empty
+
+    def test_replaced_files(self):
+        handler = self.handler
+        handler.create_table('items')
+        handler.upsert('items', pd.DataFrame({
+            TableField.ID.value: ['1'],
+            TableField.EMBEDDINGS.value: [[1, 0]],
+        }))
+        assert list(handler.select('items')['id']) == ['1']
+
+        # other process changes the table, then folder_get replaces files by its version
+        table_path = Path(self.root) / 'vector_index' / 'items'
+        other_path = Path(self.root) / 'other'
+        shutil.copytree(table_path, other_path)
+        other = VectorIndex(other_path)
+        other.upsert(['2'], [[0, 1]])
+        other.close()
+        for path in other_path.iterdir():
+            shutil.copy(path, path.with_name(f'.{path.name}'))
+            os.replace(path.with_name(f'.{path.name}'), table_path / path.name)
+
+        handler = VectorIndexHandler('test', handler_storage=self.storage, connection_data={})
+        assert list(handler.select('items')['id']) == ['1', '2']
+        found = handler.search('items', np.array([[0, 1]]), 1)
+        assert list(found[0]['id']) == ['2']
+
+    def test_sync_locks_index(self):
+        handler = self.handler
+        handler.create_table('items')
+
+        def upsert():
+            handler.upsert('items', pd.DataFrame({
+                TableField.ID.value: ['2'],
+                TableField.EMBEDDINGS.value: [[0, 1]],
+            }))
+
+        blocked = []
+
+        def on_sync():
+            # files of the index are not changed during upload
+            thread = threading.Thread(target=upsert)
+            thread.start()
+            thread.join(0.3)
+            blocked.append(thread.is_alive())
+            self.storage.on_sync = None
+            self._thread = thread
+
+        self.storage.on_sync = on_sync
+        handler.do_upsert('items', pd.DataFrame({
+            TableField.ID.value: ['1'],
+            TableField.EMBEDDINGS.value: [[1, 0]],
+        }))
+        self._thread.join()
+
+        assert blocked == [True]
+        assert list(handler.select('items')['id']) == ['1', '2']
@@ -0,0 +1,524 @@
+"""
+Index of vectors of one table. Files of the table folder:
+- rows.db - sqlite database with id, content and metadata of rows and position of the row's vector
+- vectors.{gen}.f32 - float32 matrix of vectors, one row per position, is read via memory map
+- norms.{gen}.f32 - norms of vectors
+- lists.{gen}.i32 - number of cluster of every vector
+- centroids.{gen}.f32 - centroids of clusters
+
+Vectors are only appended: updated and deleted rows leave unused positions in the matrix,
+the matrix is compacted when unused positions become the majority. Files which are rewritten
+get the next generation number, so a failed write doesn't damage the committed state.
+
+Search is exact for small tables. When the table becomes bigger than BRUTE_FORCE_LIMIT,
+vectors are clustered with k-means (IVF-flat index) and only 'nprobe' closest clusters are scanned.
+Distance is cosine distance.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from mindsdb.integrations.libs.vectordatabase_handler import (
+    FilterCondition,
+    FilterOperator,
+    TableField,
+)
+from mindsdb.utilities.json_encoder import CustomJSONEncoder
+
+# exact search is used for tables (or filtered rows) smaller than this
+BRUTE_FORCE_LIMIT = 20000
+# max size of block of vectors which is scanned at once
+BLOCK_BYTES = 64 * 1024 * 1024
+DEFAULT_NPROBE = 16
+KMEANS_ITERATIONS = 10
+# number of sampled vectors per cluster to train k-means
+KMEANS_SAMPLES_PER_LIST = 32
+# sqlite limit of parameters in query
+SQL_PARAMS_LIMIT = 900
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return matrix / np.maximum(norms, np.finfo(np.float32).tiny)
+
+
+def _chunks(items, size=SQL_PARAMS_LIMIT):
+    for start in range(0, len(items), size):
+        yield items[start: start + size]
+
+
+class VectorIndex:
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.RLock()
+
+        self._con = sqlite3.connect(str(self.path / 'rows.db'), check_same_thread=False, isolation_level=None)
+        self._file_id = self._get_file_id()
+        self._con.execute(
+            'CREATE TABLE IF NOT EXISTS rows (id TEXT PRIMARY KEY, pos INTEGER NOT NULL, content TEXT, metadata TEXT)'
+        )
+        self._con.execute('CREATE INDEX IF NOT EXISTS rows_pos ON rows (pos)')
+        self._con.execute('CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value INTEGER)')
+
+        self._version = None
+        self._state = {}
+
+    @property
+    def lock(self) -> threading.RLock:
+        """ files of index are not changed while the lock is held """
+        return self._lock
+
+    def close(self):
+        with self._lock:
+            self._con.close()
+
+    def _get_file_id(self) -> Optional[tuple]:
+        try:
+            stat = os.stat(self.path / 'rows.db')
+        except FileNotFoundError:
+            return None
+        return stat.st_dev, stat.st_ino
+
+    def is_replaced(self) -> bool:
+        """ files of the index were replaced (by download from storage): opened connection and memory maps
+            read the previous version, the index has to be opened again
+        """
+        return self._get_file_id() != self._file_id
+
+    # --- state ---
+
+    def _file(self, name: str, gen: int) -> Path:
+        base, ext = name.split('.')
+        return self.path / f'{base}.{gen}.{ext}'
+
+    def _open(self, name: str, gen: int, dtype, shape: tuple) -> np.ndarray:
+        if shape[0] == 0:
+            return np.zeros(shape, dtype=dtype)
+        return np.memmap(self._file(name, gen), dtype=dtype, mode='r', shape=shape)
+
+    def _refresh(self):
+        # reload state if it was changed by another instance
+        state = dict(self._con.execute('SELECT key, value FROM state').fetchall())
+        if self._version is not None and state.get('version', 0) == self._version:
+            return
+        self._state = state
+
+        count = self._count
+        self._alive = np.zeros(count, dtype=bool)
+        positions = np.fromiter((row[0] for row in self._con.execute('SELECT pos FROM rows')), dtype=np.int64)
+        self._alive[positions] = True
+        self._open_data()
+        self._open_index()
+        self._version = state.get('version', 0)
+
+    def _open_data(self):
+        dim = self._state.get('dim') or 0
+        gen = self._state.get('data_gen', 0)
+        self._vectors = self._open('vectors.f32', gen, np.float32, (self._count, dim))
+        self._norms = self._open('norms.f32', gen, np.float32, (self._count,))
+
+    def _open_index(self):
+        nlist = self._state.get('nlist', 0)
+        self._lists = None
+        if nlist == 0:
+            self._centroids = None
+            self._assign = None
+            return
+        gen = self._state['index_gen']
+        self._centroids = np.array(self._open('centroids.f32', gen, np.float32, (nlist, self._state['dim'])))
+        self._assign = self._open('lists.i32', gen, np.int32, (self._count,))
+
+    @property
+    def _count(self) -> int:
+        return self._state.get('count', 0)
+
+    def _set_state(self, **values):
+        for key, value in values.items():
+            self._con.execute(
+                'INSERT INTO state (key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value',
+                (key, int(value))
+            )
+            self._state[key] = int(value)
+
+    def _write(self, fnc, *args, **kwargs):
+        with self._lock:
+            self._con.execute('BEGIN IMMEDIATE')
+            try:
+                self._refresh()
+                result = fnc(*args, **kwargs)
+                self._maintain()
+                self._set_state(version=self._state.get('version', 0) + 1)
+                self._con.execute('COMMIT')
+            except Exception:
+                self._con.execute('ROLLBACK')
+                # in-memory state could be changed
+                self._version = None
+                raise
+            self._version = self._state['version']
+            self._remove_old_files()
+            return result
+
+    def _remove_old_files(self):
+        # files of previous generations are not used after commit
+        gens = {
+            'vectors': self._state.get('data_gen', 0),
+            'norms': self._state.get('data_gen', 0),
+            'lists': self._state.get('index_gen', 0),
+            'centroids': self._state.get('index_gen', 0),
+        }
+        for path in self.path.iterdir():
+            parts = path.name.split('.')
+            if len(parts) != 3 or parts[0] not in gens or not parts[1].isdigit():
+                continue
+            if int(parts[1]) < gens[parts[0]]:
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+
+    def _append(self, name: str, gen: int, data: np.ndarray, row_size: int):
+        with open(self._file(name, gen), 'ab') as f:
+            # remove rows of interrupted write
+            f.truncate(self._count * row_size)
+            f.write(np.ascontiguousarray(data).tobytes())
+
+    # --- write ---
+
+    def upsert(self, ids: List[str], vectors: np.ndarray, contents: list = None, metadatas: list = None):
+        """ insert rows or update them by id
+
+            Args:
+                ids (List[str]): ids of rows
+                vectors (np.ndarray): matrix of vectors
+                contents (list): contents of rows, content of existing rows is kept if None
+                metadatas (list): metadata (dict) of rows, metadata of existing rows is kept if None
+        """
+        if len(ids) == 0:
+            return
+        self._write(self._upsert, ids, np.asarray(vectors, dtype=np.float32), contents, metadatas)
+
+    def _upsert(self, ids, vectors, contents, metadatas):
+        if vectors.ndim != 2 or vectors.shape[0] != len(ids):
+            raise ValueError(f'Unexpected shape of vectors: {vectors.shape}')
+        dim = self._state.get('dim')
+        if dim is None:
+            self._set_state(dim=vectors.shape[1])
+            self._open_data()
+        elif dim != vectors.shape[1]:
+            raise ValueError(f'Size of vectors is {vectors.shape[1]}, expected: {dim}')
+
+        # positions of updated rows are released
+        for chunk in _chunks(ids):
+            placeholders = ', '.join(['?'] * len(chunk))
+            for (pos,) in self._con.execute(f'SELECT pos FROM rows WHERE id IN ({placeholders})', chunk):
+                self._alive[pos] = False
+
+        count = self._count
+        positions = np.arange(count, count + len(ids))
+        # the last row is stored for repeated ids
+        _, last = np.unique(np.array(ids[::-1], dtype=object), return_index=True)
+        keep = np.zeros(len(ids), dtype=bool)
+        keep[len(ids) - 1 - last] = True
+
+        columns = ['id', 'pos']
+        values = [ids, positions.tolist()]
+        if contents is not None:
+            columns.append('content')
+            values.append(contents)
+        if metadatas is not None:
+            columns.append('metadata')
+            values.append([
+                None if metadata is None else json.dumps(metadata, cls=CustomJSONEncoder)
+                for metadata in metadatas
+            ])
+        update = ', '.join(f'{col} = excluded.{col}' for col in columns[1:])
+        self._con.executemany(
+            f"INSERT INTO rows ({', '.join(columns)}) VALUES ({', '.join(['?'] * len(columns))}) "
+            f"ON CONFLICT(id) DO UPDATE SET {update}",
+            [row for row, is_kept in zip(zip(*values), keep) if is_kept]
+        )
+
+        data_gen = self._state.get('data_gen', 0)
+        self._append('vectors.f32', data_gen, vectors, vectors.shape[1] * 4)
+        self._append('norms.f32', data_gen, np.linalg.norm(vectors, axis=1).astype(np.float32), 4)
+        if self._centroids is not None:
+            assign = self._nearest_centroids(vectors)
+            self._append('lists.i32', self._state['index_gen'], assign, 4)
+            if self._lists is not None:
+                for cluster, cluster_positions in zip(*self._group(assign, positions)):
+                    self._lists[cluster] = np.concatenate([self._lists[cluster], cluster_positions[keep[cluster_positions - count]]])
+
+        self._set_state(count=count + len(ids))
+        self._alive = np.concatenate([self._alive, keep])
+        self._open_data()
+        if self._centroids is not None:
+            self._assign = self._open('lists.i32', self._state['index_gen'], np.int32, (self._count,))
+
+    def delete(self, conditions: List[FilterCondition] = None):
+        """ delete rows, all rows are deleted if conditions are not set
+        """
+        self._write(self._delete, conditions)
+
+    def _delete(self, conditions):
+        where, params = self._where(conditions)
+        for (pos,) in self._con.execute(f'SELECT pos FROM rows {where}', params):
+            self._alive[pos] = False
+        self._con.execute(f'DELETE FROM rows {where}', params)
+
+    def _maintain(self):
+        alive_count = int(self._alive.sum())
+        if self._count > max(BRUTE_FORCE_LIMIT, 2 * alive_count):
+            self._compact()
+        if alive_count > BRUTE_FORCE_LIMIT and alive_count >= 2 * self._state.get('trained_count', 0):
+            self._train()
+
+    def _compact(self):
+        # rewrite vectors of existing rows to a new generation of files
+        alive_pos = np.flatnonzero(self._alive)
+        data_gen = self._state.get('data_gen', 0) + 1
+        dim = self._state['dim']
+        block = max(1, BLOCK_BYTES // (dim * 4))
+        with open(self._file('vectors.f32', data_gen), 'wb') as f:
+            for start in range(0, len(alive_pos), block):
+                f.write(np.ascontiguousarray(self._vectors[alive_pos[start: start + block]]).tobytes())
+        self._norms[alive_pos].tofile(str(self._file('norms.f32', data_gen)))
+
+        self._con.execute('CREATE TEMP TABLE IF NOT EXISTS pos_map (old INTEGER PRIMARY KEY, new INTEGER)')
+        self._con.execute('DELETE FROM pos_map')
+        self._con.executemany('INSERT INTO pos_map (old, new) VALUES (?, ?)', zip(alive_pos.tolist(), range(len(alive_pos))))
+        self._con.execute('UPDATE rows SET pos = (SELECT new FROM pos_map WHERE old = rows.pos)')
+
+        if self._centroids is not None:
+            index_gen = self._state['index_gen'] + 1
+            self._assign[alive_pos].tofile(str(self._file('lists.i32', index_gen)))
+            self._centroids.tofile(str(self._file('centroids.f32', index_gen)))
+            self._set_state(index_gen=index_gen)
+
+        self._set_state(count=len(alive_pos), data_gen=data_gen)
+        self._alive = np.ones(len(alive_pos), dtype=bool)
+        self._open_data()
+        self._open_index()
+
+    def _train(self):
+        # spherical k-means on a sample of vectors
+        alive_pos = np.flatnonzero(self._alive)
+        nlist = max(1, int(np.sqrt(len(alive_pos))))
+        rng = np.random.default_rng(0)
+        sample = np.sort(rng.choice(alive_pos, min(len(alive_pos), nlist * KMEANS_SAMPLES_PER_LIST), replace=False))
+        data = _normalize(np.asarray(self._vectors[sample]))
+
+        centroids = data[rng.choice(len(data), nlist, replace=False)]
+        for _ in range(KMEANS_ITERATIONS):
+            assign = self._nearest_centroids(data, centroids)
+            clusters, members = self._group(assign, np.arange(len(data)))
+            for cluster, cluster_members in zip(clusters, members):
+                centroids[cluster] = data[cluster_members].sum(axis=0)
+            empty = np.setdiff1d(np.arange(nlist), clusters)
+            centroids[empty] = data[rng.choice(len(data), len(empty), replace=False)]
+            centroids = _normalize(centroids)
+
+        index_gen = self._state.get('index_gen', 0) + 1
+        dim = self._state['dim']
+        block = max(1, BLOCK_BYTES // (dim * 4))
+        with open(self._file('lists.i32', index_gen), 'wb') as f:
+            for start in range(0, self._count, block):
+                f.write(self._nearest_centroids(self._vectors[start: start + block], centroids).tobytes())
+        centroids.astype(np.float32).tofile(str(self._file('centroids.f32', index_gen)))
+
+        self._set_state(nlist=nlist, index_gen=index_gen, trained_count=len(alive_pos))
+        self._open_index()
+
+    def _nearest_centroids(self, vectors: np.ndarray, centroids: np.ndarray = None) -> np.ndarray:
+        if centroids is None:
+            centroids = self._centroids
+        if len(vectors) == 0:
+            return np.zeros(0, dtype=np.int32)
+        return np.argmax(np.asarray(vectors) @ centroids.T, axis=1).astype(np.int32)
+
+    @staticmethod
+    def _group(assign: np.ndarray, positions: np.ndarray) -> Tuple[np.ndarray, list]:
+        # split positions by clusters
+        order = np.argsort(assign, kind='stable')
+        clusters, starts = np.unique(assign[order], return_index=True)
+        return clusters, np.split(positions[order], starts[1:])
+
+    # --- read ---
+
+    def _where(self, conditions: Optional[List[FilterCondition]]) -> Tuple[str, list]:
+        clauses, params = [], []
+        for condition in conditions or []:
+            column = condition.column
+            if column in (TableField.EMBEDDINGS.value, TableField.SEARCH_VECTOR.value):
+                continue
+            if column in (TableField.ID.value, TableField.CONTENT.value):
+                expr = column
+            elif column.startswith(TableField.METADATA.value + '.'):
+                key = column[len(TableField.METADATA.value) + 1:]
+                expr = 'json_extract(metadata, ?)'
+                params.append(f'$."{key}"')
+            else:
+                raise ValueError(f'Unsupported column in condition: {column}')
+
+            op = condition.op
+            value = condition.value
+            if op in (FilterOperator.IS_NULL, FilterOperator.IS_NOT_NULL):
+                clauses.append(f'{expr} {op.value}')
+            elif op in (FilterOperator.IN, FilterOperator.NOT_IN):
+                if not isinstance(value, (list, tuple)):
+                    value = [value]
+                clauses.append(f"{expr} {op.value} ({', '.join(['?'] * len(value))})")
+                params.extend(value)
+            elif op in (FilterOperator.BETWEEN, FilterOperator.NOT_BETWEEN):
+                clauses.append(f'{expr} {op.value} ? AND ?')
+                params.extend(value)
+            else:
+                clauses.append(f'{expr} {op.value} ?')
+                params.append(value)
+
+        if len(clauses) == 0:
+            return '', []
+        return 'WHERE ' + ' AND '.join(clauses), params
+
+    @staticmethod
+    def _to_record(row, vectors) -> dict:
+        id, pos, content, metadata = row
+        return {
+            TableField.ID.value: id,
+            TableField.CONTENT.value: content,
+            TableField.METADATA.value: None if metadata is None else json.loads(metadata),
+            TableField.EMBEDDINGS.value: vectors[pos].tolist(),
+        }
+
+    def select(self, conditions: List[FilterCondition] = None, offset: int = None, limit: int = None) -> List[dict]:
+        """ rows which match conditions
+        """
+        with self._lock:
+            self._refresh()
+            where, params = self._where(conditions)
+            sql = f'SELECT id, pos, content, metadata FROM rows {where} ORDER BY rowid'
+            if limit is not None or offset is not None:
+                sql += ' LIMIT ? OFFSET ?'
+                params = params + [-1 if limit is None else limit, offset or 0]
+            return [self._to_record(row, self._vectors) for row in self._con.execute(sql, params)]
+
+    def search(
+        self, queries: np.ndarray, limit: int, conditions: List[FilterCondition] = None, nprobe: int = DEFAULT_NPROBE
+    ) -> List[List[dict]]:
+        """ top-k search of closest vectors for a batch of vectors
+
+            Args:
+                queries (np.ndarray): matrix of vectors to search
+                limit (int): number of results for every vector
+                conditions (List[FilterCondition]): filters of rows
+                nprobe (int): number of scanned clusters
+
+            Returns:
+                List[List[dict]]: found rows with 'distance' for every vector, sorted by distance
+        """
+        with self._lock:
+            self._refresh()
+            queries = _normalize(np.asarray(queries, dtype=np.float32))
+            if self._count == 0:
+                return [[] for _ in queries]
+            if queries.shape[1] != self._state['dim']:
+                raise ValueError(f"Size of vectors is {queries.shape[1]}, expected: {self._state['dim']}")
+
+            where, params = self._where(conditions)
+            allowed = None
+            if where != '':
+                allowed = np.fromiter(
+                    (row[0] for row in self._con.execute(f'SELECT pos FROM rows {where}', params)),
+                    dtype=np.int64
+                )
+
+            if self._centroids is None or (allowed is not None and len(allowed) <= BRUTE_FORCE_LIMIT):
+                candidates = np.flatnonzero(self._alive) if allowed is None else np.sort(allowed)
+                found = self._scan(candidates, queries, limit)
+            else:
+                mask = self._alive
+                if allowed is not None:
+                    mask = np.zeros(self._count, dtype=bool)
+                    mask[allowed] = True
+                candidates, probe_mask = self._probe(queries, nprobe, mask)
+                found = self._scan(candidates, queries, limit, probe_mask)
+
+            return [self._fetch(positions, distances) for positions, distances in found]
+
+    def _get_lists(self) -> list:
+        if self._lists is None:
+            self._lists = [np.zeros(0, dtype=np.int64)] * len(self._centroids)
+            clusters, members = self._group(np.asarray(self._assign), np.arange(self._count))
+            for cluster, cluster_members in zip(clusters, members):
+                self._lists[cluster] = cluster_members
+        return self._lists
+
+    def _probe(self, queries: np.ndarray, nprobe: int, mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """ closest clusters of every query
+
+            Returns:
+                Tuple[np.ndarray, np.ndarray]: positions in clusters which are probed by any query,
+                    mask of probed clusters (queries x clusters)
+        """
+        similarity = queries @ self._centroids.T
+        nprobe = min(nprobe, similarity.shape[1])
+        probe = np.argpartition(-similarity, nprobe - 1, axis=1)[:, :nprobe]
+        probe_mask = np.zeros(similarity.shape, dtype=bool)
+        np.put_along_axis(probe_mask, probe, True, axis=1)
+
+        lists = self._get_lists()
+        candidates = np.concatenate([lists[cluster] for cluster in np.flatnonzero(probe_mask.any(axis=0))])
+        candidates = candidates[mask[candidates]]
+        candidates.sort()
+        return candidates, probe_mask
+
+    def _scan(self, candidates: np.ndarray, queries: np.ndarray, limit: int, probe_mask: np.ndarray = None) -> list:
+        # exact top-k over candidates for every query.
+        #   If probe_mask is set, query is compared only with candidates from its probed clusters
+        block = max(1, BLOCK_BYTES // (queries.shape[1] * 4))
+        best_dist = np.zeros((len(queries), 0), dtype=np.float32)
+        best_pos = np.zeros((len(queries), 0), dtype=np.int64)
+        for start in range(0, len(candidates), block):
+            positions = candidates[start: start + block]
+            similarity = (queries @ np.asarray(self._vectors[positions]).T) / np.maximum(
+                self._norms[positions], np.finfo(np.float32).tiny
+            )
+            distances = 1 - similarity
+            if probe_mask is not None:
+                distances[~probe_mask[:, self._assign[positions]]] = np.inf
+            best_dist = np.concatenate([best_dist, distances], axis=1)
+            best_pos = np.concatenate([best_pos, np.broadcast_to(positions, similarity.shape)], axis=1)
+            if best_dist.shape[1] > limit:
+                top = np.argpartition(best_dist, limit - 1, axis=1)[:, :limit]
+                best_dist = np.take_along_axis(best_dist, top, axis=1)
+                best_pos = np.take_along_axis(best_pos, top, axis=1)
+
+        order = np.argsort(best_dist, axis=1, kind='stable')
+        best_dist = np.take_along_axis(best_dist, order, axis=1)
+        best_pos = np.take_along_axis(best_pos, order, axis=1)
+        # query can have less candidates than limit
+        is_found = np.isfinite(best_dist)
+        return [
+            (positions[found], distances[found])
+            for positions, distances, found in zip(best_pos, best_dist, is_found)
+        ]
+
+    def _fetch(self, positions: np.ndarray, distances: np.ndarray) -> List[dict]:
+        rows = {}
+        positions = positions.tolist()
+        for chunk in _chunks(positions):
+            placeholders = ', '.join(['?'] * len(chunk))
+            for row in self._con.execute(f'SELECT id, pos, content, metadata FROM rows WHERE pos IN ({placeholders})', chunk):
+                rows[row[1]] = row
+
+        result = []
+        for pos, distance in zip(positions, distances.tolist()):
+            record = self._to_record(rows[pos], self._vectors)
+            record[TableField.DISTANCE.value] = distance
+            result.append(record)
+        return result
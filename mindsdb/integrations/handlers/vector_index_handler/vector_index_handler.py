@@ -0,0 +1,233 @@
+import shutil
+import threading
+from collections import OrderedDict
+from contextlib import ExitStack
+from pathlib import Path
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+from mindsdb.integrations.handlers.vector_index_handler.vector_index import VectorIndex, DEFAULT_NPROBE
+from mindsdb.integrations.libs.const import HANDLER_CONNECTION_ARG_TYPE as ARG_TYPE
+from mindsdb.integrations.libs.response import RESPONSE_TYPE
+from mindsdb.integrations.libs.response import HandlerResponse as Response
+from mindsdb.integrations.libs.response import HandlerStatusResponse as StatusResponse
+from mindsdb.integrations.libs.vectordatabase_handler import (
+    FilterCondition,
+    TableField,
+    VectorStoreHandler,
+    to_vector,
+)
+from mindsdb.interfaces.storage.model_fs import HandlerStorage
+from mindsdb.utilities import log
+
+logger = log.getLogger(__name__)
+
+DEFAULT_LIMIT = 10
+
+# indexes are shared between instances of handler: path -> VectorIndex
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+class VectorIndexHandler(VectorStoreHandler):
+    """
+    Vector store which is built in mindsdb: vectors are stored in files of the integration storage
+    and are searched in the process of mindsdb.
+    """
+
+    name = "vector_index"
+
+    vectors_as_arrays = True
+
+    def __init__(self, name: str, **kwargs):
+        super().__init__(name)
+        self.handler_storage = kwargs.get("handler_storage") or HandlerStorage(kwargs.get("integration_id"))
+
+        connection_data = kwargs.get("connection_data") or {}
+        self.persist_directory = connection_data.get("persist_directory") or "vector_index"
+        self.nprobe = int(connection_data.get("nprobe") or DEFAULT_NPROBE)
+        self._path = None
+
+        self.connect()
+
+    def connect(self):
+        """Get folder of the index from storage."""
+        if self.is_connected is True:
+            return
+        self._path = Path(self.handler_storage.folder_get(self.persist_directory))
+        self.is_connected = True
+
+    def disconnect(self):
+        self.is_connected = False
+
+    def check_connection(self) -> StatusResponse:
+        return StatusResponse(self._path is not None and self._path.is_dir())
+
+    def _get_table_path(self, table_name: str) -> Path:
+        return self._path / table_name
+
+    def _get_index(self, table_name: str) -> VectorIndex:
+        path = self._get_table_path(table_name)
+        if not path.is_dir():
+            raise Exception(f"Table {table_name} does not exist!")
+        with _indexes_lock:
+            key = str(path)
+            index = _indexes.get(key)
+            if index is None or index.is_replaced():
+                # files are replaced by folder_get: index is opened again. Previous instance is
+                # not closed, it can be used by other thread and is released with the last reference
+                index = VectorIndex(path)
+                _indexes[key] = index
+            return index
+
+    def _sync(self):
+        # push changed files to the permanent storage, it is done once per statement.
+        # Indexes of the folder are locked: their files can't be changed during upload
+        with _indexes_lock:
+            indexes = [
+                index for key, index in sorted(_indexes.items())
+                if Path(key).parent == self._path
+            ]
+        with ExitStack() as stack:
+            for index in indexes:
+                stack.enter_context(index.lock)
+            self.handler_storage.folder_sync(self.persist_directory)
+
+    def create_table(self, table_name: str, if_not_exists=True):
+        """Create folder of the table."""
+        path = self._get_table_path(table_name)
+        if path.is_dir():
+            if if_not_exists:
+                return Response(resp_type=RESPONSE_TYPE.OK)
+            return Response(
+                resp_type=RESPONSE_TYPE.ERROR,
+                error_message=f"Table {table_name} already exists!",
+            )
+        path.mkdir(parents=True)
+        self._get_index(table_name)
+        self._sync()
+        return Response(resp_type=RESPONSE_TYPE.OK)
+
+    def drop_table(self, table_name: str, if_exists=True):
+        """Remove folder of the table."""
+        path = self._get_table_path(table_name)
+        if not path.is_dir():
+            if if_exists:
+                return Response(resp_type=RESPONSE_TYPE.OK)
+            return Response(
+                resp_type=RESPONSE_TYPE.ERROR,
+                error_message=f"Table {table_name} does not exist!",
+            )
+        with _indexes_lock:
+            index = _indexes.pop(str(path), None)
+        if index is not None:
+            index.close()
+        shutil.rmtree(path)
+        self._sync()
+        return Response(resp_type=RESPONSE_TYPE.OK)
+
+    def get_tables(self) -> Response:
+        tables = sorted(path.name for path in self._path.iterdir() if path.is_dir())
+        return Response(
+            resp_type=RESPONSE_TYPE.TABLE,
+            data_frame=pd.DataFrame(tables, columns=["table_name"])
+        )
+
+    def get_columns(self, table_name: str) -> Response:
+        if not self._get_table_path(table_name).is_dir():
+            return Response(
+                resp_type=RESPONSE_TYPE.ERROR,
+                error_message=f"Table {table_name} does not exist!",
+            )
+        return super().get_columns(table_name)
+
+    def upsert(self, table_name: str, data: pd.DataFrame):
+        """Insert rows or update them by id."""
+        index = self._get_index(table_name)
+
+        columns = data.columns
+        index.upsert(
+            ids=data[TableField.ID.value].astype(str).tolist(),
+            vectors=np.stack([to_vector(value) for value in data[TableField.EMBEDDINGS.value]]),
+            contents=data[TableField.CONTENT.value].tolist() if TableField.CONTENT.value in columns else None,
+            metadatas=data[TableField.METADATA.value].tolist() if TableField.METADATA.value in columns else None,
+        )
+
+    def do_upsert(self, table_name, df):
+        """Upsert by batches, storage is synced after the last batch."""
+        super().do_upsert(table_name, df)
+        self._sync()
+
+    def insert(self, table_name: str, data: pd.DataFrame):
+        return self.do_upsert(table_name, data)
+
+    def update(self, table_name: str, data: pd.DataFrame, key_columns: List[str] = None):
+        return self.do_upsert(table_name, data)
+
+    def delete(self, table_name: str, conditions: List[FilterCondition] = None):
+        """Delete rows which match conditions, all rows are deleted if there are no conditions."""
+        self._get_index(table_name).delete(conditions)
+        self._sync()
+
+    def select(
+        self,
+        table_name: str,
+        columns: List[str] = None,
+        conditions: List[FilterCondition] = None,
+        offset: int = None,
+        limit: int = None,
+    ) -> pd.DataFrame:
+        index = self._get_index(table_name)
+
+        vector_filter = [
+            condition
+            for condition in conditions or []
+            if condition.column in (TableField.EMBEDDINGS.value, TableField.SEARCH_VECTOR.value)
+        ]
+        if len(vector_filter) > 0:
+            vector = to_vector(vector_filter[0].value)
+            if vector.ndim == 2:
+                # list with one vector
+                vector = vector[0]
+            if limit is None:
+                limit = DEFAULT_LIMIT
+            records = index.search(vector[None], limit + (offset or 0), conditions, nprobe=self.nprobe)[0]
+            records = records[offset or 0:]
+        else:
+            records = index.select(conditions, offset=offset, limit=limit)
+
+        if columns is None:
+            columns = [col["name"] for col in self.SCHEMA]
+        if len(vector_filter) > 0:
+            # always include distance
+            columns = list(columns) + [TableField.DISTANCE.value]
+        return pd.DataFrame(records, columns=columns)
+
+    def search(
+        self, table_name: str, vectors: np.ndarray, limit: int, conditions: List[FilterCondition] = None
+    ) -> List[pd.DataFrame]:
+        """All vectors are searched by one request to the index."""
+        columns = [col["name"] for col in self.SCHEMA] + [TableField.DISTANCE.value]
+        found = self._get_index(table_name).search(vectors, limit, conditions, nprobe=self.nprobe)
+        return [pd.DataFrame(records, columns=columns) for records in found]
+
+
+connection_args = OrderedDict(
+    persist_directory={
+        "type": ARG_TYPE.STR,
+        "description": "name of folder in the storage of integration to keep the index",
+        "required": False,
+    },
+    nprobe={
+        "type": ARG_TYPE.INT,
+        "description": "number of clusters which are scanned during search in big tables",
+        "required": False,
+    },
+)
+
+connection_args_example = OrderedDict(
+    persist_directory="vector_index",
+    nprobe=16,
+)
@@ -286,6 +286,10 @@ class BaseMLEngine(ArgProbeMixin):
       - Any output produced by the ML engine is then formatted by the wrapper and passed back into the MindsDB executor, which can then morph the data to comply with the original SQL query
     """  # noqa
 
+    # prediction of every row depends only on that row and predictions are returned in order of input rows.
+    # Rows of concurrent predict calls can be predicted together, see libs/predict_batcher.py
+    row_wise_predict = False
+
     def __init__(self, model_storage, engine_storage, **kwargs) -> None:
         """
         Warning: This method should not be overridden.
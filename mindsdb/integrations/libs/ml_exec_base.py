@@ -48,6 +48,8 @@ import mindsdb.utilities.profiler as profiler
 from mindsdb.utilities.ml_task_queue.producer import MLTaskProducer
 from mindsdb.utilities.ml_task_queue.const import ML_TASK_TYPE
 from mindsdb.integrations.libs.process_cache import process_cache, empty_callback
+from mindsdb.integrations.libs.predict_batcher import get_predict_batcher, is_batchable
+from mindsdb.utilities.cache import json_checksum
 
 try:
     import torch.multiprocessing as mp
@@ -263,7 +265,7 @@ class BaseMLEngineExec:
             'predict_params': {} if params is None else params
         }
 
-        try:
+        def run_predict(dataframe):
             task = self.base_ml_executor.apply_async(
                 task_type=ML_TASK_TYPE.PREDICT,
                 model_id=predictor_record.id,
@@ -278,9 +280,20 @@ class BaseMLEngineExec:
                     'predictor_record': predictor_record,
                     'args': args
                 },
-                dataframe=df
+                dataframe=dataframe
             )
-            predictions = task.result()
+            return task.result()
+
+        try:
+            predict_batcher = get_predict_batcher()
+            if predict_batcher is None or not is_batchable(self.handler_class, predictor_record.learn_args):
+                predictions = run_predict(df)
+            else:
+                batch_key = (
+                    predictor_record.id, self.integration_id, ctx.company_id,
+                    tuple(df.columns), json_checksum(args)
+                )
+                predictions = predict_batcher.predict(batch_key, df, run_predict)
         except Exception as e:
             msg = str(e).strip()
             if msg == '':
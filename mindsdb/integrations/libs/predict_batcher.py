@@ -0,0 +1,149 @@
+"""
+Coalescing of concurrent predict calls to the same model into one call to ML engine.
+
+The first call for a key opens a batch and waits for a short time window (or until
+the batch is full), the calls which come in this window add their data to the batch
+and wait for the result. Then the first call makes prediction for the whole batch
+and every call gets its own part of predictions.
+
+It is enabled in mindsdb config:
+
+    "ml_predict_batching": {
+        "enabled": true,
+        "window": 0.005,
+        "max_rows": 10000
+    }
+
+- window - time in seconds to wait for other calls
+- max_rows - max count of rows in batch, full batch is sent without waiting of the window
+
+Only models which predict every row independently are batched: engine has to declare
+row_wise_predict, and time series models are never batched.
+"""
+
+import threading
+from typing import Callable, Hashable
+
+import pandas as pd
+
+from mindsdb.utilities.config import Config
+
+
+class PredictBatch:
+    def __init__(self):
+        self.dataframes = []
+        self.rows_count = 0
+        self.full = threading.Event()
+        self.done = threading.Event()
+        self.result = None
+        self.exception = None
+        # engine returned not one prediction per input row: it is not possible to split result
+        self.split_failed = False
+
+    def add(self, df: pd.DataFrame) -> tuple:
+        start = self.rows_count
+        self.dataframes.append(df)
+        self.rows_count += len(df)
+        return start, self.rows_count
+
+
+class PredictBatcher:
+    def __init__(self, window: float = 0.005, max_rows: int = 10000):
+        self.window = window
+        self.max_rows = max_rows
+        self._batches = {}
+        self._lock = threading.Lock()
+
+    def predict(self, key: Hashable, df: pd.DataFrame, predict_fn: Callable) -> pd.DataFrame:
+        """ Make prediction for df in batch with other concurrent calls with the same key
+
+            Args:
+                key (Hashable): calls with the same key are batched,
+                    it has to include everything which affects prediction except of input data
+                predict_fn (Callable): function to make prediction for DataFrame
+
+            Returns:
+                pd.DataFrame: predictions for df
+        """
+        if len(df) >= self.max_rows:
+            return predict_fn(df)
+
+        with self._lock:
+            batch = self._batches.get(key)
+            is_leader = batch is None or batch.rows_count + len(df) > self.max_rows
+            if is_leader:
+                if batch is not None:
+                    batch.full.set()
+                batch = PredictBatch()
+                self._batches[key] = batch
+            start, end = batch.add(df)
+            if batch.rows_count >= self.max_rows:
+                batch.full.set()
+
+        if is_leader:
+            batch.full.wait(self.window)
+            with self._lock:
+                if self._batches.get(key) is batch:
+                    del self._batches[key]
+            if len(batch.dataframes) == 1:
+                # nobody joined
+                return predict_fn(df)
+            self._execute(batch, predict_fn)
+        else:
+            batch.done.wait()
+
+        if batch.exception is not None:
+            raise batch.exception
+        if batch.split_failed:
+            return predict_fn(df)
+        return batch.result.iloc[start:end].reset_index(drop=True)
+
+    def _execute(self, batch: PredictBatch, predict_fn: Callable):
+        try:
+            df = pd.concat(batch.dataframes, ignore_index=True)
+            batch.result = predict_fn(df)
+            if len(batch.result) != len(df):
+                # every call will make own prediction
+                batch.split_failed = True
+        except Exception as e:
+            batch.exception = e
+        finally:
+            batch.done.set()
+
+
+def is_batchable(handler_class, learn_args: dict) -> bool:
+    """ Rows of different calls can be predicted together only if prediction of a row
+        doesn't depend on other rows
+
+        Args:
+            handler_class: class of ML engine
+            learn_args (dict): learn_args of the model
+
+        Returns:
+            bool
+    """
+    if not getattr(handler_class, 'row_wise_predict', False):
+        return False
+    if 'timeseries_settings' in (learn_args or {}):
+        return False
+    return True
+
+
+_predict_batcher = None
+_predict_batcher_lock = threading.Lock()
+
+
+def get_predict_batcher():
+    """ Batcher from config or None if batching is disabled
+    """
+    global _predict_batcher
+    config = Config().get('ml_predict_batching', {})
+    if not config.get('enabled', False):
+        return None
+    with _predict_batcher_lock:
+        if _predict_batcher is None:
+            _predict_batcher = PredictBatcher(
+                window=config.get('window', 0.005),
+                max_rows=config.get('max_rows', 10000)
+            )
+    return _predict_batcher
@@ -1,6 +1,7 @@
 import sys
 import time
 import threading
+from functools import partial
 from typing import Optional, Callable
 from concurrent.futures import ProcessPoolExecutor, Future
 
@@ -10,6 +11,7 @@ from mindsdb.utilities.config import Config
 from mindsdb.utilities.context import context as ctx
 from mindsdb.utilities.ml_task_queue.const import ML_TASK_TYPE
 from mindsdb.integrations.libs.learn_process import learn_process, predict_process
+from mindsdb.integrations.libs.shared_dataframe import SharedDataFrame, get_min_size, to_shared, from_shared
 
 
 def init_ml_handler(module_path):
@@ -140,10 +142,31 @@ class WarmProcess:
 
 def warm_function(func, context: str, *args, **kwargs):
     ctx.load(context)
+    args = [from_shared(arg) for arg in args]
     try:
-        return func(*args, **kwargs)
+        result = func(*args, **kwargs)
     except Exception as e:
         raise RuntimeError(str(e)) from e
+    return to_shared(result)
+
+
+def resolve_shared_result(future: Future, shared_input: Optional[SharedDataFrame], task: Future):
+    """ callback for the task which uses shared memory: read result from shared memory
+        and free memory of input dataframe
+
+        Args:
+            future (Future): future to pass result to
+            shared_input (SharedDataFrame): input dataframe of the task
+            task (Future): finished task
+    """
+    if shared_input is not None:
+        shared_input.unlink()
+    try:
+        result = from_shared(task.result(), unlink=True)
+    except Exception as e:
+        future.set_exception(e)
+    else:
+        future.set_result(result)
 
 
 class ProcessCache:
@@ -241,6 +264,32 @@ class ProcessCache:
         handler_module_path = payload['handler_meta']['module_path']
         handler_name = payload['handler_meta']['engine']
         model_marker = (model_id, payload['context']['company_id'])
+        use_shared_memory = get_min_size() is not None
+        shared_input = None
+        if use_shared_memory:
+            # copy before lock: other tasks are not blocked while big dataframe is copied
+            shared_input = to_shared(dataframe)
+            if isinstance(shared_input, SharedDataFrame):
+                dataframe = shared_input
+            else:
+                shared_input = None
+
+        try:
+            task = self._submit(func, handler_name, handler_module_path, model_marker, payload, dataframe)
+        except Exception:
+            if shared_input is not None:
+                shared_input.unlink()
+            raise
+
+        if use_shared_memory:
+            # result may be placed in shared memory
+            future = Future()
+            task.add_done_callback(partial(resolve_shared_result, future, shared_input))
+            return future
+        return task
+
+    def _submit(self, func, handler_name, handler_module_path, model_marker, payload, dataframe):
+        # send task to warm process of the handler, new process is started if there are no free processes
         with self._lock:
             if handler_name not in self.cache:
                 warm_process = WarmProcess(init_ml_handler, (handler_module_path,))
@@ -0,0 +1,151 @@
+"""
+Transfer of DataFrames between API process and WarmProcess-es through shared memory.
+
+DataFrame is written in arrow IPC format directly into shared memory block, only
+small handle of that block is pickled and sent to another process. Receiver reads
+the block without copying it into bytes and unlinks it.
+
+It is enabled in mindsdb config:
+
+    "ml_task_queue": {
+        "type": "local",
+        "shared_memory": {
+            "enabled": true,
+            "min_size": 10485760
+        }
+    }
+
+- min_size - DataFrames smaller than this (in bytes) are sent using pickle
+"""
+
+from multiprocessing import shared_memory
+from typing import Optional
+
+from pandas import DataFrame
+
+from mindsdb.utilities.config import Config
+from mindsdb.utilities import log
+
+logger = log.getLogger(__name__)
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+
+DEFAULT_MIN_SIZE = 10 * 1024 * 1024
+
+
+class SharedDataFrame:
+    """ Handle of DataFrame placed in shared memory
+    """
+
+    def __init__(self, name: str, size: int):
+        self.name = name
+        self.size = size
+
+    @staticmethod
+    def create(df: DataFrame) -> Optional['SharedDataFrame']:
+        """ Put DataFrame into shared memory
+
+            Returns:
+                SharedDataFrame or None if DataFrame can't be converted to arrow
+        """
+        try:
+            table = pa.Table.from_pandas(df)
+        except (pa.ArrowException, TypeError, ValueError) as e:
+            logger.debug(f"Can't convert dataframe to arrow: {e}")
+            return None
+
+        # calculate size of the block
+        mock_sink = pa.MockOutputStream()
+        with pa.ipc.new_stream(mock_sink, table.schema) as writer:
+            writer.write_table(table)
+        size = mock_sink.size()
+
+        shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        try:
+            buffer = pa.py_buffer(shm.buf)
+            sink = pa.FixedSizeBufferWriter(buffer)
+            with pa.ipc.new_stream(sink, table.schema) as writer:
+                writer.write_table(table)
+            sink.close()
+            # arrow buffers have to be released before closing of the block
+            del writer, sink, buffer
+        except Exception:
+            shm.close()
+            shm.unlink()
+            raise
+        shm.close()
+        return SharedDataFrame(shm.name, size)
+
+    def read(self) -> DataFrame:
+        """ Read DataFrame from shared memory
+        """
+        shm = shared_memory.SharedMemory(name=self.name)
+        try:
+            buffer = pa.py_buffer(shm.buf)[:self.size]
+            df = pa.ipc.open_stream(buffer).read_all().to_pandas()
+            # arrow buffers have to be released before closing of the block
+            del buffer
+        finally:
+            shm.close()
+        return df
+
+    def unlink(self):
+        """ Free shared memory block
+        """
+        try:
+            shm = shared_memory.SharedMemory(name=self.name)
+        except FileNotFoundError:
+            return
+        shm.close()
+        shm.unlink()
+
+
+def get_min_size() -> Optional[int]:
+    """ Min size of DataFrame to transfer it through shared memory
+
+        Returns:
+            int or None if shared memory transfer is disabled
+    """
+    if pa is None:
+        return None
+    config = Config()['ml_task_queue'].get('shared_memory', {})
+    if not config.get('enabled', False):
+        return None
+    return config.get('min_size', DEFAULT_MIN_SIZE)
+
+
+def to_shared(obj: object) -> object:
+    """ Put obj to shared memory if it is big enough DataFrame
+
+        Returns:
+            SharedDataFrame or obj itself
+    """
+    if not isinstance(obj, DataFrame):
+        return obj
+    min_size = get_min_size()
+    if min_size is None or obj.memory_usage(index=True, deep=False).sum() < min_size:
+        return obj
+    shared_df = SharedDataFrame.create(obj)
+    if shared_df is None:
+        return obj
+    return shared_df
+
+
+def from_shared(obj: object, unlink: bool = False) -> object:
+    """ Read DataFrame if obj is SharedDataFrame
+
+        Args:
+            obj (object): SharedDataFrame or any other object
+            unlink (bool): free shared memory after reading
+    """
+    if not isinstance(obj, SharedDataFrame):
+        return obj
+    try:
+        return obj.read()
+    finally:
+        if unlink:
+            obj.unlink()
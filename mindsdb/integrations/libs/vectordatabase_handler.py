@@ -1,8 +1,10 @@
 import ast
+import json
 import hashlib
 from enum import Enum
 from typing import Any, List, Optional
 
+import numpy as np
 import pandas as pd
 from mindsdb_sql.parser.ast import (
     BinaryOperation,
@@ -20,6 +22,7 @@ from mindsdb_sql.parser.ast.base import ASTNode
 
 from mindsdb.integrations.libs.response import RESPONSE_TYPE, HandlerResponse
 from mindsdb.utilities import log
+from mindsdb.utilities.config import Config
 from mindsdb.integrations.utilities.sql_utils import conditions_to_filter
 
 from ..utilities.sql_utils import query_traversal
@@ -27,6 +30,8 @@ from .base import BaseHandler
 
 LOG = log.getLogger(__name__)
 
+DEFAULT_UPSERT_BATCH_SIZE = 1000
+
 
 class FilterOperator(Enum):
     """
@@ -79,6 +84,39 @@ class FilterCondition:
         """
 
 
+def to_vector(value) -> np.ndarray:
+    """
+    Converts embeddings to float32 array.
+    Embeddings can be array, list or string like '[0.1, 0.2]'
+    """
+    if isinstance(value, np.ndarray):
+        if value.dtype == np.float32:
+            return value
+        return value.astype(np.float32)
+    if isinstance(value, str):
+        text = value.strip()
+        if text.startswith('[') and text.endswith(']'):
+            text = text[1:-1]
+            vector = np.fromstring(text, dtype=np.float32, sep=',')
+            # fromstring stops at the first invalid value
+            if len(vector) == text.count(',') + 1:
+                return vector
+        value = ast.literal_eval(value)
+    return np.asarray(value, dtype=np.float32)
+
+
+def parse_metadata(value):
+    """
+    Converts metadata string to dict, other values are returned as is
+    """
+    if not isinstance(value, str):
+        return value
+    try:
+        return json.loads(value)
+    except ValueError:
+        return ast.literal_eval(value)
+
+
 class TableField(Enum):
     """
     Enum for table fields.
@@ -97,6 +135,9 @@ class VectorStoreHandler(BaseHandler):
     Base class for handlers associated to vector databases.
     """
 
+    # handler accepts embeddings as float32 arrays, otherwise they are converted to lists
+    vectors_as_arrays = False
+
     SCHEMA = [
         {
             "name": TableField.ID.value,
@@ -257,7 +298,7 @@ class VectorStoreHandler(BaseHandler):
         if TableField.EMBEDDINGS.value in columns:
             embeddings_col_index = columns.index("embeddings")
             embeddings = [
-                ast.literal_eval(self._value_or_self(row[embeddings_col_index]))
+                to_vector(self._value_or_self(row[embeddings_col_index]))
                 for row in query.values
             ]
         else:
@@ -266,7 +307,7 @@ class VectorStoreHandler(BaseHandler):
         if TableField.METADATA.value in columns:
             metadata_col_index = columns.index("metadata")
             metadata = [
-                ast.literal_eval(self._value_or_self(row[metadata_col_index]))
+                parse_metadata(self._value_or_self(row[metadata_col_index]))
                 for row in query.values
             ]
         else:
@@ -301,7 +342,7 @@ class VectorStoreHandler(BaseHandler):
             if k == TableField.EMBEDDINGS.value and isinstance(v, str):
                 # it could be embeddings in string
                 try:
-                    v = eval(v)
+                    v = to_vector(v)
                 except Exception:
                     pass
             row[k] = v
@@ -326,13 +367,30 @@ class VectorStoreHandler(BaseHandler):
         return self.do_upsert(table_name, df)
 
     def do_upsert(self, table_name, df):
-        # if handler supports it, call upsert method
-
+        """
+        Insert or update rows by id, rows are sent to vector db by batches.
+        Size of batch is set in config: "vector_store": {"upsert_batch_size": 1000}
+        """
         id_col = TableField.ID.value
+        emb_col = TableField.EMBEDDINGS.value
 
         # id is string TODO is it ok?
         df[id_col] = df[id_col].apply(str)
 
+        if emb_col in df.columns:
+            vectors = [to_vector(value) for value in df[emb_col]]
+            if not self.vectors_as_arrays:
+                vectors = [vector.tolist() for vector in vectors]
+            df[emb_col] = vectors
+
+        batch_size = Config().get('vector_store', {}).get('upsert_batch_size', DEFAULT_UPSERT_BATCH_SIZE)
+        for start in range(0, len(df), batch_size):
+            self._upsert_batch(table_name, df.iloc[start: start + batch_size].copy())
+
+    def _upsert_batch(self, table_name, df):
+        id_col = TableField.ID.value
+
+        # if handler supports it, call upsert method
         if hasattr(self, 'upsert'):
             self.upsert(table_name, df)
             return
@@ -529,6 +587,38 @@ class VectorStoreHandler(BaseHandler):
         """
         raise NotImplementedError()
 
+    def search(
+        self,
+        table_name: str,
+        vectors: np.ndarray,
+        limit: int,
+        conditions: List[FilterCondition] = None,
+    ) -> List[pd.DataFrame]:
+        """Top-k search of closest rows for a batch of vectors.
+        Vector db is queried for every vector, handlers which are able to search by several vectors at once override it
+
+        Args:
+            table_name (str): table name
+            vectors (np.ndarray): matrix of vectors to search
+            limit (int): number of rows for every vector
+            conditions (List[FilterCondition]): other conditions of rows
+
+        Returns:
+            List[pd.DataFrame]: closest rows for every vector
+        """
+        conditions = conditions or []
+        return [
+            self.select(
+                table_name,
+                columns=[col["name"] for col in self.SCHEMA],
+                conditions=conditions + [
+                    FilterCondition(column=TableField.EMBEDDINGS.value, op=FilterOperator.EQUAL, value=[vector.tolist()])
+                ],
+                limit=limit,
+            )
+            for vector in vectors
+        ]
+
     def get_columns(self, table_name: str) -> HandlerResponse:
         # return a fixed set of columns
         data = pd.DataFrame(self.SCHEMA)
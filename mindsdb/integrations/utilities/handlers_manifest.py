@@ -0,0 +1,193 @@
+"""
+Static manifest of handlers metadata.
+
+Import of all handlers modules takes a lot of time and memory at start of mindsdb.
+The manifest contains the metadata of every handler (name, type, title, connection_args,
+icon, dependencies, ...), it is used to list handlers (information_schema.handlers,
+http api) without import of them. The module of handler is imported on first use.
+
+The manifest is generated and has to be rebuilt after a handler is added or its metadata is changed:
+
+    python -m mindsdb.integrations.utilities.handlers_manifest
+
+Handlers which are not in the manifest are imported at start as before.
+
+Until the handler is imported, the result of its import (`import.success`) is predicted by
+the installed distributions: it is True if every requirement of the handler is installed.
+"""
+
+import os
+import re
+import json
+import importlib
+import importlib.metadata
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+from packaging.requirements import Requirement, InvalidRequirement
+
+from mindsdb.utilities import log
+
+logger = log.getLogger(__name__)
+
+
+MANIFEST_FILE_NAME = 'manifest.json'
+
+# metadata of handler which doesn't depend on the environment
+MANIFEST_ATTRS = (
+    'name',
+    'type',
+    'title',
+    'description',
+    'version',
+    'connection_args',
+    'connection_args_example',
+    'permanent'
+)
+
+
+def get_handlers_path() -> Path:
+    mindsdb_path = Path(importlib.util.find_spec('mindsdb').origin).parent
+    handlers_path = mindsdb_path.joinpath('integrations/handlers')
+
+    # edge case: running from tests directory, find_spec finds the base folder instead of actual package
+    if not os.path.isdir(handlers_path):
+        mindsdb_path = Path(importlib.util.find_spec('mindsdb').origin).parent.joinpath('mindsdb')
+        handlers_path = mindsdb_path.joinpath('integrations/handlers')
+    return handlers_path
+
+
+def get_handlers_dirs(handlers_path: Path = None) -> list:
+    if handlers_path is None:
+        handlers_path = get_handlers_path()
+    return sorted(
+        handler_dir for handler_dir in handlers_path.iterdir()
+        if handler_dir.is_dir() and not handler_dir.name.startswith('__')
+    )
+
+
+def _normalize_name(name: str) -> str:
+    return re.sub(r'[-_.]+', '-', name).lower()
+
+
+@lru_cache(maxsize=1)
+def get_installed_distributions() -> frozenset:
+    """ normalized names of installed python distributions
+    """
+    names = set()
+    for distribution in importlib.metadata.distributions():
+        name = distribution.metadata['Name']
+        if name is not None:
+            names.add(_normalize_name(name))
+    return frozenset(names)
+
+
+def get_missing_dependencies(dependencies: list, handlers_path: Path = None) -> list:
+    """ requirements of handler which are not installed, handler is not imported for that
+
+        Args:
+            dependencies (list): lines of requirements.txt of handler, '-r <file>' lines are read
+
+        Returns:
+            list: names of not installed requirements
+    """
+    if handlers_path is None:
+        handlers_path = get_handlers_path()
+    installed = get_installed_distributions()
+    missing = []
+    for line in dependencies:
+        line = line.strip()
+        if line.startswith('-r '):
+            # path is relative to the root of repository
+            requirements_path = handlers_path.parents[2].joinpath(line[3:].strip())
+            try:
+                with open(requirements_path, 'rt') as f:
+                    missing.extend(get_missing_dependencies(f.readlines(), handlers_path))
+            except OSError:
+                pass
+            continue
+        if line == '' or line.startswith('#') or line.startswith('-'):
+            continue
+        try:
+            requirement = Requirement(line)
+        except InvalidRequirement:
+            continue
+        if requirement.marker is not None and not requirement.marker.evaluate():
+            continue
+        if _normalize_name(requirement.name) not in installed:
+            missing.append(requirement.name)
+    return missing
+
+
+def load_manifest(handlers_path: Path = None) -> Optional[dict]:
+    """ read manifest
+
+        Returns:
+            dict: handler name -> handler metadata, or None if there is no manifest
+    """
+    if handlers_path is None:
+        handlers_path = get_handlers_path()
+    manifest_path = handlers_path.joinpath(MANIFEST_FILE_NAME)
+    if not manifest_path.is_file():
+        return None
+    try:
+        with open(manifest_path, 'rt') as f:
+            return json.load(f)['handlers']
+    except Exception as e:
+        logger.warning(f"Can't read handlers manifest {manifest_path}: {e}")
+        return None
+
+
+def build_manifest(handlers_path: Path = None) -> dict:
+    """ import every handler and collect its metadata
+
+        Handlers which can't be imported are skipped: they will be imported at start of mindsdb
+    """
+    from mindsdb.interfaces.database.integrations import integration_controller
+
+    handlers = {}
+    for handler_dir in get_handlers_dirs(handlers_path):
+        try:
+            module = importlib.import_module(f'mindsdb.integrations.handlers.{handler_dir.name}')
+            handler_meta = integration_controller._get_handler_meta(module)
+        except Exception as e:
+            logger.warning(f"Handler '{handler_dir.name}' is not added to manifest: {e}")
+            continue
+
+        item = {
+            attr: handler_meta[attr]
+            for attr in MANIFEST_ATTRS
+            if attr in handler_meta
+        }
+        item['folder'] = handler_dir.name
+        item['dependencies'] = handler_meta['import']['dependencies']
+        if 'icon' in handler_meta:
+            # icon data is read from the handler folder
+            item['icon'] = {
+                'name': handler_meta['icon']['name'],
+                'type': handler_meta['icon']['type']
+            }
+        if 'name' not in item:
+            continue
+        try:
+            json.dumps(item)
+        except TypeError as e:
+            logger.warning(f"Handler '{handler_dir.name}' is not added to manifest: {e}")
+            continue
+        handlers[item['name']] = item
+    return handlers
+
+
+def write_manifest(handlers: dict, handlers_path: Path = None):
+    if handlers_path is None:
+        handlers_path = get_handlers_path()
+    with open(handlers_path.joinpath(MANIFEST_FILE_NAME), 'wt') as f:
+        json.dump({'handlers': handlers}, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+if __name__ == '__main__':
+    handlers = build_manifest()
+    write_manifest(handlers)
+    logger.info(f'Handlers manifest is written: {len(handlers)} handlers')
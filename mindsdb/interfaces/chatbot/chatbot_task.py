@@ -39,10 +39,17 @@ class ChatBotTask(BaseTask):
 
         database_name = db.Integration.query.get(bot_record.database_id).name
 
-        self.chat_handler = self.session.integration_controller.get_handler(database_name)
+        # the handler is used during whole life of the bot, it is not taken from the pool
+        self.chat_handler = self.session.integration_controller.get_handler(database_name, pooled=False)
         if not isinstance(self.chat_handler, APIChatHandler):
             raise Exception(f"Can't use chat database: {database_name}")
 
+        try:
+            self._run(stop_event, bot_record)
+        finally:
+            self.chat_handler.disconnect()
+
+    def _run(self, stop_event, bot_record):
         # get chat handler info
         self.bot_params = bot_record.params or {}
 
@@ -75,6 +82,9 @@ class ChatBotTask(BaseTask):
             raise
         except Exception:
             self.set_error(str(traceback.format_exc()))
+        finally:
+            # return handlers which were used to process the message to the pool
+            self.session.integration_controller.release_handlers()
 
     def _on_message(self, chat_memory, message: ChatBotMessage):
         # add question to history
@@ -1,5 +1,3 @@
-import os
-import sys
 import base64
 import shutil
 import tempfile
@@ -26,28 +24,68 @@ from mindsdb.integrations.libs.base import BaseMLEngine
 from mindsdb.integrations.libs.api_handler import APIHandler
 from mindsdb.integrations.libs.const import HANDLER_CONNECTION_ARG_TYPE as ARG_TYPE, HANDLER_TYPE
 from mindsdb.integrations.handlers_client.db_client_factory import DBClient
+from mindsdb.interfaces.database.schema_cache import get_schema_cache
 from mindsdb.interfaces.model.functions import get_model_records
 from mindsdb.utilities.context import context as ctx
 from mindsdb.utilities import log
 from mindsdb.integrations.libs.ml_exec_base import BaseMLEngineExec
+from mindsdb.integrations.utilities.handlers_manifest import (
+    get_handlers_path, get_handlers_dirs, load_manifest, get_missing_dependencies
+)
 import mindsdb.utilities.profiler as profiler
 
 logger = log.getLogger(__name__)
 
 
 class HandlersCache:
-    """ Cache for data handlers that keep connections opened during ttl time from handler last use
+    """ Pool of data handlers with opened connections.
+
+        Handler is leased by thread and stays with it until `release` is called (at the end of
+        the request) or the thread is finished. Released handlers are reused by any thread of
+        the same company. Handlers which were not in use for ttl time are disconnected.
+        Long-living threads (chatbots, triggers) use not pooled handlers and release
+        the leased ones after every processed event, to not keep slots of the pool.
+
+        Pool is configured in mindsdb config:
+
+            "handlers_pool": {
+                "min_size": 0,
+                "max_size": 20,
+                "ttl": 60,
+                "timeout": 30,
+                "health_check_interval": 30
+            }
+
+        - min_size - count of idle handlers for integration which are not disconnected after ttl
+        - max_size - max count of handlers for integration (in use + idle) of the company, null - no limit
+        - timeout - time to wait for free handler if max_size is reached
+        - health_check_interval - idle handlers which were not used for this time are checked
+          before reuse
     """
 
-    def __init__(self, ttl: int = 60):
+    def __init__(self, ttl: int = None):
         """ init cache
 
             Args:
-                ttl (int): time to live (in seconds) for record in cache
+                ttl (int): time to live (in seconds) for unused handler in cache
         """
+        config = Config().get('handlers_pool', {})
+        if ttl is None:
+            ttl = config.get('ttl', 60)
         self.ttl = ttl
-        self.handlers = {}
+        self.min_size = config.get('min_size', 0)
+        self.max_size = config.get('max_size', 20)
+        self.timeout = config.get('timeout', 30)
+        self.health_check_interval = config.get('health_check_interval', 30)
+
+        # (name, company_id) -> list of {'handler', 'released_at'}
+        self.idle = {}
+        # (name, company_id) -> {thread_id: {'handler', 'thread', 'discard'}}
+        self.leased = {}
+        # (name, company_id) -> set of thread_id which are creating handler
+        self.reserved = {}
         self._lock = threading.RLock()
+        self._released = threading.Condition(self._lock)
         self._stop_event = threading.Event()
         self.cleaner_thread = None
 
@@ -72,82 +110,222 @@ class HandlersCache:
         """
         self._stop_event.set()
 
+    @staticmethod
+    def _is_handler_process() -> bool:
+        # do not cache connections in handlers processes
+        return multiprocessing.current_process().name.startswith('HandlerProcess')
+
+    @staticmethod
+    def _disconnect(handler: DatabaseHandler) -> None:
+        try:
+            handler.disconnect()
+        except Exception:
+            pass
+
+    def _size(self, key: tuple) -> int:
+        return (
+            len(self.idle.get(key, []))
+            + len(self.leased.get(key, {}))
+            + len(self.reserved.get(key, set()))
+        )
+
+    def _is_healthy(self, record: dict) -> bool:
+        """ check connection of idle handler if it was not in use for long time
+        """
+        if time() - record['released_at'] < self.health_check_interval:
+            return True
+        try:
+            return record['handler'].check_connection().success is True
+        except Exception:
+            return False
+
     def set(self, handler: DatabaseHandler):
-        """ add (or replace) handler in cache
+        """ add handler in cache and lease it to current thread
 
             Args:
                 handler (DatabaseHandler)
         """
-        # do not cache connections in handlers processes
-        if multiprocessing.current_process().name.startswith('HandlerProcess'):
+        if self._is_handler_process():
+            return
+        key = (handler.name, ctx.company_id)
+        thread_id = threading.get_ident()
+        try:
+            handler.connect()
+        except Exception:
+            with self._released:
+                self.reserved.get(key, set()).discard(thread_id)
+                self._released.notify()
             return
         with self._lock:
-            try:
-                key = (handler.name, ctx.company_id, threading.get_native_id())
-                handler.connect()
-                self.handlers[key] = {
-                    'handler': handler,
-                    'expired_at': time() + self.ttl
-                }
-            except Exception:
-                pass
+            self.reserved.get(key, set()).discard(thread_id)
+            leased = self.leased.setdefault(key, {})
+            if thread_id in leased:
+                self._disconnect(leased[thread_id]['handler'])
+            leased[thread_id] = {
+                'handler': handler,
+                'thread': threading.current_thread(),
+                'discard': False
+            }
             self._start_clean()
 
     def get(self, name: str) -> Optional[DatabaseHandler]:
-        """ get handler from cache by name
+        """ lease handler from cache by name
+
+            If there is no free handler, slot for new handler is reserved for current thread:
+            new handler has to be passed to `set` or reservation cancelled by `unreserve`
 
             Args:
                 name (str): handler name
 
             Returns:
-                DatabaseHandler
+                DatabaseHandler or None if new handler has to be created
         """
-        with self._lock:
-            key = (name, ctx.company_id, threading.get_native_id())
-            if (
-                key not in self.handlers
-                or self.handlers[key]['expired_at'] < time()
-            ):
-                return None
-            self.handlers[key]['expired_at'] = time() + self.ttl
-            return self.handlers[key]['handler']
+        if self._is_handler_process():
+            return None
+        key = (name, ctx.company_id)
+        thread_id = threading.get_ident()
+        deadline = time() + self.timeout
+        while True:
+            with self._released:
+                leased = self.leased.setdefault(key, {})
+                record = leased.get(thread_id)
+                if record is not None:
+                    if record['discard'] is False:
+                        return record['handler']
+                    del leased[thread_id]
+                    self._disconnect(record['handler'])
+
+                idle = self.idle.get(key, [])
+                if len(idle) == 0:
+                    if self.max_size is None or self._size(key) < self.max_size:
+                        self.reserved.setdefault(key, set()).add(thread_id)
+                        return None
+
+                    wait_time = deadline - time()
+                    if wait_time <= 0:
+                        raise Exception(f"Timeout of waiting for free connection to '{name}'")
+                    self._released.wait(wait_time)
+                    continue
+
+                # the most recently used is the most likely to be alive
+                record = idle.pop()
+                # keep the slot while connection is checked
+                self.reserved.setdefault(key, set()).add(thread_id)
+
+            is_healthy = self._is_healthy(record)
+
+            with self._released:
+                self.reserved[key].discard(thread_id)
+                if is_healthy:
+                    leased[thread_id] = {
+                        'handler': record['handler'],
+                        'thread': threading.current_thread(),
+                        'discard': False
+                    }
+                    return record['handler']
+                self._released.notify()
+            self._disconnect(record['handler'])
+
+    def unreserve(self, name: str) -> None:
+        """ cancel reservation of slot for handler made by `get`
+
+            Args:
+                name (str): handler name
+        """
+        key = (name, ctx.company_id)
+        with self._released:
+            reserved = self.reserved.get(key)
+            if reserved is not None and threading.get_ident() in reserved:
+                reserved.discard(threading.get_ident())
+                self._released.notify()
+
+    def release(self, thread_id: int = None) -> None:
+        """ return handlers leased by thread back to pool
+
+            Args:
+                thread_id (int): id of the thread, current thread by default
+        """
+        if thread_id is None:
+            thread_id = threading.get_ident()
+        with self._released:
+            for key, leased in self.leased.items():
+                record = leased.pop(thread_id, None)
+                if record is None:
+                    continue
+                if record['discard']:
+                    self._disconnect(record['handler'])
+                    continue
+                self.idle.setdefault(key, []).append({
+                    'handler': record['handler'],
+                    'released_at': time()
+                })
+            self._released.notify_all()
 
     def delete(self, name: str) -> None:
-        """ delete handler from cache
+        """ delete handlers of integration from cache
 
             Args:
                 name (str): handler name
         """
-        with self._lock:
-            key = (name, ctx.company_id, threading.get_native_id())
-            if key in self.handlers:
-                try:
-                    self.handlers[key].disconnect()
-                except Exception:
-                    pass
-                del self.handlers[key]
-            if len(self.handlers) == 0:
-                self._stop_clean()
+        key = (name, ctx.company_id)
+        with self._released:
+            for record in self.idle.pop(key, []):
+                self._disconnect(record['handler'])
+            # handlers which are in use will be disconnected on release
+            for record in self.leased.get(key, {}).values():
+                record['discard'] = True
+            self._released.notify_all()
 
     def _clean(self) -> None:
         """ worker that delete from cache handlers that was not in use for ttl
         """
         while self._stop_event.wait(timeout=3) is False:
-            with self._lock:
-                for key in list(self.handlers.keys()):
-                    if (
-                        self.handlers[key]['expired_at'] < time()
-                        and sys.getrefcount(self.handlers[key]) == 2    # returned ref count is always 1 higher
-                    ):
-                        try:
-                            self.handlers[key].disconnect()
-                        except Exception:
-                            pass
-                        del self.handlers[key]
-                if len(self.handlers) == 0:
+            with self._released:
+                # return handlers of finished threads
+                for leased in list(self.leased.values()):
+                    for thread_id, record in list(leased.items()):
+                        if not record['thread'].is_alive():
+                            self.release(thread_id)
+
+                for key, idle in self.idle.items():
+                    expired_count = len([
+                        record for record in idle
+                        if record['released_at'] + self.ttl < time()
+                    ])
+                    # the oldest are in the beginning of the list
+                    expired_count = min(expired_count, len(idle) - self.min_size)
+                    for record in idle[:max(expired_count, 0)]:
+                        self._disconnect(record['handler'])
+                    del idle[:max(expired_count, 0)]
+
+                if sum(len(x) for x in self.idle.values()) + sum(len(x) for x in self.leased.values()) == 0:
                     self._stop_event.set()
 
 
+class HandlerModules(dict):
+    """ Modules of handlers. Module of handler from manifest is imported on first access to it
+    """
+
+    def __init__(self, import_handler):
+        super().__init__()
+        self._import_handler = import_handler
+
+    def __missing__(self, name):
+        module = self._import_handler(name)
+        if module is None:
+            raise KeyError(name)
+        return module
+
+    def get(self, name, default=None):
+        try:
+            return self[name]
+        except KeyError:
+            return default
+
+    def __contains__(self, name):
+        return self.get(name) is not None
+
+
 class IntegrationController:
     @staticmethod
     def _is_not_empty_str(s):
@@ -174,8 +352,7 @@ class IntegrationController:
             "%s: add method calling name=%s, engine=%s, connection_args=%s, company_id=%s",
             self.__class__.__name__, name, engine, connection_args, ctx.company_id
         )
-        handlers_meta = self.get_handlers_import_status()
-        handler_meta = handlers_meta[engine]
+        handler_meta = self.get_handler_meta(engine)
         accept_connection_args = handler_meta.get('connection_args')
         logger.debug("%s: accept_connection_args - %s", self.__class__.__name__, accept_connection_args)
 
@@ -206,6 +383,10 @@ class IntegrationController:
 
     def modify(self, name, data):
         self.handlers_cache.delete(name)
+        schema_cache = get_schema_cache()
+        if schema_cache is not None:
+            # connection can point to other database now
+            schema_cache.invalidate(name)
         integration_record = db.session.query(db.Integration).filter_by(
             company_id=ctx.company_id, name=name
         ).first()
@@ -388,7 +569,7 @@ class IntegrationController:
             Returns:
                 Handler object
         """
-        handler_meta = self.handlers_import_status[handler_type]
+        handler_meta = self.get_handler_meta(handler_type)
         if not handler_meta["import"]["success"]:
             logger.info(f"to use {handler_type} please install 'pip install mindsdb[{handler_type}]'")
 
@@ -428,11 +609,35 @@ class IntegrationController:
         storage_to.folder_sync(root_path)
 
     @profiler.profile()
-    def get_handler(self, name, case_sensitive=False):
+    def get_handler(self, name, case_sensitive=False, pooled=True):
+        """ get data handler of integration
+
+            Args:
+                name (str): name of integration
+                case_sensitive (bool): search integration by name in case sensitive mode
+                pooled (bool): take handler from the pool. Handler is leased by current thread
+                    until `release_handlers` is called. Not pooled handler is created for long-living
+                    threads (chatbots, triggers), it is not shared and has to be disconnected by caller
+        """
+        if not pooled:
+            return self._create_handler(name, case_sensitive, pooled=False)
+
         handler = self.handlers_cache.get(name)
         if handler is not None:
             return handler
 
+        try:
+            return self._create_handler(name, case_sensitive)
+        finally:
+            # if handler was not added to cache
+            self.handlers_cache.unreserve(name)
+
+    def release_handlers(self):
+        """ return handlers used by current thread to pool, must be called at the end of the request
+        """
+        self.handlers_cache.release()
+
+    def _create_handler(self, name, case_sensitive=False, pooled=True):
         if case_sensitive:
             integration_record = db.session.query(db.Integration).filter_by(company_id=ctx.company_id, name=name).first()
         else:
@@ -452,7 +657,7 @@ class IntegrationController:
         if integration_engine not in self.handler_modules:
             raise Exception(f"Can't find handler for '{integration_name}' ({integration_engine})")
 
-        integration_meta = self.handlers_import_status[integration_engine]
+        integration_meta = self.get_handler_meta(integration_engine)
         if integration_meta["import"]["success"] is False:
             msg = dedent(f'''\
                 Handler '{integration_engine}' cannot be used. Reason is:
@@ -512,7 +717,8 @@ class IntegrationController:
             logger.info("%s.get_handler: create a client to db service of %s type, args - %s", self.__class__.__name__, integration_engine, handler_ars)
             handler = HandlerClass(**handler_ars)
             # handler = DBClient(integration_engine, HandlerClass, **handler_ars)
-            self.handlers_cache.set(handler)
+            if pooled:
+                self.handlers_cache.set(handler)
 
         return handler
 
@@ -611,20 +817,76 @@ class IntegrationController:
         return handler_meta
 
     def _load_handler_modules(self):
-        mindsdb_path = Path(importlib.util.find_spec('mindsdb').origin).parent
-        handlers_path = mindsdb_path.joinpath('integrations/handlers')
-
-        # edge case: running from tests directory, find_spec finds the base folder instead of actual package
-        if not os.path.isdir(handlers_path):
-            mindsdb_path = Path(importlib.util.find_spec('mindsdb').origin).parent.joinpath('mindsdb')
-            handlers_path = mindsdb_path.joinpath('integrations/handlers')
+        handlers_path = get_handlers_path()
 
-        self.handler_modules = {}
+        self.handler_modules = HandlerModules(self._import_handler_by_name)
         self.handlers_import_status = {}
-        for handler_dir in handlers_path.iterdir():
-            if handler_dir.is_dir() is False or handler_dir.name.startswith('__'):
-                continue
-            self.import_handler('mindsdb.integrations.handlers.', handler_dir)
+        # handlers from manifest which are not imported yet: name -> folder
+        self._not_imported_handlers = {}
+        self._import_lock = threading.RLock()
+
+        manifest = load_manifest(handlers_path) or {}
+        manifest_folders = {meta['folder']: meta for meta in manifest.values()}
+        for handler_dir in get_handlers_dirs(handlers_path):
+            handler_meta = manifest_folders.get(handler_dir.name)
+            if handler_meta is None:
+                self.import_handler('mindsdb.integrations.handlers.', handler_dir)
+            else:
+                self._add_manifest_handler(handler_dir, handler_meta)
+
+    def _add_manifest_handler(self, handler_dir: Path, manifest_meta: dict):
+        handler_meta = deepcopy(manifest_meta)
+        folder = handler_meta.pop('folder')
+        dependencies = handler_meta.pop('dependencies', [])
+        # handler is not imported yet: result of import is expected by installed dependencies
+        missing_dependencies = get_missing_dependencies(dependencies)
+        handler_meta['import'] = {
+            'success': len(missing_dependencies) == 0,
+            'folder': folder,
+            'dependencies': dependencies
+        }
+        if len(missing_dependencies) > 0:
+            handler_meta['import']['error_message'] = (
+                f"Dependencies are not installed: {', '.join(missing_dependencies)}"
+            )
+        if 'icon' in handler_meta:
+            try:
+                icon_path = handler_dir.joinpath(handler_meta['icon']['name'])
+                if handler_meta['icon']['type'] == 'svg':
+                    with open(str(icon_path), 'rt') as f:
+                        handler_meta['icon']['data'] = f.read()
+                else:
+                    with open(str(icon_path), 'rb') as f:
+                        handler_meta['icon']['data'] = base64.b64encode(f.read()).decode('utf-8')
+            except OSError as e:
+                logger.debug(f"Can't read icon of handler {folder}: {e}")
+        self.handlers_import_status[handler_meta['name']] = handler_meta
+        self._not_imported_handlers[handler_meta['name']] = handler_dir
+
+    def _import_handler_by_name(self, name: str):
+        """ import module of handler from manifest
+
+            Returns:
+                module or None if handler is unknown or can't be imported
+        """
+        with self._import_lock:
+            handler_dir = self._not_imported_handlers.pop(name, None)
+            if handler_dir is not None:
+                self.import_handler('mindsdb.integrations.handlers.', handler_dir)
+            return dict.get(self.handler_modules, name)
+
+    def get_handler_meta(self, name: str) -> Optional[dict]:
+        """ metadata of handler with result of its import
+
+            Args:
+                name (str): name of handler
+
+            Returns:
+                dict or None if there is no such handler
+        """
+        if name in self._not_imported_handlers:
+            self._import_handler_by_name(name)
+        return self.handlers_import_status.get(name)
 
     def import_handler(self, base_import: str, handler_dir: Path):
         handler_folder_name = str(handler_dir.name)
@@ -0,0 +1,155 @@
+"""
+Cache of tables and columns of integrations.
+
+information_schema.TABLES, information_schema.COLUMNS and GetTableColumns step read
+metadata of integrations through this cache instead of requesting the database on every
+query. Cached metadata of integration is invalidated when these changes are made through mindsdb:
+- table or database is created or dropped
+- parameters of database are changed
+- native query without result (it can be DDL) is executed in database
+Changes which are made in the database outside of mindsdb are visible after 'ttl'.
+
+It is enabled in mindsdb config:
+
+    "schema_cache": {
+        "enabled": true,
+        "ttl": 300,
+        "refresh_ttl": 60
+    }
+
+- ttl - time in seconds after which metadata is fetched again
+- refresh_ttl - metadata which is older than this is returned from cache and refreshed
+  in background, null - no background refresh
+"""
+
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+from mindsdb.interfaces.storage import db
+from mindsdb.utilities.config import Config
+from mindsdb.utilities.context import context as ctx
+from mindsdb.utilities import log
+
+logger = log.getLogger(__name__)
+
+
+class SchemaCache:
+    def __init__(self, ttl: int = 300, refresh_ttl: Optional[int] = None):
+        self.ttl = ttl
+        self.refresh_ttl = refresh_ttl
+        # (company_id, integration_name, kind, table_name) -> (created_at, value)
+        self._records = {}
+        # (company_id, integration_name) -> version, is changed on invalidation
+        self._versions = {}
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._executor = None
+
+    @staticmethod
+    def _key(integration_name: str, kind: str, table_name: str = None) -> tuple:
+        if table_name is not None:
+            table_name = table_name.lower()
+        return (ctx.company_id, integration_name.lower(), kind, table_name)
+
+    def get_tables(self, integration_name: str, fetch_fn: Callable) -> list:
+        """ list of tables of integration
+
+            Args:
+                integration_name (str): name of integration
+                fetch_fn (Callable): function to get list of tables from integration
+        """
+        return self._get(self._key(integration_name, 'tables'), fetch_fn)
+
+    def get_columns(self, integration_name: str, table_name: str, fetch_fn: Callable) -> list:
+        """ list of columns of the table of integration
+
+            Args:
+                integration_name (str): name of integration
+                table_name (str): name of table
+                fetch_fn (Callable): function to get list of columns from integration
+        """
+        return self._get(self._key(integration_name, 'columns', table_name), fetch_fn)
+
+    def invalidate(self, integration_name: str):
+        """ remove cached metadata of integration
+        """
+        company_id = ctx.company_id
+        integration_name = integration_name.lower()
+        with self._lock:
+            version_key = (company_id, integration_name)
+            self._versions[version_key] = self._versions.get(version_key, 0) + 1
+            for key in list(self._records.keys()):
+                if key[:2] == version_key:
+                    del self._records[key]
+
+    def _get_version(self, key: tuple) -> int:
+        return self._versions.get(key[:2], 0)
+
+    def _set(self, key: tuple, value: list, version: int):
+        with self._lock:
+            # metadata was invalidated while it was fetched
+            if self._get_version(key) != version:
+                return
+            self._records[key] = (time.time(), value)
+
+    def _get(self, key: tuple, fetch_fn: Callable) -> list:
+        with self._lock:
+            record = self._records.get(key)
+            version = self._get_version(key)
+
+        if record is not None:
+            created_at, value = record
+            age = time.time() - created_at
+            if age < self.ttl:
+                if self.refresh_ttl is not None and age >= self.refresh_ttl:
+                    self._refresh(key, fetch_fn, version)
+                return list(value)
+
+        value = fetch_fn()
+        self._set(key, value, version)
+        return list(value)
+
+    def _refresh(self, key: tuple, fetch_fn: Callable, version: int):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='schema_cache')
+        self._executor.submit(self._refresh_worker, key, fetch_fn, version, ctx.dump())
+
+    def _refresh_worker(self, key: tuple, fetch_fn: Callable, version: int, ctx_dump: dict):
+        from mindsdb.interfaces.database.integrations import integration_controller
+
+        try:
+            ctx.load(ctx_dump)
+            self._set(key, fetch_fn(), version)
+        except Exception as e:
+            logger.warning(f"Can't refresh metadata of '{key[1]}': {e}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+            integration_controller.release_handlers()
+            db.session.remove()
+
+
+_schema_cache = None
+_schema_cache_lock = threading.Lock()
+
+
+def get_schema_cache() -> Optional[SchemaCache]:
+    """ Cache from config or None if cache is disabled
+    """
+    global _schema_cache
+    config = Config().get('schema_cache', {})
+    if not config.get('enabled', False):
+        return None
+    with _schema_cache_lock:
+        if _schema_cache is None:
+            _schema_cache = SchemaCache(
+                ttl=config.get('ttl', 300),
+                refresh_ttl=config.get('refresh_ttl')
+            )
+    return _schema_cache
@@ -1,7 +1,9 @@
 import json
 import os
 import shutil
+import tempfile
 from pathlib import Path
+from typing import Optional
 
 from mindsdb.integrations.handlers.file_handler import Handler as FileHandler
 from mindsdb.interfaces.storage import db
@@ -12,6 +14,17 @@ from mindsdb.utilities.context import context as ctx
 
 logger = log.getLogger(__name__)
 
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+# parsed content of the file, is stored in the folder of the file
+PARQUET_FILE_NAME = ".data.parquet"
+# count of rows in parquet row group: row groups which don't match the filter are not read
+PARQUET_ROW_GROUP_SIZE = 100000
+
 
 class FileController:
     def __init__(self):
@@ -81,10 +94,15 @@ class FileController:
             file_name = Path(file_path).name
 
         file_dir = None
+        parquet_tmp_path = None
         try:
-            df, _col_map = FileHandler._handle_source(file_path)
-
-            ds_meta = {"row_count": len(df), "column_names": list(df.columns)}
+            df = None
+            fd, parquet_tmp_path = tempfile.mkstemp(prefix="mindsdb_file_", suffix=".parquet")
+            os.close(fd)
+            ds_meta = self._stream_to_parquet(file_path, parquet_tmp_path)
+            if ds_meta is None:
+                df, _col_map = FileHandler._handle_source(file_path)
+                ds_meta = {"row_count": len(df), "column_names": list(df.columns)}
 
             file_record = db.File(
                 name=name,
@@ -105,6 +123,10 @@ class FileController:
             source = file_dir.joinpath(file_name)
             # NOTE may be delay between db record exists and file is really in folder
             shutil.move(file_path, str(source))
+            if df is None:
+                shutil.move(parquet_tmp_path, str(file_dir.joinpath(PARQUET_FILE_NAME)))
+            else:
+                self._save_parquet(df, file_dir.joinpath(PARQUET_FILE_NAME))
 
             self.fs_store.put(store_file_path, base_dir=self.dir)
         except Exception as e:
@@ -113,6 +135,8 @@ class FileController:
         finally:
             if file_dir is not None:
                 shutil.rmtree(file_dir)
+            if parquet_tmp_path is not None and os.path.exists(parquet_tmp_path):
+                os.remove(parquet_tmp_path)
 
         return file_record.id
 
@@ -130,7 +154,65 @@ class FileController:
         self.fs_store.delete(f"file_{ctx.company_id}_{file_id}")
         return True
 
-    def get_file_path(self, name):
+    @staticmethod
+    def _stream_to_parquet(file_path: str, parquet_path: str) -> Optional[dict]:
+        """ Convert csv file to parquet by chunks, the whole file is not loaded to memory
+
+            Returns:
+                dict: row_count and column_names of the file,
+                    or None if the file can't be converted by chunks
+        """
+        if pa is None:
+            return None
+        sniff_result = FileHandler._sniff_csv(file_path)
+        if sniff_result is None:
+            return None
+        dialect, encoding = sniff_result
+
+        row_count = 0
+        column_names = None
+        writer = None
+        try:
+            for batch in FileHandler._read_csv_batches(file_path, dialect, encoding):
+                if writer is None:
+                    column_names = batch.schema.names
+                    writer = pq.ParquetWriter(parquet_path, batch.schema)
+                writer.write_batch(batch, row_group_size=PARQUET_ROW_GROUP_SIZE)
+                row_count += batch.num_rows
+        except (pa.ArrowException, ValueError, LookupError) as e:
+            # LookupError - encoding is not supported
+            logger.info(f"Can't read file by chunks, it will be loaded to memory: {e}")
+            return None
+        finally:
+            if writer is not None:
+                writer.close()
+
+        if writer is None:
+            # no rows in file
+            return None
+        return {"row_count": row_count, "column_names": column_names}
+
+    @staticmethod
+    def _save_parquet(df, path: Path) -> bool:
+        """ Save parsed content of the file in parquet format
+
+            Returns:
+                bool: False if DataFrame can't be stored in parquet
+        """
+        if pa is None:
+            return False
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+        except (pa.ArrowException, TypeError, ValueError) as e:
+            logger.debug(f"Can't convert file to parquet: {e}")
+            return False
+        if any(pa.types.is_nested(field.type) for field in table.schema):
+            # values of nested columns have to be returned as is
+            return False
+        pq.write_table(table, str(path), row_group_size=PARQUET_ROW_GROUP_SIZE)
+        return True
+
+    def _get_file_dir(self, name) -> tuple:
         file_record = (
             db.session.query(db.File)
             .filter_by(company_id=ctx.company_id, name=name)
@@ -140,8 +222,20 @@ class FileController:
             raise Exception(f"File '{name}' does not exists")
         file_dir = f"file_{ctx.company_id}_{file_record.id}"
         self.fs_store.get(file_dir, base_dir=self.dir)
-        return str(
-            Path(self.dir)
-            .joinpath(file_dir)
-            .joinpath(Path(file_record.source_file_path).name)
-        )
+        return Path(self.dir).joinpath(file_dir), file_record
+
+    def get_file_path(self, name):
+        file_dir, file_record = self._get_file_dir(name)
+        return str(file_dir.joinpath(Path(file_record.source_file_path).name))
+
+    def get_file_parquet_path(self, name) -> Optional[str]:
+        """ Path to parsed content of the file in parquet format
+
+            Returns:
+                str or None if the file was not converted to parquet
+        """
+        file_dir, _ = self._get_file_dir(name)
+        parquet_path = file_dir.joinpath(PARQUET_FILE_NAME)
+        if not parquet_path.is_file():
+            return None
+        return str(parquet_path)
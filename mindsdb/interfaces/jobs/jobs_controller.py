@@ -249,6 +249,14 @@ class JobsExecutor:
 
         return query.all()
 
+    def get_next_run_at(self):
+        # time of the next run of jobs which are planned in future
+        return db.session.query(sa.func.min(db.Jobs.next_run_at)).filter(
+            db.Jobs.next_run_at > dt.datetime.now(),
+            db.Jobs.deleted_at == sa.null(),
+            db.Jobs.active == True,  # noqa
+        ).scalar()
+
     def update_task_schedule(self, record):
         # calculate next run
 
@@ -1,9 +1,13 @@
 import datetime as dt
-import queue
+import heapq
 import random
 import threading
-import time
+import concurrent.futures
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 
+from mindsdb.interfaces.database.integrations import integration_controller
 from mindsdb.interfaces.jobs.jobs_controller import JobsExecutor
 from mindsdb.interfaces.storage import db
 from mindsdb.utilities import log
@@ -12,75 +16,160 @@ from mindsdb.utilities.config import Config
 logger = log.getLogger(__name__)
 
 
-def execute_async(q_in, q_out):
-
-    while True:
-        task = q_in.get()
-
-        if task["type"] != "task":
-            return
-
-        record_id = task["record_id"]
-        history_id = task["history_id"]
-
-        executor = JobsExecutor()
-        try:
-            executor.execute_task_local(record_id, history_id)
-        except (KeyboardInterrupt, SystemExit):
-            q_out.put(True)
-            raise
-
-        except Exception:
-            db.session.rollback()
-
-        q_out.put(True)
+def execute_async(record_id, history_id):
+    executor = JobsExecutor()
+    try:
+        executor.execute_task_local(record_id, history_id)
+    except Exception as e:
+        logger.error(f"Job {record_id} failed: {e}")
+        db.session.rollback()
+    finally:
+        integration_controller.release_handlers()
+        db.session.remove()
 
 
 class Scheduler:
     def __init__(self, config=None):
         self.config = config
 
-        self.q_in = queue.Queue()
-        self.q_out = queue.Queue()
-        self.work_thread = threading.Thread(
-            target=execute_async, args=(self.q_in, self.q_out)
-        )
-        self.work_thread.start()
+        # due tasks waiting for a free worker: (next_run_at, record_id, company_id)
+        self._queue = []
+        self._queued = set()
+        # record_id -> (company_id, history_id, future)
+        self._running = {}
+        self._company_running = defaultdict(int)
+        self._lock = threading.Lock()
+
+        self._pool = None
+        self._heartbeat_thread = None
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
 
     def __del__(self):
         self.stop_thread()
 
+    def _get_jobs_config(self) -> dict:
+        if self.config is None:
+            return {}
+        return self.config.get("jobs", {})
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            jobs_config = self._get_jobs_config()
+            self._pool = ThreadPoolExecutor(
+                max_workers=jobs_config.get("max_workers", 4),
+                thread_name_prefix="job"
+            )
+            self._heartbeat_thread = threading.Thread(
+                target=self.heartbeat,
+                args=(jobs_config.get("heartbeat_interval", 3),),
+                name="job_heartbeat",
+                daemon=True
+            )
+            self._heartbeat_thread.start()
+        return self._pool
+
     def stop_thread(self):
-        self.q_in.put({"type": "exit"})
+        self._stop.set()
+        self._wakeup.set()
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._heartbeat_thread.join()
+
+    def heartbeat(self, interval):
+        # update last date of running tasks, to show other instances that tasks are not stuck
+        while not self._stop.wait(interval):
+            with self._lock:
+                history_ids = [history_id for _, history_id, _ in self._running.values()]
+            if len(history_ids) == 0:
+                continue
+            try:
+                db.session.query(db.JobsHistory).filter(
+                    db.JobsHistory.id.in_(history_ids)
+                ).update({"updated_at": dt.datetime.now()}, synchronize_session=False)
+                db.session.commit()
+            except Exception as e:
+                logger.error(f"Unable to update jobs history: {e}")
+                db.session.rollback()
+        db.session.remove()
 
     def scheduler_monitor(self):
-        check_interval = self.config.get("jobs", {}).get("check_interval", 30)
+        check_interval = self._get_jobs_config().get("check_interval", 30)
 
-        while True:
+        while not self._stop.is_set():
 
             logger.debug("Scheduler check timetable")
+            timeout = check_interval
             try:
-                self.check_timetable()
+                self.check_timetable(wait=False)
+
+                next_run_at = JobsExecutor().get_next_run_at()
+                db.session.remove()
+                if next_run_at is not None:
+                    timeout = min(timeout, (next_run_at - dt.datetime.now()).total_seconds())
             except (SystemExit, KeyboardInterrupt):
                 raise
             except Exception as e:
                 logger.error(e)
 
             # different instances should start in not the same time
+            timeout = max(timeout, 0) + random.random()
 
-            time.sleep(check_interval + random.randint(1, 10))
+            # wake up at the time of the next job or when a worker is released
+            self._wakeup.wait(timeout)
+            self._wakeup.clear()
 
-    def check_timetable(self):
+    def check_timetable(self, wait=True):
+        """ Start jobs which have to be run
+
+            Args:
+                wait (bool): wait until all started jobs are finished
+        """
         executor = JobsExecutor()
 
-        exec_method = self.config.get("jobs", {}).get("executor", "local")
+        exec_method = self._get_jobs_config().get("executor", "local")
 
         for record in executor.get_next_tasks():
-            logger.info(f"Job execute: {record.name}({record.id})")
-            self.execute_task(record.id, exec_method)
+            with self._lock:
+                if record.id in self._running or record.id in self._queued:
+                    continue
+            heapq.heappush(self._queue, (record.next_run_at, record.id, record.company_id))
+            self._queued.add(record.id)
+
+        self._dispatch(exec_method)
+
+        if wait:
+            while True:
+                with self._lock:
+                    futures = [future for _, _, future in self._running.values()]
+                if len(futures) == 0 and len(self._queue) == 0:
+                    break
+                concurrent.futures.wait(futures, return_when=concurrent.futures.FIRST_COMPLETED)
+                self._dispatch(exec_method)
 
         db.session.remove()
 
+    def _dispatch(self, exec_method):
+        # start queued tasks in order of next_run_at, with respect to limits
+        jobs_config = self._get_jobs_config()
+        max_workers = jobs_config.get("max_workers", 4)
+        max_company_workers = jobs_config.get("max_company_workers", 2)
+
+        deferred = []
+        while len(self._queue) > 0:
+            with self._lock:
+                if len(self._running) >= max_workers:
+                    break
+                item = heapq.heappop(self._queue)
+                if self._company_running.get(item[2], 0) >= max_company_workers:
+                    deferred.append(item)
+                    continue
+            self._queued.discard(item[1])
+            self.execute_task(item[1], exec_method)
+
+        for item in deferred:
+            heapq.heappush(self._queue, item)
+
     def execute_task(self, record_id, exec_method):
 
         executor = JobsExecutor()
@@ -91,30 +180,28 @@ class Scheduler:
                 logger.info(f"Unable create history record for {record_id}, is locked?")
                 return
 
-            # run in thread
-
-            self.q_in.put(
-                {
-                    "type": "task",
-                    "record_id": record_id,
-                    "history_id": history_id,
-                }
-            )
+            record = db.Jobs.query.get(record_id)
+            logger.info(f"Job execute: {record.name}({record.id})")
 
-            while True:
-                try:
-                    self.q_out.get(timeout=3)
-                    break
-                except queue.Empty:
-                    # update last date:
-                    history_record = db.JobsHistory.query.get(history_id)
-                    history_record.updated_at = dt.datetime.now()
-                    db.session.commit()
+            # run in thread
+            with self._lock:
+                future = self._get_pool().submit(execute_async, record_id, history_id)
+                self._running[record_id] = (record.company_id, history_id, future)
+                self._company_running[record.company_id] += 1
+            future.add_done_callback(partial(self._task_done, record_id))
 
         else:
             # TODO add microservice mode
             raise NotImplementedError()
 
+    def _task_done(self, record_id, future):
+        with self._lock:
+            company_id, _, _ = self._running.pop(record_id)
+            self._company_running[company_id] -= 1
+            if self._company_running[company_id] == 0:
+                del self._company_running[company_id]
+        self._wakeup.set()
+
     def start(self):
 
         config = Config()
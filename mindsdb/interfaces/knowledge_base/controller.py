@@ -1,6 +1,10 @@
 import copy
-from typing import List
+import time
+import threading
+from collections import OrderedDict
+from typing import Dict, List
 
+import numpy as np
 import pandas as pd
 
 import mindsdb_sql.planner.utils as utils
@@ -11,13 +15,49 @@ from mindsdb_sql.parser.ast import (
     Select,
     Update,
     Delete,
-    Star
+    Star,
+    Tuple
 )
 
 import mindsdb.interfaces.storage.db as db
-from mindsdb.integrations.libs.vectordatabase_handler import TableField
+from mindsdb.integrations.libs.vectordatabase_handler import TableField, to_vector
+from mindsdb.utilities.config import Config
+from mindsdb.utilities.embedding_cache import model_namespace
 from mindsdb.utilities.exception import EntityExistsError, EntityNotExistsError
 
+DEFAULT_SEARCH_LIMIT = 10
+
+# embeddings of query texts in LRU order: (model id, fingerprint of model, text) -> vector
+QUERY_EMBEDDINGS_CACHE_SIZE = 1000
+_query_embeddings = OrderedDict()
+_query_embeddings_lock = threading.Lock()
+
+# description of embedding models in LRU order: model id -> (created_at, dict)
+# it is read again after ttl to get changes made by other processes
+EMBEDDING_MODELS_CACHE_SIZE = 100
+EMBEDDING_MODELS_CACHE_TTL = 60
+_embedding_models = OrderedDict()
+_embedding_models_lock = threading.Lock()
+
+# column of result of 'content in (...)' search with the question which the row was found by
+QUESTION_COLUMN = 'question'
+
+
+def invalidate_embedding_model(model_id: int = None):
+    """ Remove cached description and query embeddings of embedding model, or of all models if id is not set
+    """
+    with _embedding_models_lock:
+        if model_id is None:
+            _embedding_models.clear()
+        else:
+            _embedding_models.pop(model_id, None)
+    with _query_embeddings_lock:
+        if model_id is None:
+            _query_embeddings.clear()
+        else:
+            for key in [key for key in _query_embeddings if key[0] == model_id]:
+                del _query_embeddings[key]
+
 
 class KnowledgeBaseTable:
     """
@@ -39,8 +79,7 @@ class KnowledgeBaseTable:
         """
 
         # replace content with embeddings
-
-        utils.query_traversal(query.where, self._replace_query_content)
+        questions = self._replace_select_content(query)
 
         # set table name
         query.from_table = Identifier(parts=[self._kb.vector_database_table])
@@ -58,11 +97,95 @@ class KnowledgeBaseTable:
                 targets.append(target)
         query.targets = targets
 
+        if questions is not None:
+            return self._search_many(query, questions)
+
         # send to vectordb
         db_handler = self._get_vector_db()
         resp = db_handler.query(query)
         return resp.data_frame
 
+    def _replace_select_content(self, query: Select):
+        """
+        Replaces content conditions with embeddings, all texts are embedded at once.
+        :return: unique texts of condition 'content in (...)' with their embeddings if it is in query
+        """
+        nodes = []
+
+        def find_content(node, **kwargs):
+            if (
+                isinstance(node, BinaryOperation)
+                and isinstance(node.args[0], Identifier)
+                and node.args[0].parts[-1].lower() == TableField.CONTENT.value
+            ):
+                if isinstance(node.args[1], Constant) and node.op == '=':
+                    nodes.append(node)
+                elif isinstance(node.args[1], Tuple) and node.op.lower() == 'in':
+                    nodes.append(node)
+
+        utils.query_traversal(query.where, find_content)
+
+        contents = []
+        for node in nodes:
+            if isinstance(node.args[1], Tuple):
+                contents.append([item.value for item in node.args[1].items])
+            else:
+                contents.append([node.args[1].value])
+        if len([node for node in nodes if isinstance(node.args[1], Tuple)]) > 1:
+            raise ValueError('Only one condition "content in (...)" is supported')
+
+        vectors = self._contents_to_embeddings([content for items in contents for content in items])
+
+        questions = None
+        for node, items in zip(nodes, contents):
+            node_vectors, vectors = vectors[:len(items)], vectors[len(items):]
+            if isinstance(node.args[1], Tuple):
+                questions = dict(zip(items, node_vectors))
+                if len(items) == 0:
+                    continue
+                # the condition is used only to parse the rest of conditions
+                node.op = '='
+            node.args[0].parts = [TableField.EMBEDDINGS.value]
+            node.args[1] = Constant([node_vectors[0].tolist()])
+        return questions
+
+    def _search_many(self, query: Select, questions: Dict[str, np.ndarray]) -> pd.DataFrame:
+        """
+        Search of rows which are close to the texts of 'content in (...)' condition.
+        All vectors are sent to vector db in one search request.
+        Limit and offset are applied to the rows of every text, the text is returned in 'question' column
+        """
+        columns = [QUESTION_COLUMN] + [target.parts[-1] for target in query.targets]
+        if len(questions) == 0:
+            return pd.DataFrame([], columns=columns)
+
+        db_handler = self._get_vector_db()
+
+        conditions = [
+            condition
+            for condition in db_handler._extract_conditions(query.where) or []
+            if condition.column != TableField.EMBEDDINGS.value
+        ]
+        limit = query.limit.value if query.limit is not None else DEFAULT_SEARCH_LIMIT
+        offset = query.offset.value if query.offset is not None else 0
+        results = db_handler.search(
+            self._kb.vector_database_table,
+            np.stack(list(questions.values())),
+            limit=limit + offset,
+            conditions=conditions
+        )
+
+        dfs = []
+        for question, df in zip(questions.keys(), results):
+            if TableField.DISTANCE.value in df.columns:
+                df = df.sort_values(TableField.DISTANCE.value, kind='stable')
+            df = df.drop_duplicates(TableField.ID.value).iloc[offset: offset + limit]
+            dfs.append(df.assign(**{QUESTION_COLUMN: question}))
+        df = pd.concat(dfs, ignore_index=True)
+        if TableField.DISTANCE.value in df.columns:
+            columns.append(TableField.DISTANCE.value)
+        return df[columns]
+
     def update_query(self, query: Update):
         """
         Handles update query to KB table.
@@ -77,6 +200,8 @@ class KnowledgeBaseTable:
         cont_col = TableField.CONTENT.value
         if cont_col in query.update_columns:
             content = query.update_columns[cont_col]
+            if isinstance(content, Constant):
+                content = content.value
             query.update_columns[emb_col] = Constant(self._content_to_embeddings(content))
 
         # TODO search content in where clause?
@@ -147,6 +272,43 @@ class KnowledgeBaseTable:
             self._vector_db = self.session.integration_controller.get_handler(database_name)
         return self._vector_db
 
+    def _get_embedding_model(self) -> dict:
+        """
+        Returns description of embedding model of KB, it is cached by model id
+        """
+        model_id = self._kb.embedding_model_id
+        model = None
+        with _embedding_models_lock:
+            record = _embedding_models.get(model_id)
+            if record is not None and time.time() - record[0] < EMBEDDING_MODELS_CACHE_TTL:
+                _embedding_models.move_to_end(model_id)
+                model = record[1]
+        if model is None:
+            model_rec = db.session.query(db.Predictor).filter_by(id=model_id).first()
+
+            assert model_rec is not None, f"Model not found: {model_id}"
+            model_project = db.session.query(db.Project).filter_by(id=model_rec.project_id).first()
+
+            model = {
+                'name': model_rec.name,
+                'project_name': model_project.name,
+                'target': model_rec.to_predict[0],
+                # TODO adjust input
+                'input_column': model_rec.learn_args.get('using', {}).get('question_column'),
+                # it is changed if the model is changed or id of dropped model is given to a new model
+                'fingerprint': model_namespace(model_id, {
+                    'learn_args': model_rec.learn_args,
+                    'version': model_rec.version,
+                    'training_stop_at': model_rec.training_stop_at,
+                }),
+            }
+            with _embedding_models_lock:
+                _embedding_models[model_id] = (time.time(), model)
+                _embedding_models.move_to_end(model_id)
+                while len(_embedding_models) > EMBEDDING_MODELS_CACHE_SIZE:
+                    _embedding_models.popitem(last=False)
+        return model
+
     def _df_to_embeddings(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Returns embeddings for input dataframe.
@@ -156,17 +318,11 @@ class KnowledgeBaseTable:
         :return: dataframe with embeddings
         """
 
-        model_id = self._kb.embedding_model_id
-        # get the input columns
-        model_rec = db.session.query(db.Predictor).filter_by(id=model_id).first()
-
-        assert model_rec is not None, f"Model not found: {model_id}"
-        model_project = db.session.query(db.Project).filter_by(id=model_rec.project_id).first()
+        model = self._get_embedding_model()
 
-        project_datanode = self.session.datahub.get(model_project.name)
+        project_datanode = self.session.datahub.get(model['project_name'])
 
-        # TODO adjust input
-        input_col = model_rec.learn_args.get('using', {}).get('question_column')
+        input_col = model['input_column']
         if input_col is not None and input_col != TableField.CONTENT.value:
             df = df.rename(columns={TableField.CONTENT.value: input_col})
 
@@ -176,26 +332,55 @@ class KnowledgeBaseTable:
             data = df.to_dict('records')
 
             df_out = project_datanode.predict(
-                model_name=model_rec.name,
+                model_name=model['name'],
                 data=data,
             )
 
-            target = model_rec.to_predict[0]
-            if target != TableField.EMBEDDINGS.value:
-                # adapt output for vectordb
-                df_out = df_out.rename(columns={target: TableField.EMBEDDINGS.value})
+            # embeddings are sent to vector db as float32 arrays
+            df_out = pd.DataFrame(
+                {TableField.EMBEDDINGS.value: [to_vector(vector) for vector in df_out[model['target']]]},
+                index=df.index
+            )
 
         return df_out
 
+    def _contents_to_embeddings(self, contents: List[str]) -> List[np.ndarray]:
+        """
+        Converts strings to embeddings.
+        Embeddings of recent strings are taken from cache, the rest are embedded in one predict call
+        :param contents: input strings
+        :return: list of embeddings
+        """
+        model_id = self._kb.embedding_model_id
+        fingerprint = self._get_embedding_model()['fingerprint']
+        vectors = {}
+        with _query_embeddings_lock:
+            for content in contents:
+                key = (model_id, fingerprint, content)
+                if key in _query_embeddings:
+                    _query_embeddings.move_to_end(key)
+                    vectors[content] = _query_embeddings[key]
+
+        missing = [content for content in dict.fromkeys(contents) if content not in vectors]
+        if len(missing) > 0:
+            df = pd.DataFrame({TableField.CONTENT.value: missing})
+            embeddings = self._df_to_embeddings(df)[TableField.EMBEDDINGS.value]
+            with _query_embeddings_lock:
+                for content, vector in zip(missing, embeddings):
+                    vectors[content] = vector
+                    _query_embeddings[(model_id, fingerprint, content)] = vector
+                while len(_query_embeddings) > QUERY_EMBEDDINGS_CACHE_SIZE:
+                    _query_embeddings.popitem(last=False)
+
+        return [vectors[content] for content in contents]
+
     def _content_to_embeddings(self, content: str) -> List[float]:
         """
         Converts string to embeddings
         :param content: input string
         :return: embeddings
         """
-        df = pd.DataFrame([[content]], columns=[TableField.CONTENT.value])
-        res = self._df_to_embeddings(df)
-        return res[TableField.EMBEDDINGS.value][0]
+        return self._contents_to_embeddings([content])[0].tolist()
 
 
 class KnowledgeBaseController:
@@ -254,9 +439,9 @@ class KnowledgeBaseController:
 
         # search for the vector database table
         if storage is None:
-            # create chroma db with same name
+            # create vector db with same name
             vector_table_name = "default_collection"
-            vector_db_name = self._create_persistent_chroma(
+            vector_db_name = self._create_persistent_vector_db(
                 name
             )
         elif len(storage.parts) != 2:
@@ -283,8 +468,14 @@ class KnowledgeBaseController:
         db.session.commit()
         return kb
 
-    def _create_persistent_chroma(self, kb_name, engine="chromadb"):
-        """Create default vector database for knowledge base, if not specified"""
+    def _create_persistent_vector_db(self, kb_name, engine=None):
+        """
+        Create default vector database for knowledge base, if not specified.
+        Engine is built-in vector index, it can be changed in config:
+            "knowledge_bases": {"default_vector_store": "chromadb"}
+        """
+        if engine is None:
+            engine = Config().get('knowledge_bases', {}).get('default_vector_store', 'vector_index')
 
         vector_store_name = f"{kb_name}_{engine}"
 
@@ -227,8 +227,11 @@ class ModelController():
         if model_record is None:
             raise Exception(f"Model with name '{new_name}' already exists")
 
+        from mindsdb.interfaces.knowledge_base.controller import invalidate_embedding_model
+
         for model_record in get_model_records(name=old_name):
             model_record.name = new_name
+            invalidate_embedding_model(model_record.id)
         db.session.commit()
 
     @staticmethod
@@ -1,14 +1,18 @@
 import os
 import io
+import json
+import time
+import zlib
 import shutil
 import tarfile
 import hashlib
+from uuid import uuid4
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from abc import ABC, abstractmethod
 from typing import Union, Optional
 from dataclasses import dataclass
 from datetime import datetime
-import threading
 
 if os.name == 'posix':
     import fcntl
@@ -44,7 +48,18 @@ RESOURCE_GROUP = RESOURCE_GROUP()
 
 DIR_LOCK_FILE_NAME = 'dir.lock'
 DIR_LAST_MODIFIED_FILE_NAME = 'last_modified.txt'
-SERVICE_FILES_NAMES = (DIR_LOCK_FILE_NAME, DIR_LAST_MODIFIED_FILE_NAME)
+DIR_MANIFEST_FILE_NAME = 'store_manifest.json'
+SERVICE_FILES_NAMES = (DIR_LOCK_FILE_NAME, DIR_LAST_MODIFIED_FILE_NAME, DIR_MANIFEST_FILE_NAME)
+
+STORE_SUFFIX = '.store'
+STORE_MANIFEST_NAME = 'manifest.json'
+STORE_GARBAGE_NAME = 'garbage.json'
+COMPRESSED_CHUNK_SUFFIX = '.z'
+DEFAULT_CHUNK_SIZE = 16 * 1024 * 1024
+# seconds after which chunks which are not used anymore can be deleted
+DEFAULT_CHUNK_GRACE_PERIOD = 60 * 60
+# get is repeated if chunks of the manifest were deleted by concurrent put
+DOWNLOAD_ATTEMPTS = 3
 
 
 def copy(src, dst):
@@ -114,28 +129,411 @@ def get_dir_size(path: str):
     return total
 
 
-class LocalFSStore(BaseFSStore):
-    """Storage that stores files locally
+class ContentAddressedFSStore(BaseFSStore):
+    """Base class for storage that keeps resources as content-addressed chunks
+
+    Every file of resource is split to chunks, chunk is stored under sha256 of its content:
+    '{remote_name}.store/chunks/{sha256}'. Files of resource and their chunks are listed
+    in the manifest '{remote_name}.store/manifest.json'. Copy of the manifest is kept in the
+    local folder of resource, so only changed chunks are uploaded on put, and only changed
+    files are downloaded on get. Chunks are transferred in parallel.
+
+    Chunks which are not used by the new version are not deleted at once: concurrent put (from
+    other process or host) can publish a manifest which reuses them. They are marked with time in
+    '{remote_name}.store/garbage.json', and following puts delete marked chunks after grace period
+    if they are not used by the current manifest. Grace period has to be longer than any put.
+    Chunk which is marked and uploaded again is stored under a new id. Get which read the previous
+    manifest and doesn't find its chunks reads the new one and repeats the download.
+
+    Options in 'permanent_storage' section of config:
+    - chunk_size - max size of chunk in bytes, 16Mb by default
+    - compression_level - zlib compression level of chunks, 0 - chunks are not compressed
+    - max_workers - number of parallel transfers, 8 by default
+    - chunk_grace_period - seconds after which unused chunks are deleted, 1 hour by default
+
+    Resources which were stored in previous format (without manifest) are read in that format,
+    and converted to chunks on next put.
     """
 
+    default_compression_level = 1
+
     def __init__(self):
         super().__init__()
+        storage_config = self.config['permanent_storage']
+        self.chunk_size = storage_config.get('chunk_size', DEFAULT_CHUNK_SIZE)
+        self.compression_level = storage_config.get('compression_level', self.default_compression_level)
+        self.max_workers = storage_config.get('max_workers', 8)
+        self.chunk_grace_period = storage_config.get('chunk_grace_period', DEFAULT_CHUNK_GRACE_PERIOD)
+
+    @abstractmethod
+    def _read_object(self, key: str) -> Optional[bytes]:
+        """ content of the object, or None if it doesn't exist
+        """
+        pass
+
+    @abstractmethod
+    def _write_object(self, key: str, data: bytes):
+        pass
+
+    @abstractmethod
+    def _delete_objects(self, keys: list):
+        pass
+
+    @abstractmethod
+    def _get_legacy(self, local_name: str, base_dir: str):
+        """ copy resource which is stored without manifest
+        """
+        pass
+
+    @abstractmethod
+    def _delete_legacy(self, remote_name: str):
+        """ remove resource which is stored without manifest
+        """
+        pass
+
+    @staticmethod
+    def _store_key(remote_name: str, *parts: str) -> str:
+        return '/'.join((f'{remote_name}{STORE_SUFFIX}',) + parts)
 
+    @staticmethod
+    def _chunk_hash(chunk_id: str) -> str:
+        return chunk_id.split('.', 1)[0]
+
+    @staticmethod
+    def _get_chunk_ids(manifest: dict) -> set:
+        return set(
+            chunk_id
+            for file_meta in manifest['files'].values()
+            for chunk_id in file_meta['chunks']
+        )
+
+    def _read_manifest(self, remote_name: str) -> Optional[dict]:
+        data = self._read_object(self._store_key(remote_name, STORE_MANIFEST_NAME))
+        if data is None:
+            return None
+        return json.loads(data)
+
+    def _read_garbage(self, remote_name: str) -> dict:
+        """ Returns:
+                dict: id of chunk -> time when it was marked as unused
+        """
+        data = self._read_object(self._store_key(remote_name, STORE_GARBAGE_NAME))
+        if data is None:
+            return {}
+        return json.loads(data)
+
+    def _collect_garbage(self, remote_name: str, unused_chunks: set):
+        """ mark chunks which are not used anymore and delete ones which were marked before grace period
+        """
+        garbage = self._read_garbage(remote_name)
+        now = time.time()
+        for chunk_id in unused_chunks:
+            garbage.setdefault(chunk_id, now)
+
+        expired = [chunk_id for chunk_id, marked_at in garbage.items() if now - marked_at >= self.chunk_grace_period]
+        if len(expired) > 0:
+            # manifest can be replaced by concurrent put: chunks of the latest one are kept
+            manifest = self._read_manifest(remote_name)
+            used_chunks = set() if manifest is None else self._get_chunk_ids(manifest)
+            self._delete_objects([
+                self._store_key(remote_name, 'chunks', chunk_id)
+                for chunk_id in expired
+                if chunk_id not in used_chunks
+            ])
+            for chunk_id in expired:
+                del garbage[chunk_id]
+
+        if len(unused_chunks) > 0 or len(expired) > 0:
+            # concurrent update can lose marks: it leaves chunks in storage, but doesn't break resource
+            self._write_object(
+                self._store_key(remote_name, STORE_GARBAGE_NAME),
+                json.dumps(garbage).encode()
+            )
+
+    @staticmethod
+    def _load_local_manifest(dir_path: Path) -> Optional[dict]:
+        try:
+            return json.loads((dir_path / DIR_MANIFEST_FILE_NAME).read_text())
+        except Exception:
+            return None
+
+    @staticmethod
+    def _save_local_manifest(dir_path: Path, manifest: dict):
+        (dir_path / DIR_MANIFEST_FILE_NAME).write_text(json.dumps(manifest))
+
+    @staticmethod
+    def _scan_dir(dir_path: Path) -> tuple:
+        """ Returns:
+                tuple: (dict of relative path -> stat of file, list of relative paths of dirs)
+        """
+        files = {}
+        dirs = []
+        for path in sorted(dir_path.rglob('*')):
+            rel_path = path.relative_to(dir_path).as_posix()
+            if path.is_dir():
+                dirs.append(rel_path)
+            elif path.is_file():
+                if path.parent == dir_path and path.name in SERVICE_FILES_NAMES:
+                    continue
+                files[rel_path] = path.stat()
+        return files, dirs
+
+    def _hash_file(self, file_path: Path) -> list:
+        hashes = []
+        with open(file_path, 'rb') as f:
+            while True:
+                data = f.read(self.chunk_size)
+                if len(data) == 0:
+                    break
+                hashes.append(hashlib.sha256(data).hexdigest())
+        return hashes
+
+    def _upload_chunk(self, remote_name: str, chunk_id: str, file_path: Path, offset: int, compression_level: int):
+        with open(file_path, 'rb') as f:
+            f.seek(offset)
+            data = f.read(self.chunk_size)
+        if hashlib.sha256(data).hexdigest() != self._chunk_hash(chunk_id):
+            raise Exception(f'File was changed during upload: {file_path}')
+        if chunk_id.endswith(COMPRESSED_CHUNK_SUFFIX):
+            data = zlib.compress(data, compression_level)
+        self._write_object(self._store_key(remote_name, 'chunks', chunk_id), data)
+
+    def _download_chunk(self, remote_name: str, chunk_id: str, file_path: Path, offset: int):
+        data = self._read_object(self._store_key(remote_name, 'chunks', chunk_id))
+        if data is None:
+            raise FileNotFoundError(f"Chunk '{chunk_id}' of '{remote_name}' is not found")
+        if chunk_id.endswith(COMPRESSED_CHUNK_SUFFIX):
+            data = zlib.decompress(data)
+        if hashlib.sha256(data).hexdigest() != self._chunk_hash(chunk_id):
+            raise Exception(f"Chunk '{chunk_id}' of '{remote_name}' is corrupted")
+        with open(file_path, 'r+b') as f:
+            f.seek(offset)
+            f.write(data)
+
+    @profiler.profile()
     def get(self, local_name, base_dir):
+        remote_name = local_name
+        dir_path = Path(base_dir) / local_name
+
+        with FileLock(dir_path, mode='r'):
+            remote_manifest = self._read_manifest(remote_name)
+            if remote_manifest is not None:
+                local_manifest = self._load_local_manifest(dir_path)
+                if local_manifest is not None and local_manifest.get('version') == remote_manifest['version']:
+                    return
+
+        if remote_manifest is None:
+            self._get_legacy(local_name, base_dir)
+            return
+
+        with FileLock(dir_path, mode='w'):
+            for attempt in range(DOWNLOAD_ATTEMPTS):
+                try:
+                    self._download(remote_name, dir_path, remote_manifest, local_manifest)
+                    return
+                except FileNotFoundError:
+                    # put of new version removes chunks which are not used anymore after grace period
+                    new_manifest = self._read_manifest(remote_name)
+                    if (
+                        attempt == DOWNLOAD_ATTEMPTS - 1
+                        or new_manifest is None
+                        or new_manifest['version'] == remote_manifest['version']
+                    ):
+                        raise
+                    logger.debug(f"'{remote_name}' was changed during download, retry")
+                    remote_manifest = new_manifest
+                    local_manifest = self._load_local_manifest(dir_path)
+
+    @profiler.profile()
+    def _download(self, remote_name: str, dir_path: Path, remote_manifest: dict, local_manifest: Optional[dict]):
+        """ download files which differ from the local copy of resource
+        """
+        dir_path.mkdir(parents=True, exist_ok=True)
+        local_files = {} if local_manifest is None else local_manifest['files']
+        files, _ = self._scan_dir(dir_path)
+
+        for rel_dir in remote_manifest['dirs']:
+            (dir_path / rel_dir).mkdir(parents=True, exist_ok=True)
+
+        # files which were removed from resource
+        for rel_path in local_files:
+            if rel_path not in remote_manifest['files'] and rel_path in files:
+                (dir_path / rel_path).unlink()
+
+        manifest_files = {}
+        to_download = []
+        for rel_path, file_meta in remote_manifest['files'].items():
+            local_meta = local_files.get(rel_path)
+            stat = files.get(rel_path)
+            if (
+                local_meta is not None and stat is not None
+                and stat.st_size == local_meta['size']
+                and stat.st_mtime_ns == local_meta['mtime']
+                and [self._chunk_hash(x) for x in local_meta['chunks']] == [self._chunk_hash(x) for x in file_meta['chunks']]
+            ):
+                manifest_files[rel_path] = dict(file_meta, mtime=local_meta['mtime'])
+            else:
+                to_download.append(rel_path)
+
+        chunk_size = remote_manifest['chunk_size']
+        tmp_paths = {}
+        try:
+            futures = []
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                for rel_path in to_download:
+                    file_meta = remote_manifest['files'][rel_path]
+                    file_path = dir_path / rel_path
+                    file_path.parent.mkdir(parents=True, exist_ok=True)
+                    tmp_path = file_path.with_name(f'.{file_path.name}.download')
+                    tmp_paths[rel_path] = tmp_path
+                    with open(tmp_path, 'wb') as f:
+                        f.truncate(file_meta['size'])
+                    for i, chunk_id in enumerate(file_meta['chunks']):
+                        futures.append(executor.submit(
+                            self._download_chunk, remote_name, chunk_id, tmp_path, i * chunk_size
+                        ))
+                for future in futures:
+                    future.result()
+
+            for rel_path, tmp_path in tmp_paths.items():
+                file_path = dir_path / rel_path
+                os.replace(tmp_path, file_path)
+                manifest_files[rel_path] = dict(
+                    remote_manifest['files'][rel_path],
+                    mtime=file_path.stat().st_mtime_ns
+                )
+        finally:
+            for tmp_path in tmp_paths.values():
+                if tmp_path.exists():
+                    tmp_path.unlink()
+
+        self._save_local_manifest(dir_path, dict(remote_manifest, files=manifest_files))
+
+    @profiler.profile()
+    def put(self, local_name, base_dir, compression_level=None):
+        remote_name = local_name
+        if compression_level is None:
+            compression_level = self.compression_level
+        dir_path = Path(base_dir) / local_name
+
+        local_manifest = self._load_local_manifest(dir_path)
+        if local_manifest is None or local_manifest.get('chunk_size') != self.chunk_size:
+            local_manifest = {'files': {}}
+        remote_manifest = self._read_manifest(remote_name)
+        files, dirs = self._scan_dir(dir_path)
+
+        # chunk hash -> chunk id, for chunks which are already in storage
+        stored_chunks = {}
+        # hashes of chunks which can be deleted: uploaded chunk must not have the same id
+        garbage_hashes = set()
+        if remote_manifest is not None:
+            for chunk_id in self._get_chunk_ids(remote_manifest):
+                stored_chunks[self._chunk_hash(chunk_id)] = chunk_id
+            garbage_hashes = set(self._chunk_hash(chunk_id) for chunk_id in self._read_garbage(remote_name))
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            # only files which were changed after last sync are hashed
+            hashes = {}
+            to_hash = []
+            for rel_path, stat in files.items():
+                local_meta = local_manifest['files'].get(rel_path)
+                if (
+                    local_meta is not None
+                    and local_meta['size'] == stat.st_size
+                    and local_meta['mtime'] == stat.st_mtime_ns
+                ):
+                    hashes[rel_path] = [self._chunk_hash(x) for x in local_meta['chunks']]
+                else:
+                    to_hash.append(rel_path)
+            hashes.update(zip(to_hash, executor.map(lambda x: self._hash_file(dir_path / x), to_hash)))
+
+            manifest_files = {}
+            futures = []
+            for rel_path, stat in files.items():
+                chunk_ids = []
+                for i, chunk_hash in enumerate(hashes[rel_path]):
+                    chunk_id = stored_chunks.get(chunk_hash)
+                    if chunk_id is None:
+                        chunk_id = chunk_hash
+                        if chunk_hash in garbage_hashes:
+                            chunk_id += f'.{uuid4().hex[:8]}'
+                        if compression_level > 0:
+                            chunk_id += COMPRESSED_CHUNK_SUFFIX
+                        stored_chunks[chunk_hash] = chunk_id
+                        futures.append(executor.submit(
+                            self._upload_chunk, remote_name, chunk_id,
+                            dir_path / rel_path, i * self.chunk_size, compression_level
+                        ))
+                    chunk_ids.append(chunk_id)
+                manifest_files[rel_path] = {
+                    'size': stat.st_size,
+                    'mtime': stat.st_mtime_ns,
+                    'chunks': chunk_ids
+                }
+            for future in futures:
+                future.result()
+
+        manifest = {
+            'version': uuid4().hex,
+            'chunk_size': self.chunk_size,
+            'dirs': dirs,
+            'files': {
+                rel_path: {'size': file_meta['size'], 'chunks': file_meta['chunks']}
+                for rel_path, file_meta in manifest_files.items()
+            }
+        }
+        self._write_object(
+            self._store_key(remote_name, STORE_MANIFEST_NAME),
+            json.dumps(manifest).encode()
+        )
+        if remote_manifest is None:
+            self._delete_legacy(remote_name)
+        else:
+            self._collect_garbage(remote_name, self._get_chunk_ids(remote_manifest) - self._get_chunk_ids(manifest))
+
+        self._save_local_manifest(dir_path, dict(manifest, files=manifest_files))
+
+
+class LocalFSStore(ContentAddressedFSStore):
+    """Storage that stores files locally
+    """
+
+    default_compression_level = 0
+
+    def __init__(self):
+        super().__init__()
+
+    def _object_path(self, key: str) -> Path:
+        return Path(self.storage) / key
+
+    def _read_object(self, key: str) -> Optional[bytes]:
+        try:
+            return self._object_path(key).read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def _write_object(self, key: str, data: bytes):
+        path = self._object_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f'.{path.name}.{uuid4().hex}')
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+
+    def _delete_objects(self, keys: list):
+        for key in keys:
+            try:
+                self._object_path(key).unlink()
+            except FileNotFoundError:
+                pass
+
+    def _get_legacy(self, local_name, base_dir):
         remote_name = local_name
         src = os.path.join(self.storage, remote_name)
         dest = os.path.join(base_dir, local_name)
         if not os.path.exists(dest) or get_dir_size(src) != get_dir_size(dest):
             copy(src, dest)
 
-    def put(self, local_name, base_dir, compression_level=9):
-        remote_name = local_name
-        copy(
-            os.path.join(base_dir, local_name),
-            os.path.join(self.storage, remote_name)
-        )
-
-    def delete(self, remote_name):
+    def _delete_legacy(self, remote_name):
         path = Path(self.storage).joinpath(remote_name)
         try:
             if path.is_file():
@@ -145,6 +543,10 @@ class LocalFSStore(BaseFSStore):
         except FileNotFoundError:
             pass
 
+    def delete(self, remote_name):
+        shutil.rmtree(Path(self.storage) / self._store_key(remote_name), ignore_errors=True)
+        self._delete_legacy(remote_name)
+
 
 class FileLock:
     """ file lock to make safe concurrent access to directory
@@ -211,7 +613,7 @@ class FileLock:
             pass
 
 
-class S3FSStore(BaseFSStore):
+class S3FSStore(ContentAddressedFSStore):
     """Storage that stores files in amazon s3
     """
 
@@ -224,7 +626,28 @@ class S3FSStore(BaseFSStore):
         else:
             self.s3 = boto3.client('s3')
         self.bucket = self.config['permanent_storage']['bucket']
-        self._thread_lock = threading.Lock()
+
+    def _read_object(self, key: str) -> Optional[bytes]:
+        try:
+            return self.s3.get_object(Bucket=self.bucket, Key=key)['Body'].read()
+        except S3ClientError as e:
+            if e.response['Error']['Code'] in ('NoSuchKey', '404'):
+                return None
+            raise
+
+    def _write_object(self, key: str, data: bytes):
+        self.s3.put_object(Bucket=self.bucket, Key=key, Body=data)
+
+    def _delete_objects(self, keys: list):
+        # s3 deletes up to 1000 objects per request
+        for i in range(0, len(keys), 1000):
+            self.s3.delete_objects(
+                Bucket=self.bucket,
+                Delete={
+                    'Objects': [{'Key': key} for key in keys[i:i + 1000]],
+                    'Quiet': True
+                }
+            )
 
     def _get_remote_last_modified(self, object_name: str) -> datetime:
         """ get time when object was created/modified
@@ -278,8 +701,8 @@ class S3FSStore(BaseFSStore):
         last_modified_file_path.write_text(last_modified_text)
 
     @profiler.profile()
-    def _download(self, base_dir: str, remote_ziped_name: str,
-                  local_ziped_path: str, last_modified: datetime = None):
+    def _download_archive(self, base_dir: str, remote_ziped_name: str,
+                          local_ziped_path: str, last_modified: datetime = None):
         """ download file to s3 and unarchive it
 
             Args:
@@ -316,7 +739,7 @@ class S3FSStore(BaseFSStore):
         )
 
     @profiler.profile()
-    def get(self, local_name, base_dir):
+    def _get_legacy(self, local_name, base_dir):
         remote_name = local_name
         remote_ziped_name = f'{remote_name}.tar.gz'
         local_ziped_name = f'{local_name}.tar.gz'
@@ -333,61 +756,22 @@ class S3FSStore(BaseFSStore):
                 return
 
         with FileLock(folder_path, mode='w'):
-            self._download(
+            self._download_archive(
                 base_dir,
                 remote_ziped_name,
                 local_ziped_path,
                 last_modified=remote_last_modified
             )
 
-    @profiler.profile()
-    def put(self, local_name, base_dir, compression_level=9):
-        # NOTE: This `make_archive` function is implemente poorly and will create an empty archive file even if
-        # the file/dir to be archived doesn't exist or for some other reason can't be archived
-        remote_name = local_name
-        remote_zipped_name = f'{remote_name}.tar.gz'
-
-        dir_path = Path(base_dir) / remote_name
-        dir_size = sum(f.stat().st_size for f in dir_path.glob('**/*') if f.is_file())
-        if (dir_size * 2) < psutil.virtual_memory().available:
-            old_cwd = os.getcwd()
-            fh = io.BytesIO()
-            with self._thread_lock:
-                os.chdir(base_dir)
-                with tarfile.open(fileobj=fh, mode='w:gz', compresslevel=compression_level) as tar:
-                    for path in dir_path.iterdir():
-                        if path.is_file() and path.name in SERVICE_FILES_NAMES:
-                            continue
-                        tar.add(path.relative_to(base_dir))
-                os.chdir(old_cwd)
-            fh.seek(0)
-
-            self.s3.upload_fileobj(
-                fh,
-                self.bucket,
-                remote_zipped_name
-            )
-        else:
-            shutil.make_archive(
-                os.path.join(base_dir, remote_name),
-                'gztar',
-                root_dir=base_dir,
-                base_dir=local_name
-            )
-
-            self.s3.upload_file(
-                os.path.join(base_dir, remote_zipped_name),
-                self.bucket,
-                remote_zipped_name
-            )
-            os.remove(os.path.join(base_dir, remote_zipped_name))
-
-        last_modified = self._get_remote_last_modified(remote_zipped_name)
-        self._save_local_last_modified(base_dir, local_name, last_modified)
+    def _delete_legacy(self, remote_name):
+        self.s3.delete_object(Bucket=self.bucket, Key=f'{remote_name}.tar.gz')
 
     @profiler.profile()
     def delete(self, remote_name):
-        self.s3.delete_object(Bucket=self.bucket, Key=remote_name)
+        paginator = self.s3.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=self._store_key(remote_name, '')):
+            self._delete_objects([item['Key'] for item in page.get('Contents', [])])
+        self._delete_legacy(remote_name)
 
 
 def FsStore():
@@ -427,12 +811,12 @@ class FileStorage:
             self.folder_path.mkdir(parents=True, exist_ok=True)
 
     @profiler.profile()
-    def push(self, compression_level: int = 9):
+    def push(self, compression_level: Optional[int] = None):
         with FileLock(self.folder_path, mode='r'):
             self._push_no_lock(compression_level=compression_level)
 
     @profiler.profile()
-    def _push_no_lock(self, compression_level: int = 9):
+    def _push_no_lock(self, compression_level: Optional[int] = None):
         self.fs_store.put(
             str(self.folder_name),
             str(self.resource_group_path),
@@ -440,7 +824,7 @@ class FileStorage:
         )
 
     @profiler.profile()
-    def push_path(self, path, compression_level: int = 9):
+    def push_path(self, path, compression_level: Optional[int] = None):
         # TODO implement push per element
         self.push(compression_level=compression_level)
 
@@ -8,6 +8,7 @@ import mindsdb.interfaces.storage.db as db
 
 from .fs import RESOURCE_GROUP, FileStorageFactory, SERVICE_FILES_NAMES
 from .json import get_json_storage
+from mindsdb.utilities.embedding_cache import delete_model_embeddings
 
 
 class ModelStorage:
@@ -139,6 +140,10 @@ class ModelStorage:
             resource_group=RESOURCE_GROUP.PREDICTOR
         )
         json_storage.clean()
+        delete_model_embeddings(self.predictor_id)
+
+        from mindsdb.interfaces.knowledge_base.controller import invalidate_embedding_model
+        invalidate_embedding_model(self.predictor_id)
 
 
 class HandlerStorage:
@@ -2,6 +2,7 @@ import traceback
 import threading
 from mindsdb.utilities.context import context as ctx
 from mindsdb.interfaces.storage import db
+from mindsdb.interfaces.database.integrations import integration_controller
 from mindsdb.utilities import log
 
 from mindsdb.interfaces.triggers.trigger_task import TriggerTask
@@ -46,6 +47,8 @@ class TaskThread(threading.Thread):
         except Exception:
             logger.error(traceback.format_exc())
             task_record.last_error = str(traceback.format_exc())
+        finally:
+            integration_controller.release_handlers()
 
         db.session.commit()
 
@@ -44,7 +44,10 @@ class TriggerTask(BaseTask):
 
         # subscribe
         database = session.integration_controller.get_by_id(trigger.database_id)
-        data_handler = session.integration_controller.get_handler(database['name'])
+        # the handler is used during whole life of the trigger, it is not taken from the pool
+        data_handler = session.integration_controller.get_handler(database['name'], pooled=False)
+        if not hasattr(data_handler, 'subscribe'):
+            raise Exception(f"Database doesn't support subscription: {database['name']}")
 
         columns = trigger.columns
         if columns is not None:
@@ -53,7 +56,10 @@ class TriggerTask(BaseTask):
             else:
                 columns = columns.split('|')
 
-        data_handler.subscribe(stop_event, self._callback, trigger.table_name, columns)
+        try:
+            data_handler.subscribe(stop_event, self._callback, trigger.table_name, columns)
+        finally:
+            data_handler.disconnect()
 
     def _callback(self, row, key=None):
         logger.debug(f'trigger call: {row}, {key}')
@@ -91,5 +97,8 @@ class TriggerTask(BaseTask):
 
         except Exception:
             self.set_error(str(traceback.format_exc()))
+        finally:
+            # return handlers which were used by the query to the pool
+            self.command_executor.session.integration_controller.release_handlers()
 
         db.session.commit()
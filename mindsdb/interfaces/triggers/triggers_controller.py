@@ -36,12 +36,16 @@ class TriggersController:
         db_name = table.parts[0]
 
         db_integration = session.integration_controller.get(db_name)
-        db_handler = session.integration_controller.get_handler(db_name)
+        # handler is used only for checks, it is not taken from the pool
+        db_handler = session.integration_controller.get_handler(db_name, pooled=False)
 
         if not hasattr(db_handler, 'subscribe'):
             raise Exception(f'Handler {db_integration["engine"]} does''t support subscription')
 
-        df = db_handler.get_tables().data_frame
+        try:
+            df = db_handler.get_tables().data_frame
+        finally:
+            db_handler.disconnect()
         tables = list(df[df.columns[0]])
 
         # check only if tables are visible
@@ -19,7 +19,13 @@ How to use it:
 Configuration:
 
 - max_size size of cache in count of records, default is 50
-- serializer, module for serialization, default is dill
+- serializer, module for serialization, default is dill.
+  DataFrames are serialized with codec from "dataframe_codec" config, see utilities/dataframe_codec.py
+- memory_max_size size of in-process memory tier of one category in bytes, default is 64Mb.
+  Serialized values are kept there in LRU order in front of local/redis cache,
+  0 disables memory tier
+- memory_total_max_size size of memory tier of all categories and companies in the process,
+  default is 256Mb. The least recently used values of any category are evicted first
 
 It can be set via:
 - get_cache function:
@@ -29,7 +35,9 @@ It can be set via:
 - using mindsdb config file:
     "cache": {
         "type": "redis",
-        "max_size": 2
+        "max_size": 2,
+        "memory_max_size": 1048576,
+        "memory_total_max_size": 4194304
     }
 
 Cache engines:
@@ -54,7 +62,9 @@ How to test:
 
 import os
 import time
+import threading
 from abc import ABC
+from collections import OrderedDict
 from pathlib import Path
 import hashlib
 import typing as t
@@ -64,10 +74,17 @@ import walrus
 
 from mindsdb.utilities.config import Config
 from mindsdb.utilities.json_encoder import CustomJSONEncoder
+from mindsdb.utilities.dataframe_codec import encode_df, decode_df, is_arrow
 from mindsdb.interfaces.storage.fs import FileLock
 from mindsdb.utilities.context import context as ctx
 
 
+# default size of in-process memory cache tier, in bytes
+DEFAULT_MEMORY_MAX_SIZE = 64 * 1024 * 1024
+# default size of memory tier of all categories and companies of the process
+DEFAULT_MEMORY_TOTAL_MAX_SIZE = 256 * 1024 * 1024
+
+
 def dataframe_checksum(df: pd.DataFrame):
     checksum = str_checksum(df.to_json())
     return checksum
@@ -83,6 +100,18 @@ def str_checksum(obj: str):
     return checksum
 
 
+def rows_checksum(rows: list, batch_size: int = 1000):
+    """
+    Checksum of list of records. Rows are encoded and hashed by batches,
+    without building json string of the whole list in memory
+    """
+    encoder = CustomJSONEncoder()
+    hasher = hashlib.blake2b(digest_size=20)
+    for i in range(0, len(rows), batch_size):
+        hasher.update(encoder.encode(rows[i: i + batch_size]).encode())
+    return hasher.hexdigest()
+
+
 class BaseCache(ABC):
     def __init__(self, max_size=None, serializer=None):
         self.config = Config()
@@ -106,9 +135,13 @@ class BaseCache(ABC):
         return self.get(name)
 
     def serialize(self, value):
+        if isinstance(value, pd.DataFrame):
+            return encode_df(value)
         return self.serializer.dumps(value)
 
     def deserialize(self, value):
+        if is_arrow(value):
+            return decode_df(value)
         return self.serializer.loads(value)
 
 
@@ -149,37 +182,30 @@ class FileCache(BaseCache):
     def file_path(self, name):
         return self.path / name
 
-    def set_df(self, name, df):
-        path = self.file_path(name)
-        df.to_pickle(path)
-        self.clear_old_cache()
-
     def set(self, name, value):
+        self.set_raw(name, self.serialize(value))
+
+    def set_raw(self, name, value: bytes):
         path = self.file_path(name)
-        value = self.serialize(value)
 
         with open(path, 'wb') as fd:
             fd.write(value)
         self.clear_old_cache()
 
-    def get_df(self, name):
-        path = self.file_path(name)
-        with FileLock(self.path):
-            if not os.path.exists(path):
-                return None
-            value = pd.read_pickle(path)
-        return value
-
     def get(self, name):
+        value = self.get_raw(name)
+        if value is None:
+            return None
+        return self.deserialize(value)
+
+    def get_raw(self, name):
         path = self.file_path(name)
 
         with FileLock(self.path):
             if not os.path.exists(path):
                 return None
             with open(path, 'rb') as fd:
-                value = fd.read()
-        value = self.deserialize(value)
-        return value
+                return fd.read()
 
     def delete(self, name):
         path = self.file_path(name)
@@ -227,8 +253,10 @@ class RedisCache(BaseCache):
         return f'{self.category}_{name}'
 
     def set(self, name, value):
+        self.set_raw(name, self.serialize(value))
+
+    def set_raw(self, name, value: bytes):
         key = self.redis_key(name)
-        value = self.serialize(value)
 
         self.client.set(key, value)
         # using key with category name to store all keys with modify time
@@ -237,13 +265,16 @@ class RedisCache(BaseCache):
         self.clear_old_cache(key)
 
     def get(self, name):
-        key = self.redis_key(name)
-        value = self.client.get(key)
+        value = self.get_raw(name)
         if value is None:
             # no value in cache
             return None
         return self.deserialize(value)
 
+    def get_raw(self, name):
+        key = self.redis_key(name)
+        return self.client.get(key)
+
     def delete(self, name):
         key = self.redis_key(name)
 
@@ -254,6 +285,152 @@ class RedisCache(BaseCache):
         self.client.hdel(self.category, key)
 
 
+class MemoryCache(BaseCache):
+    """
+        In-process LRU cache, size is limited in bytes of serialized values.
+        Storage is shared between instances of the same category and company.
+        Size of every storage is limited by max_bytes and size of all storages
+        of the process is limited by total_max_bytes
+    """
+
+    _storages = {}
+    # LRU order of values of all storages: (storage key, name) -> size
+    _order = OrderedDict()
+    _total_size = 0
+    _lock = threading.Lock()
+
+    def __init__(self, category, max_bytes=None, total_max_bytes=None, **kwargs):
+        super().__init__(**kwargs)
+
+        if max_bytes is None:
+            max_bytes = self.config['cache'].get('memory_max_size', DEFAULT_MEMORY_MAX_SIZE)
+        self.max_bytes = max_bytes
+        if total_max_bytes is None:
+            total_max_bytes = self.config['cache'].get('memory_total_max_size', DEFAULT_MEMORY_TOTAL_MAX_SIZE)
+        self.total_max_bytes = total_max_bytes
+
+        self.storage_key = (category, ctx.company_id)
+        with self._lock:
+            if self.storage_key not in self._storages:
+                self._storages[self.storage_key] = MemoryStorage()
+            self.storage = self._storages[self.storage_key]
+
+    @staticmethod
+    def _pop(storage_key, name):
+        # must be called with lock
+        size = MemoryCache._order.pop((storage_key, name), None)
+        if size is not None:
+            MemoryCache._storages[storage_key].pop(name)
+            MemoryCache._total_size -= size
+
+    def set_raw(self, name, value: bytes):
+        with self._lock:
+            self._pop(self.storage_key, name)
+            if len(value) > min(self.max_bytes, self.total_max_bytes):
+                # doesn't fit, don't evict everything for it
+                return
+            self.storage.put(name, value)
+            self._order[(self.storage_key, name)] = len(value)
+            MemoryCache._total_size += len(value)
+
+            while self.storage.size > self.max_bytes:
+                self._pop(self.storage_key, self.storage.oldest())
+
+            # evict the least recently used values of any storage
+            while MemoryCache._total_size > self.total_max_bytes:
+                storage_key, oldest = next(iter(self._order))
+                self._pop(storage_key, oldest)
+
+    def get_raw(self, name):
+        with self._lock:
+            value = self.storage.get(name)
+            if value is not None:
+                self._order.move_to_end((self.storage_key, name))
+            return value
+
+    def set(self, name, value):
+        self.set_raw(name, self.serialize(value))
+
+    def get(self, name):
+        value = self.get_raw(name)
+        if value is None:
+            return None
+        return self.deserialize(value)
+
+    def delete(self, name):
+        with self._lock:
+            self._pop(self.storage_key, name)
+
+    def clear(self):
+        with self._lock:
+            for name in list(self.storage.data.keys()):
+                self._pop(self.storage_key, name)
+
+
+class MemoryStorage:
+    """
+        Values of MemoryCache in LRU order with total size in bytes
+    """
+
+    def __init__(self):
+        self.data = OrderedDict()
+        self.size = 0
+
+    def put(self, name, value: bytes):
+        self.data[name] = value
+        self.size += len(value)
+
+    def get(self, name):
+        value = self.data.get(name)
+        if value is not None:
+            self.data.move_to_end(name)
+        return value
+
+    def pop(self, name):
+        value = self.data.pop(name, None)
+        if value is not None:
+            self.size -= len(value)
+
+    def oldest(self):
+        return next(iter(self.data))
+
+
+class TieredCache:
+    """
+        Memory cache in front of persistent cache (local or redis).
+        Values are serialized once and stored in both tiers,
+        on miss in memory tier value from persistent cache is promoted to memory
+    """
+
+    def __init__(self, memory_cache: MemoryCache, cache: BaseCache):
+        self.memory_cache = memory_cache
+        self.cache = cache
+
+    def set(self, name, value):
+        value = self.cache.serialize(value)
+        self.memory_cache.set_raw(name, value)
+        self.cache.set_raw(name, value)
+
+    def get(self, name):
+        value = self.memory_cache.get_raw(name)
+        if value is None:
+            value = self.cache.get_raw(name)
+            if value is None:
+                return None
+            self.memory_cache.set_raw(name, value)
+        return self.cache.deserialize(value)
+
+    def set_df(self, name, df):
+        return self.set(name, df)
+
+    def get_df(self, name):
+        return self.get(name)
+
+    def delete(self, name):
+        self.memory_cache.delete(name)
+        self.cache.delete(name)
+
+
 class NoCache:
     '''
         class for no cache mode
@@ -267,12 +444,24 @@ class NoCache:
     def set(self, name, value):
         pass
 
+    def get_df(self, name):
+        return None
+
+    def set_df(self, name, df):
+        pass
+
 
 def get_cache(category, **kwargs):
     config = Config()
     if config.get('cache')['type'] == 'redis':
-        return RedisCache(category, **kwargs)
-    if config.get('cache')['type'] == 'none':
+        cache = RedisCache(category, **kwargs)
+    elif config.get('cache')['type'] == 'none':
         return NoCache(category, **kwargs)
     else:
-        return FileCache(category, **kwargs)
+        cache = FileCache(category, **kwargs)
+
+    memory_max_size = config.get('cache').get('memory_max_size', DEFAULT_MEMORY_MAX_SIZE)
+    if not memory_max_size:
+        return cache
+    memory_cache = MemoryCache(category, max_bytes=memory_max_size, serializer=kwargs.get('serializer'))
+    return TieredCache(memory_cache, cache)
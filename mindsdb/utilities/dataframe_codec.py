@@ -0,0 +1,122 @@
+"""
+Serialization of DataFrames for cache and ml task queue
+
+Codec is defined in mindsdb config:
+
+    "dataframe_codec": {
+        "type": "arrow",
+        "compression": "zstd"
+    }
+
+Possible types:
+- pickle - default
+- arrow - Arrow IPC file format, requires pyarrow.
+  Compression can be 'zstd', 'lz4' or null
+
+Encoded data is self-describing: decode_df can read the output of any codec,
+regardless of the current config. If DataFrame can't be converted to arrow
+(for example, object column with mixed types) it is encoded with pickle
+"""
+
+import pickle
+
+import numpy as np
+import pandas as pd
+
+from mindsdb.utilities.config import Config
+from mindsdb.utilities import log
+
+logger = log.getLogger(__name__)
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+
+# arrow IPC file format starts with this magic bytes
+ARROW_MAGIC = b'ARROW1'
+
+_no_arrow_warned = False
+
+
+def get_codec_config() -> dict:
+    codec_config = Config().get('dataframe_codec', {})
+    codec = codec_config.get('type', 'pickle')
+    if codec == 'arrow' and pa is None:
+        global _no_arrow_warned
+        if not _no_arrow_warned:
+            logger.warning("pyarrow is not installed, 'pickle' dataframe codec is used")
+            _no_arrow_warned = True
+        codec = 'pickle'
+    return {
+        'type': codec,
+        'compression': codec_config.get('compression')
+    }
+
+
+def is_arrow(data: bytes) -> bool:
+    return bytes(data[:len(ARROW_MAGIC)]) == ARROW_MAGIC
+
+
+def encode_df(df: pd.DataFrame, codec: str = None, compression: str = None) -> bytes:
+    """ dump DataFrame into bytes
+
+        Args:
+            df (pd.DataFrame): DataFrame to convert
+            codec (str): 'pickle' or 'arrow', taken from config if not set
+            compression (str): compression for arrow codec: 'zstd', 'lz4' or None
+
+        Returns:
+            bytes
+    """
+    if codec is None:
+        codec_config = get_codec_config()
+        codec = codec_config['type']
+        if compression is None:
+            compression = codec_config['compression']
+
+    if codec == 'arrow':
+        try:
+            return _encode_arrow(df, compression)
+        except (pa.ArrowException, TypeError, ValueError) as e:
+            logger.debug(f"Can't encode dataframe with arrow, pickle is used: {e}")
+
+    return pickle.dumps(df, protocol=5)
+
+
+def decode_df(data: bytes) -> pd.DataFrame:
+    """ load DataFrame from bytes made by encode_df
+
+        Args:
+            data (bytes):
+
+        Returns:
+            pd.DataFrame
+    """
+    if is_arrow(data):
+        if pa is None:
+            raise ImportError('pyarrow is required to decode dataframe')
+        # buffer is read without copying
+        reader = pa.ipc.open_file(pa.py_buffer(data))
+        table = reader.read_all()
+        df = table.to_pandas()
+        # values of list columns are restored as lists, not numpy arrays
+        for field in table.schema:
+            if pa.types.is_list(field.type) or pa.types.is_large_list(field.type):
+                df[field.name] = [
+                    value.tolist() if isinstance(value, np.ndarray) else value
+                    for value in df[field.name]
+                ]
+        return df
+    return pickle.loads(data)
+
+
+def _encode_arrow(df: pd.DataFrame, compression: str = None) -> bytes:
+    table = pa.Table.from_pandas(df)
+    options = pa.ipc.IpcWriteOptions(compression=compression)
+
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_file(sink, table.schema, options=options) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
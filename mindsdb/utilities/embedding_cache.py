@@ -0,0 +1,243 @@
+"""
+Persistent cache of embeddings.
+
+Embeddings are stored per namespace (embedding model) and are keyed by hash of the embedded content,
+so the content which was embedded before is not sent to the embedding model again.
+
+Namespace of model is 'model_{model id}/{fingerprint}', fingerprint is hash of parameters of the model:
+vectors are not reused if the model is changed or id of dropped model is given to a new model.
+Namespaces of the model are deleted with the model.
+
+Files of namespace in '{cache path}/embeddings/{namespace}':
+- vectors.f32 - matrix of float32 vectors, one row per content, is read via memory map
+- index.bin - 16 bytes hash of content per row of matrix
+- dim.txt - size of vectors
+
+Files are only appended, it is safe to use the cache from several processes.
+
+It is enabled in mindsdb config:
+
+    "embedding_cache": {
+        "enabled": true
+    }
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import threading
+from pathlib import Path
+from typing import Callable, List, Optional
+
+import numpy as np
+
+if os.name == 'posix':
+    import fcntl
+
+from mindsdb.utilities.config import Config
+from mindsdb.utilities import log
+
+logger = log.getLogger(__name__)
+
+
+KEY_SIZE = 16
+
+
+def content_hash(content: str) -> bytes:
+    return hashlib.blake2b(content.encode(), digest_size=KEY_SIZE).digest()
+
+
+def model_namespace(model_id: int, params: dict) -> str:
+    """ Namespace of embedding model, it is changed with parameters of the model
+    """
+    fingerprint = content_hash(json.dumps(params, sort_keys=True, default=str)).hex()
+    return f'model_{model_id}/{fingerprint}'
+
+
+class EmbeddingCache:
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._index_path = self.path / 'index.bin'
+        self._vectors_path = self.path / 'vectors.f32'
+        self._dim_path = self.path / 'dim.txt'
+        self._lock_path = self.path / 'cache.lock'
+
+        # hash -> row of matrix
+        self._index = {}
+        self._count = 0
+        self._dim = None
+        self._vectors = None
+        self._lock = threading.Lock()
+
+    def _file_lock(self):
+        fd = os.open(self._lock_path, os.O_RDWR | os.O_CREAT)
+        if os.name == 'posix':
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        return fd
+
+    def _file_unlock(self, fd):
+        if os.name == 'posix':
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        os.close(fd)
+
+    def _refresh(self):
+        # read rows which were appended by other processes
+        if self._dim is None:
+            if not self._dim_path.is_file():
+                return
+            self._dim = int(self._dim_path.read_text())
+
+        if not self._index_path.is_file():
+            return
+        count = self._index_path.stat().st_size // KEY_SIZE
+        # rows are visible only if their vectors are written
+        if self._vectors_path.is_file():
+            count = min(count, self._vectors_path.stat().st_size // (self._dim * 4))
+        else:
+            count = 0
+        if count <= self._count:
+            return
+
+        with open(self._index_path, 'rb') as f:
+            f.seek(self._count * KEY_SIZE)
+            data = f.read((count - self._count) * KEY_SIZE)
+        for i in range(count - self._count):
+            self._index[data[i * KEY_SIZE: (i + 1) * KEY_SIZE]] = self._count + i
+        self._count = count
+        self._vectors = None
+
+    def _get_vectors(self) -> np.ndarray:
+        if self._vectors is None:
+            self._vectors = np.memmap(self._vectors_path, dtype=np.float32, mode='r', shape=(self._count, self._dim))
+        return self._vectors
+
+    def get(self, keys: List[bytes]) -> list:
+        """ cached vectors
+
+            Args:
+                keys (List[bytes]): hashes of content
+
+            Returns:
+                list: vector (list of floats) or None for every key
+        """
+        with self._lock:
+            self._refresh()
+            rows = [self._index.get(key) for key in keys]
+            if all(row is None for row in rows):
+                return rows
+            vectors = self._get_vectors()
+            return [
+                None if row is None else vectors[row].tolist()
+                for row in rows
+            ]
+
+    def set(self, keys: List[bytes], vectors: list):
+        """ append vectors to cache
+
+            Args:
+                keys (List[bytes]): hashes of content
+                vectors (list): vectors, in the same order as keys
+        """
+        if len(keys) == 0:
+            return
+        matrix = np.asarray(vectors, dtype=np.float32)
+        if matrix.ndim != 2 or matrix.shape[0] != len(keys):
+            logger.warning(f'Embeddings are not cached, unexpected shape: {matrix.shape}')
+            return
+
+        with self._lock:
+            fd = self._file_lock()
+            try:
+                self._refresh()
+                if self._dim is None:
+                    self._dim = matrix.shape[1]
+                    self._dim_path.write_text(str(self._dim))
+                elif self._dim != matrix.shape[1]:
+                    logger.warning(f'Embeddings are not cached, size {matrix.shape[1]} != {self._dim}')
+                    return
+
+                new_rows = {}
+                for key, vector in zip(keys, matrix):
+                    if key not in self._index and key not in new_rows:
+                        new_rows[key] = vector
+                if len(new_rows) == 0:
+                    return
+
+                # remove rows of interrupted write
+                with open(self._vectors_path, 'ab') as f:
+                    f.truncate(self._count * self._dim * 4)
+                    f.write(np.stack(list(new_rows.values())).tobytes())
+                with open(self._index_path, 'ab') as f:
+                    f.truncate(self._count * KEY_SIZE)
+                    f.write(b''.join(new_rows.keys()))
+
+                self._refresh()
+            finally:
+                self._file_unlock(fd)
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def _get_path(namespace: str) -> Path:
+    return Path(Config()['paths']['cache']) / 'embeddings' / namespace
+
+
+def get_embedding_cache(namespace: str) -> Optional[EmbeddingCache]:
+    """ Cache of the namespace or None if cache is disabled
+    """
+    if not Config().get('embedding_cache', {}).get('enabled', False):
+        return None
+    with _caches_lock:
+        if namespace not in _caches:
+            _caches[namespace] = EmbeddingCache(_get_path(namespace))
+        return _caches[namespace]
+
+
+def delete_model_embeddings(model_id: int):
+    """ Delete cached embeddings of all versions of parameters of the model
+    """
+    prefix = f'model_{model_id}'
+    with _caches_lock:
+        for namespace in list(_caches.keys()):
+            if namespace.split('/')[0] == prefix:
+                del _caches[namespace]
+        shutil.rmtree(_get_path(prefix), ignore_errors=True)
+
+
+def get_embeddings(namespace: str, keys: List[bytes], embed_fn: Callable) -> list:
+    """ Get embeddings from cache, embed only the content which is not in cache
+
+        Args:
+            namespace (str): namespace of cache, embedding model
+            keys (List[bytes]): hashes of the content
+            embed_fn (Callable): receives list of positions of content to embed, returns list of vectors
+
+        Returns:
+            list: vectors in the same order as keys
+    """
+    cache = get_embedding_cache(namespace)
+    if cache is None:
+        return list(embed_fn(list(range(len(keys)))))
+
+    vectors = cache.get(keys)
+
+    # the same content can be repeated
+    missing = {}
+    for i, vector in enumerate(vectors):
+        if vector is None and keys[i] not in missing:
+            missing[keys[i]] = i
+    if len(missing) == 0:
+        return vectors
+
+    new_vectors = list(embed_fn(list(missing.values())))
+    cache.set(list(missing.keys()), new_vectors)
+
+    new_vectors = dict(zip(missing.keys(), new_vectors))
+    return [
+        new_vectors[key] if vector is None else vector
+        for key, vector in zip(keys, vectors)
+    ]
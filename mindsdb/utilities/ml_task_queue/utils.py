@@ -3,15 +3,17 @@ import pickle
 import socket
 import threading
 
+from pandas import DataFrame
 from walrus import Database
 from redis.exceptions import ConnectionError as RedisConnectionError
 
 from mindsdb.utilities.context import context as ctx
+from mindsdb.utilities.dataframe_codec import encode_df, decode_df, is_arrow
 from mindsdb.utilities.ml_task_queue.const import ML_TASK_STATUS
 
 
 def to_bytes(obj: object) -> bytes:
-    """ dump object into bytes
+    """ dump object into bytes. DataFrame is dumped with codec from config
 
         Args:
             obj (object): object to convert
@@ -19,6 +21,8 @@ def to_bytes(obj: object) -> bytes:
         Returns:
             bytes
     """
+    if isinstance(obj, DataFrame):
+        return encode_df(obj)
     return pickle.dumps(obj, protocol=5)
 
 
@@ -31,6 +35,8 @@ def from_bytes(b: bytes) -> object:
         Returns:
             object
     """
+    if is_arrow(b):
+        return decode_df(b)
     return pickle.loads(b)
 
 
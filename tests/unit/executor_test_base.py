@@ -224,6 +224,8 @@ class BaseExecutorTest(BaseUnitTest):
         config_patch = mock.patch("mindsdb.utilities.cache.FileCache.get")
         self.mock_config = config_patch.__enter__()
         self.mock_config.side_effect = lambda x: None
+        tiered_cache_patch = mock.patch("mindsdb.utilities.cache.TieredCache.get")
+        tiered_cache_patch.__enter__().side_effect = lambda x: None
 
     def save_file(self, name, df):
         file_path = tempfile.mktemp(prefix="mindsdb_file_")
@@ -1,4 +1,7 @@
 import time
+import shutil
+import tempfile
+from pathlib import Path
 from unittest.mock import patch
 
 import pandas as pd
@@ -378,3 +381,103 @@ class TestHuggingface(BaseExecutorTest):
         )
 
         assert ret.error_code is None
+
+
+class FakeModelStorage:
+    def __init__(self, args, path):
+        self.args = args
+        self.path = path
+
+    def json_get(self, name):
+        return dict(self.args)
+
+    def folder_get(self, name):
+        return self.path
+
+
+class FakeFillMaskPipeline:
+    # returns results like transformers.FillMaskPipeline
+    def __init__(self):
+        self.tokenizer = type('Tokenizer', (), {'model_max_length': None})()
+        self.calls = []
+
+    def __call__(self, items, batch_size=None):
+        self.calls.append((list(items), batch_size))
+        if 'fail' in items:
+            raise RuntimeError('failed item')
+        results = [
+            [
+                {'sequence': item.replace('[MASK]', 'a'), 'score': 0.7},
+                {'sequence': item.replace('[MASK]', 'b'), 'score': 0.3},
+            ]
+            for item in items
+        ]
+        if len(items) == 1:
+            return results[0]
+        return results
+
+
+class TestHuggingfacePredict:
+    # prediction without models from hub
+
+    def setup_method(self):
+        from mindsdb.integrations.handlers.huggingface_handler.huggingface_handler import HuggingFaceHandler
+
+        self.path = tempfile.mkdtemp(prefix='hf_model_')
+        Path(self.path, 'model.bin').write_bytes(b'1')
+        args = {
+            'task': 'fill-mask',
+            'task_proper': 'fill-mask',
+            'model_name': 'model',
+            'input_column': 'text',
+            'target': 'pred',
+        }
+        self.handler = HuggingFaceHandler(
+            model_storage=FakeModelStorage(args, self.path),
+            engine_storage=None
+        )
+        HuggingFaceHandler.get_pipeline.cache_clear()
+
+    def teardown_method(self):
+        shutil.rmtree(self.path, ignore_errors=True)
+
+    def test_fill_mask_batches(self):
+        pipeline = FakeFillMaskPipeline()
+        with patch(
+            'mindsdb.integrations.handlers.huggingface_handler.huggingface_handler.transformers'
+        ) as transformers:
+            load_pipeline = transformers.pipeline
+            load_pipeline.return_value = pipeline
+            df = pd.DataFrame({'text': ['x [MASK]', 'y [MASK]', 'z [MASK]']})
+            result = self.handler.predict(df, {'predict_params': {'batch_size': 2}})
+            assert list(result['pred']) == ['x a', 'y a', 'z a']
+            assert result['pred_explain'][0] == {'x a': 0.7, 'x b': 0.3}
+            # all items are sent by one call
+            assert pipeline.calls == [(list(df['text']), 2)]
+
+            # one item
+            result = self.handler.predict(pd.DataFrame({'text': ['w [MASK]']}))
+            assert list(result['pred']) == ['w a']
+
+            # failed item doesn't fail others
+            pipeline.calls.clear()
+            result = self.handler.predict(pd.DataFrame({'text': ['x [MASK]', 'fail']}))
+            assert result['pred'][0] == 'x a'
+            assert result['error'][1] == 'failed item'
+            assert len(pipeline.calls) == 3
+
+            # empty value is an error of its row
+            pipeline.calls.clear()
+            result = self.handler.predict(pd.DataFrame({'text': ['x [MASK]', None, 'y [MASK]']}))
+            assert result['pred'][0] == 'x a'
+            assert result['error'][1] == 'Input value is empty'
+            assert result['pred'][2] == 'y a'
+            assert pipeline.calls == [(['x [MASK]', 'y [MASK]'], 8)]
+
+            # pipeline is loaded once
+            assert load_pipeline.call_count == 1
+
+            # and reloaded when files of model are changed
+            Path(self.path, 'model.bin').write_bytes(b'22')
+            self.handler.predict(pd.DataFrame({'text': ['w [MASK]']}))
+            assert load_pipeline.call_count == 2
@@ -0,0 +1,152 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+from mindsdb_sql.parser.ast import Identifier
+
+from mindsdb.integrations.libs.response import RESPONSE_TYPE
+
+DF = pd.DataFrame([
+    [1, 'a', 1.5],
+    [2, None, None],
+    [3, 'c"\'', 3.0],
+], columns=['id', 'name', 'value'], dtype=object)
+
+
+class FakeCopy:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def write_row(self, row):
+        self.rows.append(row)
+
+
+class FakeCursor:
+    def __init__(self):
+        self.queries = []
+        self.rows = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def copy(self, query):
+        self.queries.append(query.as_string(None))
+        return FakeCopy(self.rows)
+
+    def executemany(self, query, rows):
+        self.queries.append(query)
+        self.rows.extend(rows)
+
+
+class FakeConnection:
+    def __init__(self):
+        self.cur = FakeCursor()
+        self.committed = False
+
+    def cursor(self):
+        return self.cur
+
+    def commit(self):
+        self.committed = True
+
+    def rollback(self):
+        pass
+
+
+class TestBulkInsert:
+
+    def setup_method(self):
+        self.path = tempfile.mkdtemp(prefix='bulk_insert_')
+
+    def teardown_method(self):
+        shutil.rmtree(self.path, ignore_errors=True)
+
+    def test_sqlite(self):
+        from mindsdb.integrations.handlers.sqlite_handler.sqlite_handler import SQLiteHandler
+
+        db_file = os.path.join(self.path, 'test.db')
+        con = sqlite3.connect(db_file)
+        con.execute('create table items (id integer, name text, value real)')
+        con.commit()
+        con.close()
+
+        handler = SQLiteHandler('test', connection_data={'db_file': db_file})
+        response = handler.bulk_insert(Identifier('items'), DF)
+        assert response.type == RESPONSE_TYPE.OK
+
+        con = sqlite3.connect(db_file)
+        rows = con.execute('select id, name, value from items order by id').fetchall()
+        con.close()
+        assert rows == [(1, 'a', 1.5), (2, None, None), (3, 'c"\'', 3.0)]
+
+        # error is returned as response
+        response = handler.bulk_insert(Identifier('missing'), DF)
+        assert response.type == RESPONSE_TYPE.ERROR
+
+    def test_duckdb(self):
+        from mindsdb.integrations.handlers.duckdb_handler.duckdb_handler import DuckDBHandler
+
+        database = os.path.join(self.path, 'test.duckdb')
+        handler = DuckDBHandler('test', connection_data={'database': database})
+        handler.native_query('create table items (id integer, name varchar, value double)')
+
+        response = handler.bulk_insert(Identifier('items'), DF)
+        assert response.type == RESPONSE_TYPE.OK
+
+        df = handler.native_query('select * from items order by id').data_frame
+        assert df['id'].tolist() == [1, 2, 3]
+        assert df['name'].tolist()[::2] == ['a', 'c"\'']
+        assert df['name'].isnull().tolist() == [False, True, False]
+
+    def test_postgres(self):
+        from mindsdb.integrations.handlers.postgres_handler.postgres_handler import PostgresHandler
+
+        handler = PostgresHandler('test', connection_data={})
+        connection = FakeConnection()
+        with patch.object(handler, 'connect', return_value=connection):
+            response = handler.bulk_insert(Identifier(parts=['public', 'items']), DF)
+
+        assert response.type == RESPONSE_TYPE.OK
+        assert connection.cur.queries == ['COPY "public"."items" ("id", "name", "value") FROM STDIN']
+        assert connection.cur.rows == [tuple(row) for row in DF.values.tolist()]
+        assert connection.committed
+
+    def test_mysql(self):
+        pytest.importorskip('mysql.connector')
+        from mindsdb.integrations.handlers.mysql_handler.mysql_handler import MySQLHandler
+
+        handler = MySQLHandler('test', connection_data={})
+        connection = FakeConnection()
+        with patch.object(handler, 'connect', return_value=connection):
+            response = handler.bulk_insert(Identifier(parts=['db', 'it`ems']), DF)
+
+        assert response.type == RESPONSE_TYPE.OK
+        assert connection.cur.queries == [
+            'INSERT INTO `db`.`it``ems` (`id`, `name`, `value`) VALUES (%s, %s, %s)'
+        ]
+        assert connection.cur.rows == [tuple(row) for row in DF.values.tolist()]
+
+        # rows are sent by batches in one transaction
+        handler.insert_batch_size = 2
+        connection = FakeConnection()
+        with patch.object(handler, 'connect', return_value=connection):
+            response = handler.bulk_insert(Identifier('items'), DF)
+
+        assert response.type == RESPONSE_TYPE.OK
+        assert len(connection.cur.queries) == 2
+        assert connection.cur.rows == [tuple(row) for row in DF.values.tolist()]
+        assert connection.committed
+        assert connection.committed
@@ -10,7 +10,9 @@ import os
 
 import pandas as pd
 
-from mindsdb.utilities.cache import get_cache, RedisCache, FileCache, dataframe_checksum
+from mindsdb.utilities.cache import (
+    get_cache, RedisCache, FileCache, MemoryCache, TieredCache, dataframe_checksum, rows_checksum
+)
 
 
 class TestCashe(unittest.TestCase):
@@ -41,6 +43,119 @@ class TestCashe(unittest.TestCase):
 
         self.cache_test(cache)
 
+    def test_memory(self):
+        cache = MemoryCache('test_memory', max_bytes=1000)
+        cache.clear()
+
+        cache.set_raw('a', b'1' * 400)
+        cache.set_raw('b', b'2' * 400)
+        # 'a' becomes recently used
+        assert cache.get_raw('a') is not None
+
+        # 'b' has to be evicted
+        cache.set_raw('c', b'3' * 400)
+        assert cache.get_raw('b') is None
+        assert cache.get_raw('a') is not None
+        assert cache.get_raw('c') is not None
+        assert cache.storage.size == 800
+
+        # bigger than whole cache: not stored, others are kept
+        cache.set_raw('d', b'4' * 2000)
+        assert cache.get_raw('d') is None
+        assert cache.get_raw('a') is not None
+
+        # the same storage is used by other instances of category
+        cache2 = MemoryCache('test_memory', max_bytes=1000)
+        assert cache2.get_raw('c') is not None
+
+    def test_memory_total_size(self):
+        # size of all storages of the process is limited
+        caches = [
+            MemoryCache(f'test_memory_total_{i}', max_bytes=1000, total_max_bytes=1000)
+            for i in range(3)
+        ]
+        for cache in caches:
+            cache.clear()
+
+        caches[0].set_raw('a', b'1' * 400)
+        caches[1].set_raw('a', b'2' * 400)
+        assert caches[0].get_raw('a') is not None
+
+        # the least recently used value of other category is evicted
+        caches[2].set_raw('a', b'3' * 400)
+        assert caches[1].get_raw('a') is None
+        assert caches[0].get_raw('a') is not None
+        assert caches[2].get_raw('a') is not None
+        assert caches[1].storage.size == 0
+
+        # deleted values are not counted
+        caches[0].delete('a')
+        caches[1].set_raw('b', b'4' * 400)
+        assert caches[2].get_raw('a') is not None
+        for cache in caches:
+            cache.clear()
+
+    def test_tiered(self):
+        memory_cache = MemoryCache('test_tiered', max_bytes=10 * 1024 * 1024)
+        memory_cache.clear()
+        file_cache = FileCache('test_tiered', max_size=2)
+        cache = TieredCache(memory_cache, file_cache)
+
+        df = pd.DataFrame([[1, 'x'], [2, 'y']], columns=['a', 'b'])
+
+        # saved in both tiers
+        cache.set('value', df)
+        assert dataframe_checksum(cache.get('value')) == dataframe_checksum(df)
+        assert dataframe_checksum(memory_cache.get('value')) == dataframe_checksum(df)
+        assert dataframe_checksum(file_cache.get('value')) == dataframe_checksum(df)
+
+        cache.set_df('value_df', df)
+        assert dataframe_checksum(cache.get_df('value_df')) == dataframe_checksum(df)
+
+        # deleted from both tiers
+        cache.delete('value')
+        assert cache.get('value') is None
+        assert file_cache.get('value') is None
+
+        # value from file cache is promoted to memory
+        data = [{'a': 1, 'b': 'x'}]
+        file_cache.set('promoted', data)
+        assert cache.get('promoted') == data
+        assert memory_cache.get('promoted') == data
+
+    def test_rows_checksum(self):
+        rows = [{'a': i, 'b': dt.datetime(2020, 1, 1)} for i in range(2500)]
+
+        assert rows_checksum(rows) == rows_checksum(list(rows))
+        assert rows_checksum(rows) != rows_checksum(rows[:-1])
+
+    def test_dataframe_codec(self):
+        from mindsdb.utilities.dataframe_codec import encode_df, decode_df, is_arrow
+
+        df = pd.DataFrame([
+            [1, 1.2, 'string', dt.datetime(2020, 1, 2)],
+            [2, None, None, dt.datetime(2011, 12, 30)],
+        ], columns=['a', 'b', 'c', 'd'])
+
+        for codec, compression in (('pickle', None), ('arrow', None), ('arrow', 'zstd'), ('arrow', 'lz4')):
+            data = encode_df(df, codec=codec, compression=compression)
+            assert is_arrow(data) == (codec == 'arrow')
+
+            df2 = decode_df(data)
+            pd.testing.assert_frame_equal(df, df2)
+
+        # values of list column are decoded as lists
+        df = pd.DataFrame([[1, [0.5, 1.5]], [2, None]], columns=['a', 'b'])
+        data = encode_df(df, codec='arrow')
+        assert is_arrow(data)
+        assert decode_df(data).to_dict('records') == df.to_dict('records')
+
+        # not convertible to arrow: fallback to pickle
+        df = pd.DataFrame([[1, {1: 3}], [2, 'x']], columns=['a', 'b'])
+        data = encode_df(df, codec='arrow')
+        assert not is_arrow(data)
+        assert list(decode_df(data)['b']) == [{1: 3}, 'x']
+
     def cache_test(self, cache):
 
         # test save
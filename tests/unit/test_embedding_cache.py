@@ -0,0 +1,92 @@
+import os
+import json
+import shutil
+import tempfile
+
+from mindsdb.utilities.embedding_cache import (
+    EmbeddingCache, content_hash, get_embeddings, model_namespace, delete_model_embeddings
+)
+
+
+class TestEmbeddingCache:
+
+    def setup_method(self):
+        # config sets environment variables, restore them for next tests
+        self._environ = dict(os.environ)
+        self.root = tempfile.mkdtemp(prefix='embedding_cache_')
+        fdi, cfg_file = tempfile.mkstemp(prefix='mindsdb_conf_')
+        with os.fdopen(fdi, 'w') as fd:
+            json.dump({
+                'storage_dir': self.root,
+                'embedding_cache': {'enabled': True}
+            }, fd)
+        os.environ['MINDSDB_CONFIG_PATH'] = cfg_file
+
+    def teardown_method(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+        os.environ.clear()
+        os.environ.update(self._environ)
+
+    def test_get_set(self):
+        path = os.path.join(self.root, 'cache')
+        cache = EmbeddingCache(path)
+        keys = [content_hash('a'), content_hash('b')]
+
+        assert cache.get(keys) == [None, None]
+        cache.set(keys, [[1, 2], [3, 4]])
+        assert cache.get(keys[::-1]) == [[3, 4], [1, 2]]
+
+        # the cache is persisted
+        assert EmbeddingCache(path).get(keys) == [[1, 2], [3, 4]]
+
+        # rows appended by another instance are visible
+        other = EmbeddingCache(path)
+        other.set([content_hash('c'), keys[0]], [[5, 6], [0, 0]])
+        assert cache.get([content_hash('c'), keys[0]]) == [[5, 6], [1, 2]]
+
+        # vectors of different size are not stored
+        cache.set([content_hash('d')], [[1, 2, 3]])
+        assert cache.get([content_hash('d')]) == [None]
+
+    def test_get_embeddings(self):
+        embedded = []
+
+        def embed(texts, idx):
+            embedded.extend(texts[i] for i in idx)
+            return [[len(texts[i]), 1] for i in idx]
+
+        namespace = 'model_test_get_embeddings'
+        texts = ['a', 'bb', 'a']
+        vectors = get_embeddings(namespace, [content_hash(t) for t in texts], lambda idx: embed(texts, idx))
+        assert vectors == [[1, 1], [2, 1], [1, 1]]
+        # repeated content is embedded once
+        assert embedded == ['a', 'bb']
+
+        embedded.clear()
+        texts = ['ccc', 'bb']
+        vectors = get_embeddings(namespace, [content_hash(t) for t in texts], lambda idx: embed(texts, idx))
+        assert vectors == [[3, 1], [2, 1]]
+        # only new content is embedded
+        assert embedded == ['ccc']
+
+    def test_model_namespace(self):
+        def embed(idx):
+            return [[1, 2] for _ in idx]
+
+        keys = [content_hash('a')]
+        namespace = model_namespace(1, {'class': 'A', 'model': 'x'})
+        get_embeddings(namespace, keys, embed)
+
+        # vectors of the model are not used after parameters of the model are changed
+        other_namespace = model_namespace(1, {'class': 'A', 'model': 'y'})
+        assert other_namespace != namespace
+        vectors = get_embeddings(other_namespace, keys, lambda idx: [[3, 4] for _ in idx])
+        assert vectors == [[3, 4]]
+
+        # vectors are deleted with the model
+        path = os.path.join(self.root, 'cache', 'embeddings', 'model_1')
+        assert os.path.isdir(path)
+        delete_model_embeddings(1)
+        assert not os.path.exists(path)
+        vectors = get_embeddings(namespace, keys, lambda idx: [[5, 6] for _ in idx])
+        assert vectors == [[5, 6]]
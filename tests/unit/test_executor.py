@@ -1,4 +1,4 @@
-from unittest.mock import patch
+from unittest.mock import patch, Mock
 import datetime as dt
 import tempfile
 import pytest
@@ -8,7 +8,7 @@ import numpy as np
 
 from mindsdb_sql.render.sqlalchemy_render import SqlalchemyRender
 
-from mindsdb.api.mysql.mysql_proxy.utilities.sql import query_df
+from mindsdb.api.mysql.mysql_proxy.utilities.sql import query_df, query_parquet
 from mindsdb.api.mysql.mysql_proxy.utilities.lightwood_dtype import dtype
 
 # How to run:
@@ -149,6 +149,17 @@ class Test(BaseExecutorMockPredictor):
         # is last datetime value of a = 1
         assert ret.data[0][1].isoformat() == dt.datetime(2020, 1, 3).isoformat()
 
+        # predictions are cached as DataFrame
+        with patch('mindsdb.api.mysql.mysql_proxy.classes.sql_query.get_cache') as mock_get_cache:
+            mock_get_cache().get_df.return_value = None
+            self.execute("""
+                SELECT res.a, res.p FROM pg.tasks as source
+                JOIN mindsdb.task_model as res
+            """)
+        cached = mock_get_cache().set_df.call_args[0][1]
+        assert isinstance(cached, pd.DataFrame)
+        assert list(cached['p']) == [3.14] * 3
+
     @patch('mindsdb.integrations.handlers.postgres_handler.Handler')
     def test_ts_predictor(self, mock_handler):
         # set integration data
@@ -732,6 +743,84 @@ class TestComplexQueries(BaseExecutorMockPredictor):
 
         assert len(calls) == 3
 
+    @patch('mindsdb.integrations.handlers.postgres_handler.Handler')
+    def test_create_table_batch_error(self, mock_handler):
+        from mindsdb_sql import parse_sql
+        from mindsdb_sql.parser.ast import Insert
+        from mindsdb.api.mysql.mysql_proxy.datahub.datanodes.integration_datanode import IntegrationDataNode
+        from mindsdb.integrations.libs.response import RESPONSE_TYPE
+        from mindsdb.integrations.libs.response import HandlerResponse as Response
+
+        self.set_handler(mock_handler, name='pg', tables={'tasks': self.df})
+        self.set_predictor(self.task_predictor)
+
+        query_f = mock_handler().query.side_effect
+
+        def query_error_f(query):
+            # the second batch fails
+            if isinstance(query, Insert) and len(inserts) > 0:
+                return Response(RESPONSE_TYPE.ERROR, error_message='disk is full')
+            if isinstance(query, Insert):
+                inserts.append(query)
+            return query_f(query)
+
+        inserts = []
+        mock_handler().query.side_effect = query_error_f
+
+        sql = '''
+              create table pg.table1
+              (
+                      SELECT model.a as a, model.b as b, model.p as c
+                        FROM pg.tasks as t
+                       JOIN mindsdb.task_model as model
+                       WHERE t.a=1
+             )
+        '''
+        with patch.object(IntegrationDataNode, 'insert_batch_size', 1):
+            with pytest.raises(Exception) as exc_info:
+                self.command_executor.execute_command(parse_sql(sql, dialect='mindsdb'))
+
+        # rows of the first batch are not rolled back: it is reported in error
+        assert len(inserts) == 1
+        assert str(exc_info.value) == 'disk is full (inserted rows: 1 of 2)'
+
+    @patch('mindsdb.integrations.handlers.postgres_handler.Handler')
+    def test_create_table_bulk_insert(self, mock_handler):
+        from mindsdb.integrations.libs.response import RESPONSE_TYPE
+        from mindsdb.integrations.libs.response import HandlerResponse as Response
+
+        self.set_handler(mock_handler, name='pg', tables={'tasks': self.df})
+        self.set_predictor(self.task_predictor)
+
+        inserted = []
+
+        def bulk_insert_f(table_name, df):
+            inserted.append((table_name.parts, df))
+            return Response(RESPONSE_TYPE.OK)
+
+        # handler class supports bulk insert
+        type(mock_handler()).bulk_insert = staticmethod(bulk_insert_f)
+
+        self.execute('''
+              create table pg.table1
+              (
+                      SELECT model.a as a, model.b as b, model.p as c
+                        FROM pg.tasks as t
+                       JOIN mindsdb.task_model as model
+                       WHERE t.a=1
+             )
+        ''')
+        del type(mock_handler()).bulk_insert
+
+        calls = mock_handler().query.call_args_list
+        # select and create table, without insert query
+        assert len(calls) == 2
+
+        assert len(inserted) == 1
+        table_parts, df = inserted[0]
+        assert table_parts == ['table1']
+        assert df.values.tolist() == [[1, 'aaa', 'ccc'], [1, 'ccc', 'ccc']]
+
     @patch('mindsdb.integrations.handlers.postgres_handler.Handler')
     def test_create_insert(self, mock_handler):
         self.set_handler(mock_handler, name='pg', tables={'tasks': self.df})
@@ -1106,6 +1195,205 @@ class TestSteps(BaseExecutorMockPredictor):
             limit 1
         """)
 
+    @patch('mindsdb.integrations.handlers.postgres_handler.Handler')
+    def test_join_2_tables_fused(self, mock_handler):
+        # join, filter, limit and project are executed as one query
+        df = pd.DataFrame([
+            {'a': 1, 'b': 'x'},
+            {'a': 2, 'b': 'y'},
+            {'a': 3, 'b': 'z'},
+        ])
+        df2 = pd.DataFrame([
+            {'a': 1, 'c': 10},
+            {'a': 2, 'c': 20},
+            {'a': 3, 'c': 30},
+        ])
+
+        tables = {'tasks': df, 'tasks2': df2}
+        self.set_handler(mock_handler, name='pg', tables=tables)
+        self.set_handler(mock_handler, name='pg2', tables=tables)
+
+        from mindsdb.api.mysql.mysql_proxy.classes.sql_query import SQLQuery
+
+        fused = []
+        execute_fused_steps = SQLQuery._execute_fused_steps
+
+        def execute_fused_steps_f(sql_query, chain, steps_data):
+            data = execute_fused_steps(sql_query, chain, steps_data)
+            # chain was executed as one query without errors
+            fused.append([type(step).__name__ for step in chain])
+            return data
+
+        with patch.object(SQLQuery, '_execute_fused_steps', execute_fused_steps_f):
+            ret = self.execute("""
+                select t1.b, t2.c from pg.tasks t1
+                join pg2.tasks2 t2 on t1.a=t2.a
+                where t1.a > 1
+                order by t2.c desc
+                limit 1
+            """)
+            assert ret.error_code is None
+            ret_df = self.ret_to_df(ret)
+            assert list(ret_df.columns) == ['b', 'c']
+            assert ret_df.to_dict(orient='records') == [{'b': 'z', 'c': 30}]
+            assert fused == [['JoinStep', 'FilterStep', 'OrderByStep', 'LimitOffsetStep', 'ProjectStep']]
+
+            # aggregation is applied after limit: it is not fused with limit
+            fused.clear()
+            ret = self.execute("""
+                select count(*) as cnt from pg.tasks t1
+                join pg2.tasks2 t2 on t1.a=t2.a
+                limit 2
+            """)
+            assert ret.error_code is None
+            assert self.ret_to_df(ret).to_dict(orient='records') == [{'cnt': 2}]
+            assert fused == [['JoinStep', 'LimitOffsetStep']]
+
+    @patch('mindsdb.integrations.handlers.postgres_handler.Handler')
+    def test_fetch_by_chunks(self, mock_handler):
+        df = pd.DataFrame([
+            {'a': 1, 'b': 'x'},
+            {'a': 2, 'b': None},
+            {'a': 3, 'b': 'z'},
+        ])
+        self.set_handler(mock_handler, name='pg', tables={'tasks': df})
+
+        chunks = []
+
+        def query_stream_f(query, fetch_size):
+            # chunks by 2 rows
+            result_df = mock_handler().query(query).data_frame
+            for i in range(0, len(result_df), 2):
+                chunks.append(i)
+                yield result_df[i: i + 2]
+
+        # handler class supports streaming
+        type(mock_handler()).query_stream = staticmethod(query_stream_f)
+
+        ret = self.execute("select a, b from pg.tasks where a > 0")
+        assert ret.error_code is None
+        ret_df = self.ret_to_df(ret)
+        assert ret_df.to_dict(orient='records') == [
+            {'a': 1, 'b': 'x'},
+            {'a': 2, 'b': None},
+            {'a': 3, 'b': 'z'},
+        ]
+        assert len(chunks) == 2
+
+        # consumer reads rows by chunks: the rest of chunks is fetched while rows are read
+        chunks.clear()
+        sql = "select a, b from pg.tasks where a > 0"
+        self.command_executor.executor = Mock(stream_data=True, sql=sql, sql_lower=sql)
+        ret = self.execute(sql)
+        assert ret.error_code is None
+        assert [c.name for c in ret.columns] == ['a', 'b']
+        assert len(chunks) == 1
+        assert list(ret.data) == [[1, 'x'], [2, None], [3, 'z']]
+        assert len(chunks) == 2
+
+        self.command_executor.executor = None
+        del type(mock_handler()).query_stream
+
+    @patch('mindsdb.integrations.handlers.postgres_handler.Handler')
+    def test_schema_cache(self, mock_handler):
+        from mindsdb.interfaces.database.schema_cache import SchemaCache
+        from mindsdb.integrations.libs.response import RESPONSE_TYPE
+        from mindsdb.integrations.libs.response import HandlerResponse as Response
+
+        df = pd.DataFrame([
+            {'a': 1, 'b': 'x'},
+        ])
+        self.set_handler(mock_handler, name='pg', tables={'tasks': df})
+
+        schema_cache = SchemaCache(ttl=100)
+        with patch('mindsdb.api.mysql.mysql_proxy.datahub.datanodes.information_schema_datanode.get_schema_cache',
+                   return_value=schema_cache), \
+             patch('mindsdb.api.mysql.mysql_proxy.executor.executor_commands.get_schema_cache',
+                   return_value=schema_cache), \
+             patch('mindsdb.api.mysql.mysql_proxy.classes.sql_query.get_schema_cache',
+                   return_value=schema_cache):
+
+            sql = "select table_name from information_schema.tables where table_schema = 'pg'"
+            for _ in range(2):
+                ret = self.execute(sql)
+                assert ret.records == [{'table_name': 'table1'}]
+            assert mock_handler().get_tables.call_count == 1
+
+            ret = self.execute("""
+                select column_name, data_type from information_schema.columns
+                where table_schema = 'pg' and table_name = 'tasks'
+            """)
+            assert ret.records == [
+                {'column_name': 'a', 'data_type': 'bigint'},
+                {'column_name': 'b', 'data_type': 'varchar'},
+            ]
+
+            # cache is invalidated by drop table
+            self.execute('drop table pg.tasks')
+            self.execute(sql)
+            assert mock_handler().get_tables.call_count == 2
+
+            # native query with result doesn't change schema
+            self.execute('select * from pg (select * from tasks)')
+            self.execute(sql)
+            assert mock_handler().get_tables.call_count == 2
+
+            # native query without result can be DDL
+            native_query = mock_handler().native_query.side_effect
+            mock_handler().native_query.side_effect = lambda query: Response(RESPONSE_TYPE.OK)
+            self.execute('select * from pg (alter table tasks add column c int)')
+            mock_handler().native_query.side_effect = native_query
+            self.execute(sql)
+            assert mock_handler().get_tables.call_count == 3
+
+    @patch('mindsdb.integrations.handlers.postgres_handler.Handler')
+    def test_integration_columns_without_cache(self, mock_handler):
+        df = pd.DataFrame([
+            {'a': 1, 'b': 'x'},
+        ])
+        self.set_handler(mock_handler, name='pg', tables={'tasks': df})
+
+        # without cache tables of integration are not scanned
+        ret = self.execute("""
+            select column_name from information_schema.columns
+            where table_schema = 'pg'
+        """)
+        assert ret.error_code is None
+        assert mock_handler().query.call_count == 0
+        assert mock_handler().get_tables.call_count == 0
+
+        # only requested table
+        ret = self.execute("""
+            select column_name from information_schema.columns
+            where table_schema = 'pg' and table_name = 'tasks'
+        """)
+        assert ret.records == [{'column_name': 'a'}, {'column_name': 'b'}]
+        assert mock_handler().query.call_count == 1
+
+    @patch('mindsdb.integrations.handlers.postgres_handler.Handler')
+    def test_not_pooled_handler(self, mock_handler):
+        from mindsdb.interfaces.database.integrations import integration_controller
+        from mindsdb.utilities.context import context as ctx
+
+        df = pd.DataFrame([
+            {'a': 1, 'b': 'x'},
+        ])
+        self.set_handler(mock_handler, name='pg', tables={'tasks': df})
+        mock_handler.return_value.name = 'pg'
+        integration_controller.release_handlers()
+
+        # handler for long-living thread doesn't take slot of the pool
+        handler = integration_controller.get_handler('pg', pooled=False)
+        assert handler is mock_handler.return_value
+        key = ('pg', ctx.company_id)
+        cache = integration_controller.handlers_cache
+        assert len(cache.leased.get(key, {})) == 0
+        assert len(cache.reserved.get(key, set())) == 0
+
+        integration_controller.get_handler('pg')
+        assert len(cache.leased[key]) == 1
+        integration_controller.release_handlers()
+
 
 class TestExecutionTools:
 
@@ -1122,6 +1410,24 @@ class TestExecutionTools:
         df = pd.DataFrame(d)
         query_df(df, 'select * from models')
 
+    def test_query_parquet(self):
+        df = pd.DataFrame([
+            {'a': 1, 'b': 'x', 'c': 0.1},
+            {'a': 2, 'b': None, 'c': 0.2},
+            {'a': 3, 'b': 'z', 'c': None},
+        ])
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = f'{tmp_dir}/data.parquet'
+            df.to_parquet(file_path)
+
+            for sql in (
+                'select * from tbl',
+                'select b, a from tbl where a > 1 order by a desc',
+                'select count(*) as cnt, max(c) from tbl where b is not null',
+            ):
+                ret_df = query_parquet(file_path, sql)
+                assert ret_df.to_dict(orient='records') == query_df(df, sql).to_dict(orient='records')
+
 
 class TestIfExistsIfNotExists(BaseExecutorMockPredictor):
 
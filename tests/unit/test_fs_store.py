@@ -0,0 +1,205 @@
+import os
+import json
+import shutil
+import tempfile
+from pathlib import Path
+
+from mindsdb.utilities.config import Config
+from mindsdb.interfaces.storage.fs import LocalFSStore, DIR_MANIFEST_FILE_NAME
+
+
+class TestLocalFSStore:
+
+    def setup_method(self):
+        # config sets environment variables, restore them for next tests
+        self._environ = dict(os.environ)
+        fdi, cfg_file = tempfile.mkstemp(prefix='mindsdb_conf_')
+        with os.fdopen(fdi, 'w') as fd:
+            json.dump({}, fd)
+        os.environ['MINDSDB_CONFIG_PATH'] = cfg_file
+
+        root = Config()['paths']['root']
+        self.base_dir = Path(tempfile.mkdtemp(dir=root, prefix='fs_store_content_'))
+        self.other_dir = Path(tempfile.mkdtemp(dir=root, prefix='fs_store_other_'))
+
+        self.store = LocalFSStore()
+        self.store.storage = tempfile.mkdtemp(prefix='fs_store_storage_')
+        self.store.chunk_size = 10
+
+    def teardown_method(self):
+        for path in (self.base_dir, self.other_dir, self.store.storage):
+            shutil.rmtree(path, ignore_errors=True)
+        os.environ.clear()
+        os.environ.update(self._environ)
+
+    def _log_writes(self):
+        # log of keys which are written to storage
+        written = []
+        write_object = self.store._write_object
+
+        def _write_object(key, data):
+            written.append(key)
+            write_object(key, data)
+
+        self.store._write_object = _write_object
+        return written
+
+    def test_incremental_sync(self):
+        name = 'predictor_1_1'
+        dir_path = self.base_dir / name
+        (dir_path / 'folder').mkdir(parents=True)
+        (dir_path / 'empty').mkdir()
+        (dir_path / 'big.bin').write_bytes(b'0123456789' * 3 + b'abc')
+        (dir_path / 'folder' / 'small.txt').write_text('small')
+        (dir_path / 'removed.txt').write_text('removed')
+
+        written = self._log_writes()
+        self.store.put(name, str(self.base_dir))
+        # 4 chunks of big.bin are the same: 2 unique chunks, small.txt, removed.txt, manifest
+        assert len(written) == 5
+
+        # copy resource to other folder
+        self.store.get(name, str(self.other_dir))
+        copy_path = self.other_dir / name
+        assert (copy_path / 'big.bin').read_bytes() == b'0123456789' * 3 + b'abc'
+        assert (copy_path / 'folder' / 'small.txt').read_text() == 'small'
+        assert (copy_path / 'empty').is_dir()
+        assert (copy_path / DIR_MANIFEST_FILE_NAME).is_file()
+
+        # only changed chunk is uploaded
+        written.clear()
+        with open(dir_path / 'big.bin', 'ab') as f:
+            f.write(b'd')
+        (dir_path / 'removed.txt').unlink()
+        self.store.put(name, str(self.base_dir))
+        # changed chunk, manifest, marks of unused chunks
+        assert len(written) == 3
+        assert written[1].endswith('manifest.json')
+        assert written[2].endswith('garbage.json')
+
+        # only changed file is downloaded
+        small_mtime = (copy_path / 'folder' / 'small.txt').stat().st_mtime_ns
+        self.store.get(name, str(self.other_dir))
+        assert (copy_path / 'big.bin').read_bytes() == b'0123456789' * 3 + b'abcd'
+        assert (copy_path / 'folder' / 'small.txt').stat().st_mtime_ns == small_mtime
+        assert not (copy_path / 'removed.txt').exists()
+
+        # unused chunks are removed from storage after grace period
+        chunks_path = Path(self.store.storage) / f'{name}.store' / 'chunks'
+        assert len(list(chunks_path.iterdir())) == 5
+        self.store.chunk_grace_period = 0
+        self.store.put(name, str(self.base_dir))
+        assert len(list(chunks_path.iterdir())) == 3
+
+        self.store.delete(name)
+        assert not (Path(self.store.storage) / f'{name}.store').exists()
+
+    def test_changed_during_get(self):
+        name = 'predictor_1_4'
+        dir_path = self.base_dir / name
+        dir_path.mkdir()
+        (dir_path / 'data.txt').write_text('first version')
+        self.store.put(name, str(self.base_dir))
+        old_manifest = self.store._read_manifest(name)
+
+        # new version removes chunks of the old one
+        self.store.chunk_grace_period = 0
+        (dir_path / 'data.txt').write_text('second version')
+        self.store.put(name, str(self.base_dir))
+
+        # get reads the old manifest, then chunks of it are not found
+        manifests = [old_manifest]
+        read_manifest = self.store._read_manifest
+        self.store._read_manifest = lambda remote_name: (
+            manifests.pop() if len(manifests) > 0 else read_manifest(remote_name)
+        )
+        self.store.get(name, str(self.other_dir))
+        assert (self.other_dir / name / 'data.txt').read_text() == 'second version'
+
+    def test_concurrent_put(self):
+        name = 'predictor_1_5'
+        dir_path = self.base_dir / name
+        dir_path.mkdir()
+        (dir_path / 'a.txt').write_text('aaa')
+        (dir_path / 'b.txt').write_text('bbb')
+        self.store.put(name, str(self.base_dir))
+        old_manifest = self.store._read_manifest(name)
+        old_local_manifest = (dir_path / DIR_MANIFEST_FILE_NAME).read_text()
+
+        # put of other process: chunk of b.txt is not used anymore
+        (dir_path / 'b.txt').unlink()
+        self.store.put(name, str(self.base_dir))
+
+        # put which read manifest before it reuses chunk of b.txt and publishes its manifest last
+        (dir_path / 'b.txt').write_text('bbb')
+        (dir_path / DIR_MANIFEST_FILE_NAME).write_text(old_local_manifest)
+        read_manifest = self.store._read_manifest
+        self.store._read_manifest = lambda remote_name: old_manifest
+        self.store.put(name, str(self.base_dir))
+        self.store._read_manifest = read_manifest
+
+        self.store.get(name, str(self.other_dir))
+        assert (self.other_dir / name / 'b.txt').read_text() == 'bbb'
+
+        # after grace period chunk is kept, because it is used by the current manifest
+        self.store.chunk_grace_period = 0
+        (dir_path / 'c.txt').write_text('ccc')
+        self.store.put(name, str(self.base_dir))
+        shutil.rmtree(self.other_dir / name)
+        self.store.get(name, str(self.other_dir))
+        assert (self.other_dir / name / 'b.txt').read_text() == 'bbb'
+
+    def test_upload_marked_chunk(self):
+        name = 'predictor_1_6'
+        dir_path = self.base_dir / name
+        dir_path.mkdir()
+        (dir_path / 'a.txt').write_text('aaa')
+        self.store.put(name, str(self.base_dir))
+        chunk_id = self.store._read_manifest(name)['files']['a.txt']['chunks'][0]
+        (dir_path / 'a.txt').write_text('bbb')
+        self.store.put(name, str(self.base_dir))
+
+        # chunk which is marked as unused is uploaded under new id: the marked one can be deleted
+        (dir_path / 'a.txt').write_text('aaa')
+        self.store.put(name, str(self.base_dir))
+        new_chunk_id = self.store._read_manifest(name)['files']['a.txt']['chunks'][0]
+        assert new_chunk_id != chunk_id
+        assert self.store._chunk_hash(new_chunk_id) == chunk_id
+
+        self.store.chunk_grace_period = 0
+        (dir_path / 'b.txt').write_text('ccc')
+        self.store.put(name, str(self.base_dir))
+
+        self.store.get(name, str(self.other_dir))
+        assert (self.other_dir / name / 'a.txt').read_text() == 'aaa'
+        chunks_path = Path(self.store.storage) / f'{name}.store' / 'chunks'
+        assert len(list(chunks_path.iterdir())) == 2
+
+    def test_compression(self):
+        name = 'predictor_1_2'
+        dir_path = self.base_dir / name
+        dir_path.mkdir()
+        (dir_path / 'data.txt').write_bytes(b'a' * 100)
+
+        self.store.put(name, str(self.base_dir), compression_level=1)
+        chunks_path = Path(self.store.storage) / f'{name}.store' / 'chunks'
+        assert all(path.name.endswith('.z') for path in chunks_path.iterdir())
+
+        self.store.get(name, str(self.other_dir))
+        assert (self.other_dir / name / 'data.txt').read_bytes() == b'a' * 100
+
+    def test_legacy(self):
+        # resource is stored as a copy of folder
+        name = 'predictor_1_3'
+        legacy_path = Path(self.store.storage) / name
+        legacy_path.mkdir()
+        (legacy_path / 'data.txt').write_text('legacy')
+
+        self.store.get(name, str(self.base_dir))
+        assert (self.base_dir / name / 'data.txt').read_text() == 'legacy'
+
+        self.store.put(name, str(self.base_dir))
+        assert not legacy_path.exists()
+
+        self.store.get(name, str(self.other_dir))
+        assert (self.other_dir / name / 'data.txt').read_text() == 'legacy'
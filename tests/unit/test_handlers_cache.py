@@ -0,0 +1,120 @@
+import threading
+import time
+
+import pytest
+
+from mindsdb.interfaces.database.integrations import HandlersCache
+from mindsdb.integrations.libs.response import HandlerStatusResponse
+from mindsdb.utilities.context import context as ctx
+
+
+class FakeHandler:
+    def __init__(self, name, healthy=True):
+        self.name = name
+        self.healthy = healthy
+        self.connected = False
+
+    def connect(self):
+        self.connected = True
+
+    def disconnect(self):
+        self.connected = False
+
+    def check_connection(self):
+        return HandlerStatusResponse(self.healthy)
+
+
+def get_handler(cache, name):
+    handler = cache.get(name)
+    if handler is None:
+        handler = FakeHandler(name)
+        cache.set(handler)
+    return handler
+
+
+def lease(cache, name, company_id=None):
+    def func():
+        ctx.set_default()
+        ctx.company_id = company_id
+        return cache.get(name)
+    return in_thread(func)
+
+
+def in_thread(func):
+    result = []
+    thread = threading.Thread(target=lambda: result.append(func()))
+    thread.start()
+    thread.join()
+    return result[0]
+
+
+class TestHandlersCache:
+
+    def setup_method(self):
+        ctx.set_default()
+
+    def test_reuse(self):
+        cache = HandlersCache()
+
+        handler = get_handler(cache, 'pg')
+        # the same handler for the same thread
+        assert get_handler(cache, 'pg') is handler
+
+        # leased handler is not given to another thread
+        assert lease(cache, 'pg') is None
+
+        # after release it is reused by another thread
+        cache.release()
+        assert lease(cache, 'pg') is handler
+
+        # other company doesn't get it
+        cache.release()
+        assert lease(cache, 'pg', company_id=2) is None
+
+    def test_health_check(self):
+        cache = HandlersCache()
+        cache.health_check_interval = 0
+
+        handler = get_handler(cache, 'pg')
+        handler.healthy = False
+        cache.release()
+
+        # broken connection is not reused
+        assert cache.get('pg') is None
+        assert handler.connected is False
+
+    def test_max_size(self):
+        cache = HandlersCache()
+        # pool is limited by default
+        assert cache.max_size == 20
+
+        cache.max_size = 1
+        cache.timeout = 5
+
+        handler = get_handler(cache, 'pg')
+
+        def release_later():
+            time.sleep(0.5)
+            cache.release(main_thread_id)
+
+        main_thread_id = threading.get_ident()
+        threading.Thread(target=release_later).start()
+
+        # waits when handler is released
+        assert lease(cache, 'pg') is handler
+
+        # timeout
+        cache.timeout = 0.1
+        with pytest.raises(Exception):
+            cache.get('pg')
+
+    def test_delete(self):
+        cache = HandlersCache()
+
+        handler = get_handler(cache, 'pg')
+        cache.delete('pg')
+        # handler in use is disconnected on release
+        assert handler.connected is True
+        cache.release()
+        assert handler.connected is False
+        assert cache.get('pg') is None
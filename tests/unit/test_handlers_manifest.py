@@ -0,0 +1,78 @@
+import ast
+
+from mindsdb.interfaces.database.integrations import IntegrationController
+from mindsdb.integrations.utilities.handlers_manifest import (
+    load_manifest, get_handlers_path, get_missing_dependencies
+)
+
+
+def read_constants(path, values=None):
+    # module level constants of the file, without import of it
+    if values is None:
+        values = {}
+    for node in ast.parse(path.read_text()).body:
+        if isinstance(node, ast.ImportFrom) and node.module == '__about__':
+            about = read_constants(path.parent.joinpath('__about__.py'))
+            for alias in node.names:
+                if alias.name in about:
+                    values[alias.asname or alias.name] = about[alias.name]
+        elif isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name):
+            target, value = node.targets[0].id, node.value
+            if isinstance(value, ast.Constant):
+                values[target] = value.value
+            elif isinstance(value, ast.Name) and value.id in values:
+                values[target] = values[value.id]
+            elif isinstance(value, ast.Attribute) and getattr(value.value, 'id', None) == 'HANDLER_TYPE':
+                values[target] = value.attr.lower()
+    return values
+
+
+class TestHandlersManifest:
+
+    def test_lazy_import(self):
+        manifest = load_manifest()
+        assert manifest is not None
+
+        controller = IntegrationController()
+        handlers = controller.get_handlers_import_status()
+
+        # every handler from manifest is listed without import,
+        # result of import is expected by installed dependencies
+        for name, manifest_meta in manifest.items():
+            missing = get_missing_dependencies(manifest_meta['dependencies'])
+            assert handlers[name]['import']['success'] is (len(missing) == 0)
+            assert handlers[name]['import']['folder'] == manifest_meta['folder']
+            assert handlers[name].get('connection_args') == manifest_meta.get('connection_args')
+        assert 'data' in handlers['postgres']['icon']
+
+        # module is imported on first access
+        assert 'sqlite' in controller._not_imported_handlers
+        module = controller.handler_modules['sqlite']
+        assert module.name == 'sqlite'
+        assert 'sqlite' not in controller._not_imported_handlers
+        assert controller.get_handlers_import_status()['sqlite']['import']['success'] is True
+        assert 'postgres' in controller._not_imported_handlers
+
+        handler_meta = controller.get_handler_meta('postgres')
+        assert handler_meta['import']['success'] is True
+        assert 'postgres' in controller.handler_modules
+
+        assert 'not_existing_handler' not in controller.handler_modules
+        assert controller.handler_modules.get('not_existing_handler') is None
+        assert controller.get_handler_meta('not_existing_handler') is None
+
+    def test_manifest_is_actual(self):
+        # manifest has to be rebuilt if metadata of handler is changed
+        handlers_path = get_handlers_path()
+        controller = IntegrationController()
+        for name, manifest_meta in load_manifest().items():
+            handler_dir = handlers_path.joinpath(manifest_meta['folder'])
+            values = read_constants(handler_dir.joinpath('__init__.py'))
+
+            assert values['name'] == name
+            for attr in ('type', 'title', 'description', 'version'):
+                if attr in values:
+                    assert manifest_meta.get(attr) == values[attr], f'{name}: {attr}'
+            if 'icon_path' in values:
+                assert manifest_meta['icon']['name'] == values['icon_path'], name
+            assert manifest_meta['dependencies'] == controller._read_dependencies(handler_dir), name
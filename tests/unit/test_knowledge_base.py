@@ -2,6 +2,7 @@ import tempfile
 import time
 from unittest.mock import patch
 
+import numpy as np
 import pandas as pd
 import pytest
 from mindsdb_sql import parse_sql
@@ -363,3 +364,191 @@ class TestKnowledgeBase(BaseExecutorTest):
         """
         df = self.run_sql(sql)
         assert df.shape[0] == 1
+
+
+class TestKnowledgeBaseSearch:
+
+    def setup_method(self):
+        from mindsdb.interfaces.knowledge_base import controller
+        controller._query_embeddings.clear()
+
+    def test_batched_search(self):
+        from types import SimpleNamespace
+        from mindsdb.integrations.libs.vectordatabase_handler import VectorStoreHandler
+        from mindsdb.interfaces.knowledge_base.controller import KnowledgeBaseTable, invalidate_embedding_model
+
+        embedded, searches, selects = [], [], []
+
+        class FakeVectorDB(VectorStoreHandler):
+            def disconnect(self):
+                pass
+
+            def search(self, table_name, vectors, limit, conditions=None):
+                searches.append((vectors.tolist(), limit, conditions))
+                # the row 'both' is found by every vector
+                return [
+                    pd.DataFrame({
+                        "id": [f"row{int(vector[0])}", "both"],
+                        "content": ["", ""],
+                        "metadata": [{}, {}],
+                        "embeddings": [[], []],
+                        "distance": [vector[0] / 10, 0.5],
+                    })
+                    for vector in vectors
+                ]
+
+            def select(self, table_name, columns=None, conditions=None, offset=None, limit=None):
+                selects.append(conditions)
+                return pd.DataFrame({"id": ["row1"], "content": [""], "metadata": [{}]})
+
+        def df_to_embeddings(df):
+            embedded.append(list(df["content"]))
+            return pd.DataFrame({"embeddings": [np.array([len(text), 1], dtype=np.float32) for text in df["content"]]})
+
+        kb = SimpleNamespace(embedding_model_id=1, vector_database_table="tbl")
+        kb_table = KnowledgeBaseTable(kb, session=None)
+        kb_table._vector_db = FakeVectorDB("fake")
+        kb_table._df_to_embeddings = df_to_embeddings
+        model = {"fingerprint": "model_1/a"}
+        kb_table._get_embedding_model = lambda: model
+
+        query = parse_sql("select * from kb where content in ('aaa', 'b', 'aaa') and k = 1 limit 3", dialect="mindsdb")
+        df = kb_table.select_query(query)
+
+        # questions are embedded by one call and searched by one request
+        assert embedded == [["aaa", "b"]]
+        assert len(searches) == 1
+        vectors, limit, conditions = searches[0]
+        # repeated question is searched once
+        assert vectors == [[3, 1], [1, 1]] and limit == 3
+        assert [condition.column for condition in conditions] == ["metadata.k"]
+
+        # rows are returned for every question
+        assert list(df.columns) == ["question", "id", "content", "metadata", "distance"]
+        assert list(df["question"]) == ["aaa", "aaa", "b", "b"]
+        assert list(df["id"]) == ["row3", "both", "row1", "both"]
+
+        # embedding of repeated question is taken from cache
+        kb_table.select_query(parse_sql("select * from kb where content = 'b'", dialect="mindsdb"))
+        assert embedded == [["aaa", "b"]]
+        assert selects[0][0].value == [[1, 1]]
+
+        # offset is applied to rows of every question
+        searches.clear()
+        query = parse_sql("select * from kb where content in ('aaa', 'b') limit 1 offset 1", dialect="mindsdb")
+        df = kb_table.select_query(query)
+        assert searches[0][1] == 2
+        assert list(df["question"]) == ["aaa", "b"]
+        assert list(df["id"]) == ["both", "both"]
+
+        # question is embedded again if model is changed
+        model["fingerprint"] = "model_1/b"
+        kb_table.select_query(parse_sql("select * from kb where content = 'b'", dialect="mindsdb"))
+        assert embedded == [["aaa", "b"], ["b"]]
+
+        # and if model is dropped
+        invalidate_embedding_model(1)
+        kb_table.select_query(parse_sql("select * from kb where content = 'b'", dialect="mindsdb"))
+        assert embedded == [["aaa", "b"], ["b"], ["b"]]
+
+    def test_embedding_model_cache(self):
+        from types import SimpleNamespace
+        from mindsdb.interfaces.knowledge_base import controller
+        from mindsdb.interfaces.knowledge_base.controller import KnowledgeBaseTable, invalidate_embedding_model
+
+        records = {
+            "Predictor": SimpleNamespace(
+                name="emb", project_id=1, to_predict=["embeddings"], learn_args={}, version=1, training_stop_at=None
+            ),
+            "Project": SimpleNamespace(name="mindsdb"),
+        }
+        reads = []
+
+        def query(model):
+            reads.append(model.__name__)
+            return SimpleNamespace(filter_by=lambda **kwargs: SimpleNamespace(first=lambda: records[model.__name__]))
+
+        def get_model(model_id):
+            kb = SimpleNamespace(embedding_model_id=model_id)
+            return KnowledgeBaseTable(kb, session=None)._get_embedding_model()
+
+        invalidate_embedding_model()
+        with patch.object(controller.db, "session", SimpleNamespace(query=query)):
+            assert get_model(1)["name"] == "emb"
+            assert get_model(1)["name"] == "emb"
+            assert len(reads) == 2
+
+            # renamed model is read again after invalidation
+            records["Predictor"].name = "emb2"
+            invalidate_embedding_model(1)
+            assert get_model(1)["name"] == "emb2"
+            assert len(reads) == 4
+
+            # fingerprint is changed with parameters of the model
+            fingerprint = get_model(1)["fingerprint"]
+            records["Predictor"].learn_args = {"using": {"size": 3}}
+            invalidate_embedding_model(1)
+            assert get_model(1)["fingerprint"] != fingerprint
+            assert len(reads) == 6
+
+            # description is read again after ttl
+            with patch.object(controller, "EMBEDDING_MODELS_CACHE_TTL", 0):
+                get_model(1)
+            assert len(reads) == 8
+
+            # size of cache is limited
+            with patch.object(controller, "EMBEDDING_MODELS_CACHE_SIZE", 2):
+                for model_id in range(10):
+                    get_model(model_id)
+                assert list(controller._embedding_models.keys()) == [8, 9]
+        invalidate_embedding_model()
+
+
+class TestKnowledgeBaseSubselect(BaseExecutorTest):
+    run_sql = TestKnowledgeBase.run_sql
+    wait_predictor = TestKnowledgeBase.wait_predictor
+
+    @patch("mindsdb.integrations.handlers.postgres_handler.Handler")
+    def test_content_in_select(self, mock_handler):
+        from mindsdb.interfaces.knowledge_base import controller
+        from mindsdb.interfaces.knowledge_base.controller import KnowledgeBaseTable
+
+        controller._query_embeddings.clear()
+        questions = pd.DataFrame({"question": ["cat", "dog", "cat"]})
+        self.set_handler(mock_handler, "pg", tables={"questions": questions})
+
+        self.run_sql(
+            """
+            CREATE MODEL emb
+            PREDICT embeddings
+            USING
+                engine='langchain_embedding',
+                class = 'FakeEmbeddings',
+                size = 2,
+                input_columns = ['content']
+            """
+        )
+        self.wait_predictor("mindsdb", "emb")
+        self.run_sql("CREATE KNOWLEDGE BASE kb USING MODEL = emb")
+
+        vectors = {"cat": [1, 0], "kitten": [0.9, 0.2], "dog": [0, 1], "puppy": [0.2, 0.9]}
+        embedded = []
+
+        def df_to_embeddings(kb_table, df):
+            embedded.append(list(df["content"]))
+            return pd.DataFrame(
+                {"embeddings": [np.array(vectors[text], dtype=np.float32) for text in df["content"]]},
+                index=df.index
+            )
+
+        with patch.object(KnowledgeBaseTable, "_df_to_embeddings", df_to_embeddings):
+            self.run_sql("INSERT INTO kb (id, content) VALUES ('1', 'kitten'), ('2', 'puppy')")
+            embedded.clear()
+
+            df = self.run_sql("SELECT * FROM kb WHERE content IN (SELECT question FROM pg.questions) LIMIT 1")
+
+        # questions from subselect are embedded by one call
+        assert embedded == [["cat", "dog"]]
+        # the closest row is found for every question
+        assert list(df["question"]) == ["cat", "dog"]
+        assert list(df["content"]) == ["kitten", "puppy"]
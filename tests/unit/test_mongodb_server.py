@@ -8,6 +8,7 @@ import tempfile
 import os
 
 from pymongo import MongoClient
+from bson.int64 import Int64
 from mindsdb_sql import parse_sql
 
 import mindsdb.api.mongo.functions as helpers
@@ -100,6 +101,33 @@ class TestMongoDBServer(BaseUnitTest):
         '''
         assert parse_sql(expected_sql, 'mindsdb').to_string() == ast.to_string()
 
+    def t_cursor_batches(self, client_con, mock_executor):
+        # ==== test result by batches ===
+        mock_executor.side_effect = lambda x: ExecuteAnswer(
+            ANSWER_TYPE.TABLE,
+            columns=[Column('a')],
+            data=[[i] for i in range(250)]
+        )
+
+        res = list(client_con.mindsdb.fish_model1.find({}, batch_size=40))
+        assert res == [{'a': i} for i in range(250)]
+
+        # default size of the first batch
+        res = list(client_con.mindsdb.fish_model1.find({}))
+        assert len(res) == 250
+
+        # not finished cursor is killed
+        cursor = client_con.mindsdb.fish_model1.find({}, batch_size=40)
+        assert next(cursor) == {'a': 0}
+        assert cursor.cursor_id != 0
+        cursor.close()
+
+        ret = client_con.mindsdb.command('killCursors', 'fish_model1', cursors=[Int64(12345)])
+        assert ret['cursorsNotFound'] == [12345]
+
+        res = list(client_con.mindsdb.fish_model1.aggregate([{'$match': {}}], batchSize=100))
+        assert len(res) == 250
+
     def t_single_join(self, client_con, mock_executor):
         # ==== test join ===
 
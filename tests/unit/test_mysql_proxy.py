@@ -0,0 +1,246 @@
+import struct
+from types import SimpleNamespace
+
+import pytest
+
+from mindsdb.api.mysql.mysql_proxy.data_types.mysql_datum import lenenc_int, lenenc_str
+from mindsdb.api.mysql.mysql_proxy.data_types.mysql_packet import Packet
+from mindsdb.api.mysql.mysql_proxy.data_types.mysql_packets.resultset_row_package import ResultsetRowPacket
+from mindsdb.api.mysql.mysql_proxy.data_types.mysql_packets.binary_resultset_row_package import BinaryResultsetRowPacket
+from mindsdb.api.mysql.mysql_proxy.libs.constants.mysql import TYPES, NULL_VALUE, MAX_PACKET_SIZE
+from mindsdb.api.mysql.mysql_proxy.libs.constants.response_type import RESPONSE_TYPE
+from mindsdb.api.mysql.mysql_proxy.mysql_proxy import MysqlProxy, SQLAnswer
+from mindsdb.utilities import log
+
+
+class FakeSocket:
+    def __init__(self):
+        self.sent = []
+
+    def sendall(self, data):
+        self.sent.append(data)
+
+
+class FakeSession:
+    logging = log.getLogger(__name__)
+
+    def __init__(self):
+        self.packet_sequence_number = 1
+
+    def inc_packet_sequence_number(self):
+        self.packet_sequence_number = (self.packet_sequence_number + 1) % 256
+
+
+def make_proxy(deprecate_eof=True, rows_batch_size=2):
+    # proxy without connection to the client
+    proxy = MysqlProxy.__new__(MysqlProxy)
+    proxy.socket = FakeSocket()
+    proxy.session = FakeSession()
+    proxy.client_capabilities = SimpleNamespace(DEPRECATE_EOF=deprecate_eof)
+    proxy.rows_batch_size = rows_batch_size
+    return proxy
+
+
+def split_packets(data):
+    # list of (seq, body)
+    packets = []
+    pos = 0
+    while pos < len(data):
+        length = struct.unpack('<I', data[pos: pos + 3] + b'\x00')[0]
+        packets.append((data[pos + 3], data[pos + 4: pos + 4 + length]))
+        pos += 4 + length
+    return packets
+
+
+def read_lenenc_str(body, pos):
+    # only one byte lengths are used in tests
+    length = body[pos]
+    return body[pos + 1: pos + 1 + length], pos + 1 + length
+
+
+def parse_column_definition(body):
+    pos = 0
+    names = []
+    for _ in range(6):
+        name, pos = read_lenenc_str(body, pos)
+        names.append(name.decode())
+    # fixed length of rest fields
+    pos += 1
+    _charset, length, col_type = struct.unpack('<HIB', body[pos: pos + 7])
+    return {'name': names[5], 'length': length, 'type': col_type}
+
+
+def parse_text_row(body):
+    values = []
+    pos = 0
+    while pos < len(body):
+        if body[pos: pos + 1] == NULL_VALUE:
+            values.append(None)
+            pos += 1
+        else:
+            value, pos = read_lenenc_str(body, pos)
+            values.append(value.decode())
+    return values
+
+
+class TestSendQueryAnswer:
+
+    def test_table_answer(self):
+        proxy = make_proxy(rows_batch_size=2)
+        columns = [
+            {'name': 'id', 'type': TYPES.MYSQL_TYPE_LONGLONG},
+            {'name': 'name', 'type': TYPES.MYSQL_TYPE_VAR_STRING},
+            {'name': 'created', 'type': TYPES.MYSQL_TYPE_DATETIME},
+        ]
+        data = [
+            [1, 'a', '2020-01-01 00:00:00'],
+            [2, None, None],
+            [None, 'c', '2020-01-03 00:00:00'],
+            [4, 'dd', None],
+            [5, 'e', '2020-01-05 00:00:00'],
+        ]
+        proxy.send_query_answer(SQLAnswer(RESPONSE_TYPE.TABLE, columns=columns, data=iter(data)))
+
+        # header, 3 batches of rows and last packet are sent separately
+        assert len(proxy.socket.sent) == 5
+
+        packets = split_packets(b''.join(proxy.socket.sent))
+        # column count, columns, rows, OK packet
+        assert len(packets) == 1 + len(columns) + len(data) + 1
+
+        # sequence numbers are continuous between batches
+        assert [seq for seq, _ in packets] == list(range(1, len(packets) + 1))
+
+        assert packets[0][1] == bytes([len(columns)])
+
+        # length of column is defined by type
+        definitions = [parse_column_definition(body) for _, body in packets[1: 1 + len(columns)]]
+        assert definitions == [
+            {'name': 'id', 'length': 20, 'type': TYPES.MYSQL_TYPE_LONGLONG},
+            {'name': 'name', 'length': 0xFFFF, 'type': TYPES.MYSQL_TYPE_VAR_STRING},
+            {'name': 'created', 'length': 26, 'type': TYPES.MYSQL_TYPE_DATETIME},
+        ]
+
+        rows = [parse_text_row(body) for _, body in packets[1 + len(columns): -1]]
+        assert rows == [
+            [None if value is None else str(value) for value in row]
+            for row in data
+        ]
+
+        # OK packet with EOF header
+        assert packets[-1][1][0] == 0xFE
+
+    def test_table_answer_eof(self):
+        # client without DEPRECATE_EOF gets EOF packet after columns
+        proxy = make_proxy(deprecate_eof=False, rows_batch_size=10)
+        columns = [{'name': 'x', 'type': TYPES.MYSQL_TYPE_VAR_STRING}]
+        proxy.send_query_answer(SQLAnswer(RESPONSE_TYPE.TABLE, columns=columns, data=[]))
+
+        packets = split_packets(b''.join(proxy.socket.sent))
+        # column count, column, EOF, EOF
+        assert len(packets) == 4
+        assert packets[2][1][0] == 0xFE
+        assert packets[3][1][0] == 0xFE
+        assert proxy.session.packet_sequence_number == 5
+
+    def test_table_answer_error_in_rows(self):
+        # rows are read while they are sent: error finishes result with error packet
+        proxy = make_proxy(rows_batch_size=1)
+        columns = [{'name': 'x', 'type': TYPES.MYSQL_TYPE_VAR_STRING}]
+
+        def rows():
+            yield ['a']
+            raise Exception('connection is lost')
+
+        answer = SQLAnswer(RESPONSE_TYPE.TABLE, columns=columns, data=rows())
+        proxy.send_query_answer(answer)
+
+        assert answer.type == RESPONSE_TYPE.ERROR
+        assert answer.error_message == 'connection is lost'
+
+        packets = split_packets(b''.join(proxy.socket.sent))
+        # column count, column, row, error
+        assert len(packets) == 4
+        assert parse_text_row(packets[2][1]) == ['a']
+        assert packets[3][1][0] == 0xFF
+        assert [seq for seq, _ in packets] == [1, 2, 3, 4]
+
+
+class TestRowPackets:
+
+    def test_lenenc(self):
+        assert lenenc_int(0) == b'\x00'
+        assert lenenc_int(250) == b'\xfa'
+        assert lenenc_int(251) == b'\xfc\xfb\x00'
+        assert lenenc_int(0xFFFF) == b'\xfc\xff\xff'
+        assert lenenc_int(0x10000) == b'\xfd\x00\x00\x01'
+        assert lenenc_int(0xFFFFFF) == b'\xfd\xff\xff\xff'
+        assert lenenc_int(0x1000000) == b'\xfe' + (0x1000000).to_bytes(8, 'little')
+        assert lenenc_str(b'abc') == b'\x03abc'
+
+    def test_text_rows(self):
+        rows = [
+            [1, 'a', None, 1.5],
+            [None, 'ыы', 'x' * 300, 0],
+        ]
+        session = FakeSession()
+        expected = b''
+        for row in rows:
+            expected += ResultsetRowPacket(data=row, session=session).accum()
+            session.inc_packet_sequence_number()
+
+        # the same bytes as packets created one by one
+        assert ResultsetRowPacket.encode_rows(rows, 1) == (expected, 3)
+        assert ResultsetRowPacket.encode_rows([], 1) == (b'', 1)
+        assert ResultsetRowPacket.encode_rows([[], []], 1) == (b'\x00\x00\x00\x01\x00\x00\x00\x02', 3)
+
+    def test_binary_rows(self):
+        columns = [
+            {'type': TYPES.MYSQL_TYPE_LONGLONG},
+            {'type': TYPES.MYSQL_TYPE_DOUBLE},
+            {'type': TYPES.MYSQL_TYPE_VAR_STRING},
+            {'type': TYPES.MYSQL_TYPE_DATE},
+        ] * 3
+        rows = [
+            [1, 1.5, 'a', '2020-01-02'] * 3,
+            [None, 2, None, None] * 3,
+            [None] * 12,
+        ]
+        session = FakeSession()
+        expected = b''
+        for row in rows:
+            expected += BinaryResultsetRowPacket(data=row, columns=columns, session=session).accum()
+            session.inc_packet_sequence_number()
+
+        assert BinaryResultsetRowPacket.encode_rows(rows, 1, columns) == (expected, 4)
+
+        # null bitmap with offset of 2 bits: 12 columns take 2 bytes
+        body = split_packets(expected)[2][1]
+        assert body == b'\x00\xfc\x3f'
+
+    def test_binary_rows_unsupported_type(self):
+        columns = [{'type': TYPES.MYSQL_TYPE_LONGLONG}, {'type': TYPES.MYSQL_TYPE_TIME}]
+
+        # column without values is encoded
+        data, seq = BinaryResultsetRowPacket.encode_rows([[1, None], [2, None]], 1, columns)
+        assert seq == 3
+        assert split_packets(data)[0][1] == b'\x00\x08' + struct.pack('<q', 1)
+
+        with pytest.raises(Exception):
+            BinaryResultsetRowPacket.encode_rows([[1, '10:00:00']], 1, columns)
+
+    def test_pack_bodies(self):
+        assert Packet.pack_bodies([b'ab', b''], 255) == (b'\x02\x00\x00\xffab\x00\x00\x00\x00', 1)
+
+        # big payload is split to packets of max size, the last packet is shorter
+        body = b'x' * (MAX_PACKET_SIZE + 5)
+        data, seq = Packet.pack_bodies([body, b'y'], 3)
+        packets = split_packets(data)
+        assert [(seq, len(part)) for seq, part in packets] == [(3, MAX_PACKET_SIZE), (4, 5), (5, 1)]
+        assert b''.join(part for _, part in packets[:2]) == body
+        assert seq == 6
+
+        # payload of exactly max size is followed by empty packet
+        data, seq = Packet.pack_bodies([b'x' * MAX_PACKET_SIZE], 0)
+        assert [(seq, len(part)) for seq, part in split_packets(data)] == [(0, MAX_PACKET_SIZE), (1, 0)]
+        assert seq == 2
@@ -0,0 +1,81 @@
+from collections import namedtuple
+from decimal import Decimal
+from unittest.mock import patch
+
+import pandas as pd
+from psycopg.postgres import types
+
+from mindsdb_sql import parse_sql
+
+from mindsdb.integrations.handlers.postgres_handler.postgres_handler import PostgresHandler
+
+Column = namedtuple('Column', ['name', 'type_code'])
+
+
+class FakeCursor:
+    def __init__(self, description, rows):
+        self.description = description
+        self.rows = rows
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def execute(self, query):
+        pass
+
+    def fetchmany(self, size):
+        result, self.rows = self.rows[:size], self.rows[size:]
+        return result
+
+
+class FakeConnection:
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def cursor(self, name=None):
+        return self._cursor
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+
+class TestPostgresHandler:
+
+    def test_query_stream_dtypes(self):
+        description = [
+            Column('a', types.get('int4').oid),
+            Column('b', types.get('numeric').oid),
+            Column('c', types.get('text').oid),
+        ]
+        rows = [
+            (1, Decimal('1.5'), 'x'),
+            (2, Decimal('2.5'), 'y'),
+            # int column is empty in the chunk
+            (None, None, 'z'),
+            (None, Decimal('4'), None),
+            (5, Decimal('5'), 'w'),
+        ]
+        handler = PostgresHandler('pg', connection_data={})
+        connection = FakeConnection(FakeCursor(description, rows))
+
+        with patch.object(handler, 'connect', return_value=connection):
+            query = parse_sql('select * from tbl', dialect='mindsdb')
+            chunks = list(handler.query_stream(query, fetch_size=2))
+
+        assert len(chunks) == 3
+        assert str(chunks[1]['a'].dtype) == 'float64'
+        assert all(str(df['b'].dtype) == 'float64' for df in chunks)
+
+        # dtypes are the same as for the whole result
+        df = pd.concat(chunks, ignore_index=True)
+        full_df = pd.DataFrame(rows, columns=['a', 'b', 'c'])
+        handler._cast_dtypes(full_df, description)
+        pd.testing.assert_frame_equal(df, full_df)
+        assert df['a'].isnull().tolist() == [False, False, True, True, False]
+        assert df['b'].tolist()[:2] == [1.5, 2.5]
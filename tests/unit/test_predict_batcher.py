@@ -0,0 +1,93 @@
+import threading
+
+import pandas as pd
+
+from mindsdb.integrations.libs.base import BaseMLEngine
+from mindsdb.integrations.libs.predict_batcher import PredictBatcher, is_batchable
+
+
+class TestPredictBatcher:
+
+    def run_concurrent(self, batcher, predict_fn, count=5):
+        results = [None] * count
+        errors = []
+
+        def call(i):
+            df = pd.DataFrame([{'a': i}, {'a': i * 10}])
+            try:
+                results[i] = batcher.predict('key', df, predict_fn)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=call, args=(i,)) for i in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results, errors
+
+    def test_batch(self):
+        calls = []
+
+        def predict_fn(df):
+            calls.append(len(df))
+            return pd.DataFrame({'b': df['a'] + 1})
+
+        batcher = PredictBatcher(window=0.5, max_rows=100)
+        results, errors = self.run_concurrent(batcher, predict_fn)
+
+        assert errors == []
+        # all calls were coalesced
+        assert calls == [10]
+        for i, result in enumerate(results):
+            assert list(result['b']) == [i + 1, i * 10 + 1]
+
+    def test_max_rows(self):
+        calls = []
+
+        def predict_fn(df):
+            calls.append(len(df))
+            return pd.DataFrame({'b': df['a'] + 1})
+
+        batcher = PredictBatcher(window=0.5, max_rows=4)
+        results, errors = self.run_concurrent(batcher, predict_fn)
+
+        assert errors == []
+        assert sum(calls) == 10
+        assert max(calls) <= 4
+        for i, result in enumerate(results):
+            assert list(result['b']) == [i + 1, i * 10 + 1]
+
+    def test_not_splittable(self):
+        # engine returns one row for any input: every call is predicted separately
+        def predict_fn(df):
+            return pd.DataFrame({'b': [df['a'].sum()]})
+
+        batcher = PredictBatcher(window=0.5, max_rows=100)
+        results, errors = self.run_concurrent(batcher, predict_fn)
+
+        assert errors == []
+        for i, result in enumerate(results):
+            assert list(result['b']) == [i * 11]
+
+    def test_error(self):
+        def predict_fn(df):
+            raise RuntimeError('predict error')
+
+        batcher = PredictBatcher(window=0.5, max_rows=100)
+        results, errors = self.run_concurrent(batcher, predict_fn)
+
+        assert len(errors) == 5
+
+    def test_is_batchable(self):
+        class RowWiseEngine(BaseMLEngine):
+            row_wise_predict = True
+
+        # engine has to declare that rows are predicted independently
+        assert is_batchable(BaseMLEngine, {}) is False
+        assert is_batchable(RowWiseEngine, {'target': 'y'}) is True
+        assert is_batchable(RowWiseEngine, None) is True
+
+        # time series model uses previous rows
+        learn_args = {'timeseries_settings': {'is_timeseries': True, 'order_by': 't'}}
+        assert is_batchable(RowWiseEngine, learn_args) is False
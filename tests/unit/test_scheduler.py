@@ -0,0 +1,57 @@
+import threading
+import datetime as dt
+from unittest.mock import patch, MagicMock
+
+
+class TestScheduler:
+
+    @patch('mindsdb.interfaces.jobs.scheduler.db')
+    @patch('mindsdb.interfaces.jobs.scheduler.JobsExecutor')
+    def test_concurrency_limits(self, jobs_executor, db_mock):
+        # mindsdb modules can be reloaded by other tests
+        from mindsdb.interfaces.jobs.scheduler import Scheduler
+
+        now = dt.datetime.now()
+        records = {
+            record_id: MagicMock(id=record_id, company_id=company_id, next_run_at=now - dt.timedelta(minutes=record_id))
+            for record_id, company_id in ((1, 1), (2, 1), (3, 1), (4, 2))
+        }
+        finished = []
+        # finished job is planned in future
+        jobs_executor().get_next_tasks.side_effect = lambda: sorted(
+            [record for record in records.values() if record.id not in finished],
+            key=lambda x: x.next_run_at
+        )
+        jobs_executor().lock_record.side_effect = lambda record_id: record_id * 10
+        db_mock.Jobs.query.get.side_effect = lambda record_id: records[record_id]
+
+        started = []
+        release = threading.Event()
+
+        def execute_async(record_id, history_id):
+            started.append(record_id)
+            release.wait(5)
+            finished.append(record_id)
+
+        scheduler = Scheduler({'jobs': {'max_workers': 3, 'max_company_workers': 2}})
+        try:
+            with patch('mindsdb.interfaces.jobs.scheduler.execute_async', execute_async):
+                scheduler.check_timetable(wait=False)
+
+                # the oldest jobs of the first company and the job of the second company are running
+                assert set(scheduler._running.keys()) == {3, 2, 4}
+                assert [item[1] for item in scheduler._queue] == [1]
+
+                # running jobs are not started twice
+                scheduler.check_timetable(wait=False)
+                assert len(scheduler._running) == 3
+
+                release.set()
+                scheduler.check_timetable()
+        finally:
+            scheduler.stop_thread()
+
+        assert sorted(started) == [1, 2, 3, 4]
+        assert sorted(finished) == [1, 2, 3, 4]
+        assert started[-1] == 1
+        assert len(scheduler._running) == 0 and len(scheduler._queue) == 0
@@ -0,0 +1,89 @@
+import time
+from unittest import mock
+
+from mindsdb.interfaces.database.schema_cache import SchemaCache
+from mindsdb.utilities.context import context as ctx
+
+
+class Fetcher:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return [f'table_{self.calls}']
+
+
+class TestSchemaCache:
+
+    def setup_method(self):
+        ctx.set_default()
+
+    def test_ttl(self):
+        cache = SchemaCache(ttl=0.2)
+        fetch = Fetcher()
+
+        assert cache.get_tables('db', fetch) == ['table_1']
+        # name is case insensitive
+        assert cache.get_tables('DB', fetch) == ['table_1']
+        assert fetch.calls == 1
+
+        time.sleep(0.3)
+        assert cache.get_tables('db', fetch) == ['table_2']
+        assert fetch.calls == 2
+
+    def test_invalidate(self):
+        cache = SchemaCache(ttl=100)
+        fetch_tables = Fetcher()
+        fetch_columns = Fetcher()
+        fetch_other = Fetcher()
+
+        cache.get_tables('db', fetch_tables)
+        cache.get_columns('db', 'tbl', fetch_columns)
+        cache.get_tables('other_db', fetch_other)
+
+        cache.invalidate('db')
+
+        assert cache.get_tables('db', fetch_tables) == ['table_2']
+        assert cache.get_columns('db', 'tbl', fetch_columns) == ['table_2']
+        # other integrations are not affected
+        assert cache.get_tables('other_db', fetch_other) == ['table_1']
+
+    def test_invalidate_during_fetch(self):
+        cache = SchemaCache(ttl=100)
+
+        def fetch():
+            # table is dropped while metadata is fetched
+            cache.invalidate('db')
+            return ['old_table']
+
+        assert cache.get_tables('db', fetch) == ['old_table']
+        # outdated result is not cached
+        assert cache.get_tables('db', Fetcher()) == ['table_1']
+
+    def test_companies(self):
+        cache = SchemaCache(ttl=100)
+        fetch = Fetcher()
+
+        cache.get_tables('db', fetch)
+        ctx.company_id = 2
+        assert cache.get_tables('db', fetch) == ['table_2']
+        assert fetch.calls == 2
+
+    @mock.patch('mindsdb.interfaces.database.schema_cache.db')
+    def test_background_refresh(self, mock_db):
+        cache = SchemaCache(ttl=100, refresh_ttl=0.1)
+        fetch = Fetcher()
+
+        assert cache.get_tables('db', fetch) == ['table_1']
+        time.sleep(0.2)
+
+        # stale value is returned, refresh is in background
+        assert cache.get_tables('db', fetch) == ['table_1']
+        for _ in range(200):
+            if fetch.calls == 2 and len(cache._refreshing) == 0:
+                break
+            time.sleep(0.05)
+
+        assert cache.get_tables('db', fetch) == ['table_2']
+        assert fetch.calls == 2
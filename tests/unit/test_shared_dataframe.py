@@ -0,0 +1,32 @@
+import pandas as pd
+import pytest
+
+from mindsdb.integrations.libs.shared_dataframe import SharedDataFrame, from_shared
+
+
+class TestSharedDataFrame:
+
+    def test_read(self):
+        df = pd.DataFrame({
+            'a': range(1000),
+            'b': ['x', None] * 500,
+            'c': pd.date_range('2020-01-01', periods=1000, freq='h')
+        })
+
+        shared_df = SharedDataFrame.create(df)
+        assert shared_df is not None
+
+        df2 = from_shared(shared_df, unlink=True)
+        pd.testing.assert_frame_equal(df, df2)
+
+        # memory is free
+        with pytest.raises(FileNotFoundError):
+            shared_df.read()
+
+    def test_not_convertible(self):
+        df = pd.DataFrame([[1, {1: 3}], [2, 'x']], columns=['a', 'b'])
+        assert SharedDataFrame.create(df) is None
+
+    def test_other_objects(self):
+        assert from_shared(None) is None
+        assert from_shared('text') == 'text'
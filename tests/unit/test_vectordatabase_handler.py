@@ -0,0 +1,101 @@
+import os
+import json
+import tempfile
+
+import numpy as np
+import pandas as pd
+from mindsdb_sql import parse_sql
+
+from mindsdb.integrations.libs.vectordatabase_handler import VectorStoreHandler, TableField, to_vector
+
+
+class FakeVectorStore(VectorStoreHandler):
+    def __init__(self):
+        super().__init__('fake')
+        self.calls = []
+        self.rows = {}
+
+    def disconnect(self):
+        pass
+
+    def select(self, table_name, columns=None, conditions=None, offset=None, limit=None):
+        ids = [id for id in conditions[0].value if id in self.rows]
+        self.calls.append(('select', len(conditions[0].value)))
+        return pd.DataFrame({TableField.ID.value: ids})
+
+    def insert(self, table_name, data):
+        self.calls.append(('insert', list(data[TableField.ID.value])))
+        for row in data.to_dict('records'):
+            self.rows[row[TableField.ID.value]] = row
+
+    def update(self, table_name, data, key_columns=None):
+        self.calls.append(('update', list(data[TableField.ID.value])))
+        for row in data.to_dict('records'):
+            self.rows[row[TableField.ID.value]] = row
+
+
+class FakeUpsertVectorStore(FakeVectorStore):
+    vectors_as_arrays = True
+
+    def upsert(self, table_name, data):
+        self.calls.append(('upsert', list(data[TableField.ID.value])))
+        for row in data.to_dict('records'):
+            self.rows[row[TableField.ID.value]] = row
+
+
+class TestVectorStoreHandler:
+
+    def setup_method(self):
+        # config sets environment variables, restore them for next tests
+        self._environ = dict(os.environ)
+        fdi, cfg_file = tempfile.mkstemp(prefix='mindsdb_conf_')
+        with os.fdopen(fdi, 'w') as fd:
+            json.dump({'vector_store': {'upsert_batch_size': 2}}, fd)
+        os.environ['MINDSDB_CONFIG_PATH'] = cfg_file
+
+    def teardown_method(self):
+        os.environ.clear()
+        os.environ.update(self._environ)
+
+    def test_to_vector(self):
+        vector = to_vector('[0.5, 1, -2e-3]')
+        assert vector.dtype == np.float32
+        assert np.allclose(vector, [0.5, 1, -0.002])
+
+        assert to_vector([1, 2]).dtype == np.float32
+        assert np.allclose(to_vector(np.array([1.5, 2.5])), [1.5, 2.5])
+        # not a plain list of numbers
+        assert np.allclose(to_vector('[1, 2,]'), [1, 2])
+
+    def test_insert_by_batches(self):
+        handler = FakeVectorStore()
+        handler.rows['b'] = {}
+
+        handler.query(parse_sql('''
+            insert into tbl (id, content, embeddings, metadata) values
+            ('a', 'x', '[1, 2]', '{"k": 1}'),
+            ('b', 'y', '[3, 4]', "{'k': 2}"),
+            ('c', 'z', '[5, 6]', '{}')
+        ''', dialect='mindsdb'))
+
+        assert handler.calls == [
+            ('select', 2), ('update', ['b']), ('insert', ['a']),
+            ('select', 1), ('insert', ['c']),
+        ]
+        row = handler.rows['b']
+        assert row[TableField.EMBEDDINGS.value] == [3, 4]
+        assert row[TableField.METADATA.value] == {'k': 2}
+
+    def test_native_upsert(self):
+        handler = FakeUpsertVectorStore()
+        df = pd.DataFrame({
+            TableField.ID.value: [1, 2, 3],
+            TableField.CONTENT.value: ['x', 'y', 'z'],
+            TableField.EMBEDDINGS.value: [[1, 2], '[3, 4]', np.array([5, 6])],
+        })
+        handler.do_upsert('tbl', df)
+
+        assert handler.calls == [('upsert', ['1', '2']), ('upsert', ['3'])]
+        vector = handler.rows['2'][TableField.EMBEDDINGS.value]
+        assert vector.dtype == np.float32
+        assert np.allclose(vector, [3, 4])